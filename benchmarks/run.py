@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+"""Micro-benchmarks for the hot paths of optinum.
+
+Every case is timed with `timeit` and the best time per call is written
+as JSON. When a baseline file is available the results are compared
+against it and the cases slower than the threshold are reported as
+regressions (the exit code is 1 in that case). Without a baseline, and
+without --save-baseline, nothing can be checked and the exit code is 2.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --save-baseline
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+"""
+import argparse
+import collections
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from optinum.common import config               # noqa: E402
+
+config.LOG.LEVEL = logging.WARNING
+logging.getLogger("optinum").setLevel(logging.WARNING)
+
+import numpy                                    # noqa: E402
+
+from optinum import factory                     # noqa: E402
+from optinum.algorithm import base as algorithms  # noqa: E402
+from optinum.algorithm import lockstep          # noqa: E402
+from optinum.analysis import base               # noqa: E402
+from optinum.analysis import hcanalysis         # noqa: E402
+from optinum.common import kernels              # noqa: E402
+from optinum.common import objects              # noqa: E402
+from optinum.common import stats                # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+# The compiled kernels are measured only when they are available.
+COMPILED = [config.KERNEL.NUMBA] if kernels.available() else []
+OBJECTIVES = ("Rosenbrock", "Rastrigin", "Griewangk", "SixHumpCamelBack")
+
+# The name of a case and the callable which is timed.
+Case = collections.namedtuple('Case', ['name', 'function'])
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    """Analysis which does not print its report."""
+
+    def report(self):
+        pass
+
+
+def _variables(objective, dimension):
+    return 2 if objective == "SixHumpCamelBack" else dimension
+
+
+def _task(algorithm, objective, precision, variables, seed=0):
+    return base.Task(algorithm, objective, precision, variables, seed=seed)
+
+
+def decode_cases(dimensions, precisions):
+    """Gene decoding: a single gene, a chromosome and a batch."""
+    rng = numpy.random.default_rng(0)
+    for precision in precisions:
+        for dimension in dimensions:
+            objective = factory.objective_function("Rastrigin")(precision)
+            space = objective.search_space
+            chromosome = objects.Chromosome.random(dimension, space, rng)
+            batch = objects.Chromosome.random_population(256, dimension,
+                                                         space, rng)
+            gene = chromosome.get_gene(0)
+            suffix = "vars=%d/p=%d" % (dimension, precision)
+
+            yield Case("decode/gene/" + suffix,
+                       lambda gene=gene, space=space:
+                       gene.value(space.min_xi, space.precision))
+            yield Case("decode/chromosome/" + suffix,
+                       lambda c=chromosome, o=objective: o.decode(c))
+            yield Case("decode/batch256/" + suffix,
+                       lambda b=batch, s=space: s.decode(b))
+            for kernel in COMPILED:
+                compiled = factory.objective_function("Rastrigin")(
+                    precision, backend=kernel).search_space
+                compiled.decode(batch)
+                yield Case("decode/batch256/%s/%s" % (kernel, suffix),
+                           lambda b=batch, s=compiled: s.decode(b))
+
+
+def objective_cases(dimensions, precisions):
+    """Objective functions: scalar, batch and delta evaluation."""
+    rng = numpy.random.default_rng(0)
+    precision = precisions[-1]
+    for name in OBJECTIVES:
+        for dimension in sorted(set(_variables(name, value)
+                                    for value in dimensions)):
+            objective = factory.objective_function(name)(precision)
+            matrix = rng.uniform(objective.min_xi, objective.max_xi,
+                                 size=(256, dimension))
+            variables = matrix[0].tolist()
+            state = objective.prepare_delta(variables)
+            suffix = "%s/vars=%d" % (name, dimension)
+
+            yield Case("objective/scalar/" + suffix,
+                       lambda o=objective, v=variables: o.evaluate(v))
+            yield Case("objective/batch256/" + suffix,
+                       lambda o=objective, m=matrix: o.evaluate_batch(m))
+            yield Case("objective/delta/" + suffix,
+                       lambda o=objective, v=variables, s=state:
+                       o.evaluate_delta(v, 0, 0.5, s))
+
+            bits = objective.search_space.decoder.encode(
+                numpy.zeros(dimension, dtype=numpy.int64))
+            indexes, values = objective.search_space.decoder.flips(bits)
+            for kernel in [config.KERNEL.NUMPY] + COMPILED:
+                instance = factory.objective_function(name)(
+                    precision, backend=kernel)
+                instance.evaluate_batch(matrix)
+                instance.evaluate_neighbors(variables, indexes, values)
+                yield Case("objective/neighbors/%s/%s" % (kernel, suffix),
+                           lambda o=instance, v=variables, i=indexes,
+                           n=values: o.evaluate_neighbors(v, i, n))
+                if kernel != config.KERNEL.NUMPY:
+                    yield Case("objective/batch256/%s/%s" % (kernel, suffix),
+                               lambda o=instance, m=matrix:
+                               o.evaluate_batch(m))
+
+
+def neighborhood_cases(dimensions, precisions):
+    """One pass over the neighborhood of the hill climbing variants, on
+    the bits and on the grid."""
+    precision = precisions[-1]
+    for algorithm in ("HCFirstImprovement", "HCBestImprovement",
+                      "GridFirstImprovement", "GridBestImprovement"):
+        for dimension in dimensions:
+            task = _task(algorithm, "Rastrigin", precision, dimension)
+            climber = task.algorithm
+            climber.start(task)
+            name = "neighborhood/%s/vars=%d/p=%d" % (algorithm, dimension,
+                                                     precision)
+            if algorithm.endswith("BestImprovement"):
+                yield Case(name, climber.climb)
+            elif algorithm == "GridFirstImprovement":
+                yield Case(name, lambda climber=climber: list(
+                    climber.scored_moves(*climber.neighbors())))
+            else:
+                loci = numpy.arange(climber.chromosome.size)
+                yield Case(name, lambda climber=climber, loci=loci: list(
+                    climber.scored_flips(loci)))
+
+
+def run_cases(dimensions, precisions):
+    """Complete runs: one task, the executors and the lockstep engine."""
+    precision = precisions[0]
+    dimension = dimensions[0]
+    for algorithm in ("GridFirstImprovement", "GridBestImprovement"):
+        yield Case("run/task/%s/vars=%d/p=%d" % (algorithm, dimension,
+                                                 precision),
+                   lambda a=algorithm: _task(a, "Rastrigin", precision,
+                                             dimension).run())
+
+    for algorithm in ("HCFirstImprovement", "HCBestImprovement"):
+        suffix = "%s/vars=%d/p=%d" % (algorithm, dimension, precision)
+        yield Case("run/task/" + suffix,
+                   lambda a=algorithm: _task(a, "Rastrigin", precision,
+                                             dimension).run())
+
+        objective = factory.objective_function("Rastrigin")(precision)
+        engine = lockstep.LockstepHillClimbing.from_algorithm(
+            factory.algorithm(algorithm)(), objective, dimension)
+        yield Case("run/lockstep32/" + suffix,
+                   lambda e=engine: e.run(32, numpy.random.default_rng(0)))
+
+    yield Case("run/task/GeneticAlgorithm/vars=%d/p=%d" % (dimension,
+                                                          precision),
+               lambda: _task("GeneticAlgorithm", "Rastrigin", precision,
+                             dimension).run())
+
+    # the remote backend needs workers started by `optinum worker`
+    for backend in ("process", "thread"):
+        command = argparse.Namespace(
+            algorithm="HCBestImprovement", objective="Rastrigin",
+            precision=precision, variables=dimension, seed=0,
+            backend=backend, workers=config.WORKER.WORKERS,
+            autoscale=config.WORKER.AUTOSCALE,
+            min_workers=config.WORKER.MIN_WORKERS,
+            max_workers=config.WORKER.MAX_WORKERS,
+            chunk_size=config.WORKER.CHUNK_SIZE,
+            engine=config.ENGINE.TASK, kernel=config.KERNEL.DEFAULT,
+            encoding=config.ENCODING.DEFAULT, cache_size=None,
+            checkpoint=None, store=None, broker=config.BROKER.ADDRESS,
+            authkey=config.BROKER.AUTHKEY,
+            checkpoint_interval=config.CHECKPOINT.INTERVAL, resume=False)
+        yield Case("run/analysis16/%s/vars=%d/p=%d" % (backend, dimension,
+                                                       precision),
+                   lambda c=command: _QuietAnalysis(c).compute(16))
+
+
+def stats_cases(dimensions, precisions):
+    """The summary of the results: its exact sums and its sketch."""
+    # the scores of the restarts span several orders of magnitude
+    scores = numpy.random.default_rng(0).lognormal(0.0, 3.0, 10000)
+    results = [algorithms.Result(float(score), 50, b"") for score in scores]
+
+    def summarize(results):
+        summary = stats.Summary()
+        for index, result in enumerate(results):
+            summary.add(result, index)
+        return summary
+
+    yield Case("stats/Summary.add/n=%d" % len(results),
+               lambda: summarize(results))
+    parts = [summarize(results[start:start + 1000])
+             for start in range(0, len(results), 1000)]
+
+    def merge(parts):
+        summary = stats.Summary()
+        for part in parts:
+            summary.merge(part)
+        return summary.mean, summary.variance
+
+    yield Case("stats/Summary.merge/parts=%d" % len(parts),
+               lambda: merge(parts))
+
+
+SUITES = collections.OrderedDict([
+    ("decode", decode_cases),
+    ("objective", objective_cases),
+    ("neighborhood", neighborhood_cases),
+    ("run", run_cases),
+    ("stats", stats_cases),
+])
+
+
+def measure(function, repeat, min_time):
+    """Return the best time per call of `function`, in seconds."""
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / number
+
+
+def compare(results, baseline, threshold):
+    """Return the (name, baseline, current, ratio) of the regressions."""
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = seconds / previous
+        if ratio > 1 + threshold:
+            regressions.append((name, previous, seconds, ratio))
+    return regressions
+
+
+def setup():
+    """Setup the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=list(SUITES),
+                        help="run only the received suites")
+    parser.add_argument("--filter", default="",
+                        help="run only the cases containing this text")
+    parser.add_argument("--dimensions", type=int, nargs="+",
+                        default=[10, 100])
+    parser.add_argument("--precisions", type=int, nargs="+",
+                        default=[2, 6])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum duration of a measurement")
+    parser.add_argument("--output", help="where the results are written")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before reporting it")
+    return parser
+
+
+def main():
+    args = setup().parse_args()
+    results = collections.OrderedDict()
+    for suite in args.suite or SUITES:
+        for case in SUITES[suite](args.dimensions, args.precisions):
+            if args.filter not in case.name:
+                continue
+            results[case.name] = measure(case.function, args.repeat,
+                                         args.min_time)
+            print("%-60s %12.3f us" % (case.name, results[case.name] * 1e6))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "machine": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file_handler:
+            json.dump(report, file_handler, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as file_handler:
+            json.dump(report, file_handler, indent=2)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        sys.stderr.write("WARNING: the baseline %s does not exist, nothing "
+                         "was compared; use --save-baseline in order to "
+                         "create it.\n" % args.baseline)
+        return 2
+    with open(args.baseline) as file_handler:
+        baseline = json.load(file_handler)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for name, previous, current, ratio in regressions:
+        print("REGRESSION %s: %.3f us -> %.3f us (x%.2f)" %
+              (name, previous * 1e6, current * 1e6, ratio))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import logging
 
-logging.basicConfig()
-log = logging.getLogger("optinum")
-log.setLevel(logging.DEBUG)
+# The application configures its own handlers, see `common.utils`.
+logging.getLogger("optinum").addHandler(logging.NullHandler())
@@ -1,14 +1,30 @@
+import collections
+
 from optinum.common import config
 from optinum.common import worker
 
+# The compact outcome of an algorithm: the best score, the number of
+# evaluations made and the packed genetic data of the best chromosome.
+# The evaluations are the iterations of the algorithm, the neighborhoods
+# scanned by a hill climber or the generations scored by a genetic
+# algorithm; the objective calls are counted by `metrics.OBJECTIVE_CALLS`.
+Result = collections.namedtuple('Result', ['score', 'evaluations', 'genome'])
+# The progress of a running algorithm: the current score, the evaluations
+# made, the packed current chromosome and the state of its random numbers.
+State = collections.namedtuple('State', ['score', 'evaluations', 'genome',
+                                         'rng'])
+
 
 class Algorithm(worker.BaseWorker):
 
-    def __init__(self, debug=config.MISC.DEBUG):
-        super(Algorithm, self).__init__(debug=debug, delay=0, loop=False,
-                                        name=None)
-        self._status = config.STATUS.NOSET
+    def __init__(self, name=None, debug=config.MISC.DEBUG):
+        super(Algorithm, self).__init__()
+        self._name = name or self.__class__.__name__
+        self._debug = debug
+        self._status = config.STATUS.NOTSET
         self._task = None
+        self._result = None
+        self._error = None
 
     @property
     def name(self):
@@ -18,23 +34,36 @@ class Algorithm(worker.BaseWorker):
     def status(self):
         return self._status
 
+    @property
+    def task(self):
+        return self._task
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def error(self):
+        return self._error
+
+    def start(self, task):
+        """Process the received task."""
+        self._task = task
+        super(Algorithm, self).start(task)
+
     def task_done(self, task, result):
         """What to execute after successfully finished processing a task."""
         super(Algorithm, self).task_done(task, result)
+        self._result = result
         self._status = config.STATUS.DONE
 
     def task_fail(self, task, exc):
         """What to do when the program fails processing a task."""
         super(Algorithm, self).task_fail(task, exc)
+        self._error = exc
         self._status = config.STATUS.ERROR
 
     def prologue(self):
         """Executed once before the main procedures."""
         super(Algorithm, self).prologue()
         self._status = config.STATUS.RUNNING
-
-    def epilogue(self):
-        """Executed once after the main procedures."""
-        self._status = config.STATUS.DONE
-        # TODO(alexandrucoman): Prepare the result
-        super(Algorithm, self).epilogue()
@@ -0,0 +1,182 @@
+import numpy
+
+from optinum.algorithm import base
+from optinum.common import config
+from optinum.common import metrics
+from optinum.common import objects
+
+__all__ = ['GeneticAlgorithm']
+
+
+class GeneticAlgorithm(base.Algorithm):
+
+    """Generational genetic algorithm over a (population x loci) bit matrix.
+
+    The tournament selection, the one-point crossover, the mutation and
+    the elitism are array operations over the whole population and every
+    generation is scored with a single batched call of the objective
+    function, so the cost of a generation hardly depends on Python.
+    """
+
+    def __init__(self, name="Genetic Algorithm",
+                 population=config.GENETIC.POPULATION,
+                 generations=config.GENETIC.GENERATIONS,
+                 crossover=config.GENETIC.CROSSOVER,
+                 mutation=config.GENETIC.MUTATION,
+                 tournament=config.GENETIC.TOURNAMENT,
+                 elitism=config.GENETIC.ELITISM):
+        """Setup a new algorithm.
+
+        :param population: the number of chromosomes, rounded up to an
+                           even number
+        :param crossover:  the probability of a pair of parents to be
+                           recombined
+        :param mutation:   the probability of a locus to flip, 1 / loci
+                           when it is missing
+        :param tournament: the chromosomes competing for every selection
+        :param elitism:    the best chromosomes kept by every generation
+        """
+        super(GeneticAlgorithm, self).__init__(name)
+        self._population_size = population + population % 2
+        self._generations = generations
+        self._crossover = crossover
+        self._mutation = mutation
+        self._tournament = tournament
+        self._elitism = min(elitism, self._population_size)
+        self._space = None
+        self._rng = None
+        self._metrics = metrics.NullMetrics()
+        self._population = None
+        self._scores = None
+        self._generation = 0
+        self._evaluations = 0
+
+    @property
+    def population(self):
+        """The genetic data of the current generation, one row for every
+        chromosome."""
+        return self._population
+
+    @property
+    def scores(self):
+        return self._scores
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def evaluations(self):
+        """The scored generations, the first one included; the objective
+        calls are counted by the metrics."""
+        return self._evaluations
+
+    def evaluate_population(self, population):
+        """Score every row of the bit matrix with one objective call."""
+        self._metrics.count(metrics.OBJECTIVE_CALLS, len(population))
+        started = self._metrics.start()
+        variables = self._space.decode(population)
+        self._metrics.stop(metrics.DECODE_TIME, started)
+        return self.task.objective.evaluate_batch(variables)
+
+    def select(self):
+        """Return the rows of the parents chosen by tournaments."""
+        count = self._population_size
+        rivals = self._rng.integers(0, count, size=(count, self._tournament))
+        winners = numpy.argmin(self._scores[rivals], axis=1)
+        return rivals[numpy.arange(count), winners]
+
+    def recombine(self, parents):
+        """Return the children of the consecutive pairs of parents, by
+        one-point crossover."""
+        first, second = parents[0::2], parents[1::2]
+        pairs, loci = first.shape
+        # the pairs which are not recombined are copied
+        points = numpy.full(pairs, loci)
+        crossed = self._rng.random(pairs) < self._crossover
+        points[crossed] = self._rng.integers(1, max(loci, 2),
+                                             size=int(crossed.sum()))
+        mask = numpy.arange(loci) < points[:, numpy.newaxis]
+        children = numpy.empty_like(parents)
+        children[0::2] = numpy.where(mask, first, second)
+        children[1::2] = numpy.where(mask, second, first)
+        return children
+
+    def mutate(self, children):
+        """Flip every locus with the probability of mutation, in place.
+
+        Only the flipped positions are drawn, instead of a random number
+        for every locus.
+        """
+        flat = children.reshape(-1)
+        rate = self._mutation or 1.0 / children.shape[1]
+        flips = self._rng.binomial(flat.size, rate)
+        flat[self._rng.integers(0, flat.size, size=flips)] ^= 1
+
+    def step(self):
+        """Replace the current population with the next generation."""
+        started = self._metrics.start()
+        children = self.recombine(self._population[self.select()])
+        self.mutate(children)
+        self._metrics.stop(metrics.NEIGHBOR_TIME, started)
+        scores = self.evaluate_population(children)
+
+        if self._elitism:
+            elite = numpy.argpartition(self._scores,
+                                       self._elitism - 1)[:self._elitism]
+            worst = numpy.argpartition(scores, -self._elitism)[
+                -self._elitism:]
+            children[worst] = self._population[elite]
+            scores[worst] = self._scores[elite]
+
+        if scores.min() < self._scores.min():
+            self._metrics.count(metrics.MOVES)
+        self._population, self._scores = children, scores
+        self._generation += 1
+        self._evaluations += 1
+
+    def best(self):
+        """Return the score and the genetic data of the best chromosome."""
+        index = int(numpy.argmin(self._scores))
+        return self._scores[index], self._population[index]
+
+    def snapshot(self):
+        """Return the progress of the current run as a `base.State`; the
+        genome holds the packed population and the state of the random
+        numbers is paired with the number of the generation."""
+        return base.State(self.best()[0], self._evaluations,
+                          numpy.packbits(self._population).tobytes(),
+                          (self._generation, self._rng.bit_generator.state))
+
+    def restore(self, state):
+        """Continue the run described by a `base.State`."""
+        self._generation, self._rng.bit_generator.state = state.rng
+        loci = self.task.variables * self._space.size
+        bits = numpy.unpackbits(numpy.frombuffer(
+            state.genome, dtype=objects.ALLELE_TYPE))
+        self._population = bits[:self._population_size * loci].reshape(
+            self._population_size, loci)
+        self._scores = self.evaluate_population(self._population)
+        self._evaluations = state.evaluations
+
+    def process(self, task):
+        self._space = task.objective.search_space
+        self._rng = task.rng
+        self._metrics = task.metrics
+        if task.state is not None:
+            self.restore(task.state)
+        else:
+            self._population = objects.Chromosome.random_population(
+                self._population_size, task.variables, self._space,
+                self._rng)
+            self._scores = self.evaluate_population(self._population)
+            self._evaluations = 1
+
+        while self._generation < self._generations:
+            self.step()
+            if task.checkpoint:
+                task.callback_progress(self.snapshot())
+
+        score, genetic_info = self.best()
+        return base.Result(score, self._evaluations,
+                           numpy.packbits(genetic_info).tobytes())
@@ -0,0 +1,246 @@
+"""Hill climbing over the grid indexes of the variables.
+
+`min_xi`, `max_xi` and the precision define a grid of real values for
+every variable, so a point is kept as one integer index and one float64
+value per variable instead of a bit string. The neighbors are the points
+reached by moving a single index along the grid and the objective
+function receives the float64 variables directly: nothing is decoded.
+
+The results hold the same packed genes as the bit representation, so the
+reports, the result stores and the checkpoints handle both of them. The
+evaluation cache of the tasks is not used.
+"""
+import abc
+
+import numpy
+import six
+
+from optinum.algorithm import base
+from optinum.common import metrics
+
+__all__ = ['GridFirstImprovement', 'GridBestImprovement']
+
+
+@six.add_metaclass(abc.ABCMeta)
+class GridClimbing(base.Algorithm):
+
+    def __init__(self, name="Grid Climbing", max_evaluations=50,
+                 moves=None):
+        """Setup a new algorithm.
+
+        :param max_evaluations: the limit of the explored neighborhoods
+        :param moves: the signed distances, in grid steps, between a point
+                      and its neighbors; +-1, +-2, +-4, ... up to the size
+                      of the grid when it is missing
+        """
+        super(GridClimbing, self).__init__(name)
+        self._max_evaluations = max_evaluations
+        self._moves = moves
+        self._space = None
+        self._rng = None
+        self._metrics = metrics.NullMetrics()
+        self._indexes = None
+        self._variables = None
+        self._score = None
+        self._evaluations = 1
+
+    @property
+    def depth_search(self):
+        return True
+
+    @property
+    def max_evaluations(self):
+        return self._max_evaluations
+
+    @property
+    def indexes(self):
+        """The grid index of every variable of the current point."""
+        return self._indexes
+
+    @property
+    def variables(self):
+        return self._variables
+
+    @property
+    def score(self):
+        return self._score
+
+    @property
+    def evaluations(self):
+        return self._evaluations
+
+    def moves(self):
+        """Return the signed distances between a point and its
+        neighbors, in grid steps."""
+        if self._moves is not None:
+            return numpy.asarray(self._moves, dtype=numpy.int64)
+        steps = numpy.left_shift(1, numpy.arange(self._space.size,
+                                                 dtype=numpy.int64))
+        return numpy.concatenate([steps, -steps])
+
+    def neighbors(self):
+        """Return the variable changed by every neighbor of the current
+        point and its new grid index; the moves which leave the grid are
+        left out."""
+        targets = self._indexes[:, numpy.newaxis] + self.moves()
+        inside = (targets >= 0) & (targets <= self._space.steps)
+        positions = numpy.nonzero(inside)[0]
+        return positions, targets[inside]
+
+    def evaluate(self, variables):
+        """Score the float64 variables of a single point."""
+        self._metrics.count(metrics.OBJECTIVE_CALLS)
+        return float(self.task.objective.evaluate_batch(
+            variables[numpy.newaxis, :])[0])
+
+    def update_point(self, indexes, score):
+        self._indexes = indexes
+        self._variables = self._space.grid_values(indexes)
+        self._score = score
+
+    def move(self, position, index, score):
+        """Set the grid index of a variable, whose new score is already
+        known."""
+        indexes = self._indexes.copy()
+        indexes[position] = index
+        self.update_point(indexes, score)
+
+    def genome(self):
+        """Return the current point packed as the genes which store it."""
+        bits = self._space.decoder.encode(self._indexes)
+        return numpy.packbits(bits).tobytes()
+
+    def snapshot(self):
+        """Return the progress of the current run as a `base.State`."""
+        return base.State(self._score, self._evaluations, self.genome(),
+                          self._rng.bit_generator.state)
+
+    def restore(self, state):
+        """Continue the run described by a `base.State`."""
+        self._rng.bit_generator.state = state.rng
+        loci = self.task.variables * self._space.size
+        bits = numpy.unpackbits(numpy.frombuffer(state.genome,
+                                                 dtype=numpy.uint8))
+        self.update_point(self._space.decoder.decimals(bits[:loci]),
+                          state.score)
+        self._evaluations = state.evaluations
+
+    @abc.abstractmethod
+    def climb(self):
+        """Explore the neighborhood of the current point once.
+
+        Returns True if the current point was replaced.
+        """
+        pass
+
+    def process(self, task):
+        self._space = task.objective.search_space
+        self._rng = task.rng
+        self._metrics = task.metrics
+        if task.state is not None:
+            self.restore(task.state)
+        else:
+            indexes = self._space.random_indexes(task.variables, self._rng)
+            self.update_point(indexes, None)
+            self._score = self.evaluate(self._variables)
+            self._evaluations = 1
+
+        while self._evaluations < self._max_evaluations:
+            move_made = self.climb()
+            self._evaluations = self._evaluations + 1
+            if move_made:
+                self._metrics.count(metrics.MOVES)
+            if task.checkpoint:
+                task.callback_progress(self.snapshot())
+            # no neighbor improves the score: a local optimum
+            if not move_made:
+                break
+
+        return base.Result(self._score, self._evaluations, self.genome())
+
+
+class GridFirstImprovement(GridClimbing):
+
+    def __init__(self, name="Grid Climbing: First Improvement", moves=None):
+        super(GridFirstImprovement, self).__init__(name=name, moves=moves)
+        self._values = None
+        self._delta_state = None
+
+    @property
+    def depth_search(self):
+        return False
+
+    def update_point(self, indexes, score):
+        super(GridFirstImprovement, self).update_point(indexes, score)
+        self._values = self._variables.tolist()
+        self._delta_state = self.task.objective.prepare_delta(self._values)
+
+    def scored_moves(self, positions, indexes):
+        """Yield a (position, index, score) triple for every neighbor,
+        scored from the single variable it changes when the objective
+        function supports it."""
+        objective = self.task.objective
+        values = self._space.grid_values(indexes).tolist()
+        for position, index, value in zip(positions.tolist(),
+                                          indexes.tolist(), values):
+            self._metrics.count(metrics.OBJECTIVE_CALLS)
+            if self._delta_state is None:
+                variables = list(self._values)
+                variables[position] = value
+                score = objective.evaluate(variables)
+            else:
+                score = objective.evaluate_delta(self._values, position,
+                                                 value, self._delta_state)
+            yield position, index, score
+
+    def climb(self):
+        """Try the neighbors in a random order and move on the first one
+        which improves the score."""
+        started = self._metrics.start()
+        positions, indexes = self.neighbors()
+        order = self._rng.permutation(len(positions))
+        self._metrics.stop(metrics.NEIGHBOR_TIME, started)
+        for position, index, score in self.scored_moves(positions[order],
+                                                        indexes[order]):
+            if score < self._score:
+                self.move(position, index, score)
+                return True
+        return False
+
+
+class GridBestImprovement(GridClimbing):
+
+    def __init__(self, name="Grid Climbing: Best Improvement", moves=None,
+                 chunk_size=1024):
+        super(GridBestImprovement, self).__init__(name=name, moves=moves)
+        self._chunk_size = chunk_size
+
+    @property
+    def depth_search(self):
+        return True
+
+    def climb(self):
+        """Score the whole neighborhood with batched calls and move to
+        its best member."""
+        started = self._metrics.start()
+        positions, indexes = self.neighbors()
+        values = self._space.grid_values(indexes)
+        self._metrics.stop(metrics.NEIGHBOR_TIME, started)
+
+        objective = self.task.objective
+        best_score, best = self._score, None
+        for start in range(0, len(positions), self._chunk_size):
+            stop = start + self._chunk_size
+            self._metrics.count(metrics.OBJECTIVE_CALLS,
+                                len(positions[start:stop]))
+            scores = objective.evaluate_neighbors(
+                self._variables, positions[start:stop], values[start:stop])
+            index = int(numpy.argmin(scores))
+            if scores[index] < best_score:
+                best_score, best = scores[index], start + index
+
+        if best is None:
+            return False
+
+        self.move(positions[best], indexes[best], best_score)
+        return True
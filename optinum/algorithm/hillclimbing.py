@@ -1,19 +1,29 @@
 import abc
-import random
 
+import numpy
 import six
 
 from optinum.algorithm import base
+from optinum.common import metrics
 from optinum.common import objects
 
 __all__ = ['HCFirstImprovement', 'HCBestImprovement']
 
+_MISSING = object()     # the default of the cache lookups
+
 
 @six.add_metaclass(abc.ABCMeta)
 class HillClimbing(base.Algorithm):
 
     def __init__(self, name="HillClimbing", max_evaluations=50):
         super(HillClimbing, self).__init__(name)
+        self._chromosome = None
+        self._score = None
+        self._space = None
+        self._rng = None
+        self._metrics = metrics.NullMetrics()
+        self._variables = None
+        self._delta_state = None
         self._evaluations = 1
         self._max_evaluations = max_evaluations
 
@@ -21,37 +31,193 @@ class HillClimbing(base.Algorithm):
     def depth_search(self):
         return True
 
+    @property
+    def max_evaluations(self):
+        return self._max_evaluations
+
+    @property
+    def chromosome(self):
+        return self._chromosome
+
+    @property
+    def score(self):
+        return self._score
+
+    @property
+    def evaluations(self):
+        return self._evaluations
+
     @abc.abstractmethod
     def move_operator(self):
+        """Yield (locus, chromosome) pairs, the chromosome being the current
+        one with the allele from `locus` flipped."""
         pass
 
-    def evaluate(self, chromosome):
-        return self.task.objective_function.compute(chromosome)
+    def evaluate(self, chromosome, locus=None):
+        """Score the chromosome.
+
+        When `locus` is the only difference between the candidate and the
+        current chromosome and the objective function supports it, only
+        the changed variable is taken into account.
+        """
+        cache = self.task.cache
+        if cache is None:
+            return self._evaluate(chromosome, locus)
+
+        key = chromosome.get_packed_data()
+        score = cache.get(key)
+        if score is None:
+            score = self._evaluate(chromosome, locus)
+            cache.put(key, score)
+        return score
+
+    def evaluate_bits(self, bits):
+        """Score every row of an (N x loci) matrix of genetic data."""
+        cache = self.task.cache
+        if cache is None:
+            return self._evaluate_bits(bits)
+
+        keys = [row.tobytes() for row in numpy.packbits(bits, axis=1)]
+        return self._cached_scores(
+            keys, lambda rows: self._evaluate_bits(bits[rows]))
+
+    def _cached_scores(self, keys, evaluate):
+        """Return the cached scores of the keys; the rows missing from
+        the cache are scored by `evaluate(rows)` and stored."""
+        cache = self.task.cache
+        scores = numpy.empty(len(keys), dtype=numpy.float64)
+        missing = numpy.zeros(len(keys), dtype=bool)
+        for row, key in enumerate(keys):
+            score = cache.get(key, _MISSING)
+            if score is _MISSING:
+                missing[row] = True
+            else:
+                scores[row] = score
+        rows = numpy.flatnonzero(missing)
+        if rows.size:
+            scores[rows] = evaluate(rows)
+            for row in rows:
+                cache.put(keys[row], scores[row])
+        return scores
+
+    def _evaluate_bits(self, bits):
+        self._metrics.count(metrics.OBJECTIVE_CALLS, len(bits))
+        started = self._metrics.start()
+        variables = self._space.decode(bits)
+        self._metrics.stop(metrics.DECODE_TIME, started)
+        return self.task.objective.evaluate_batch(variables)
+
+    def _evaluate(self, chromosome, locus):
+        objective = self.task.objective
+        self._metrics.count(metrics.OBJECTIVE_CALLS)
+        started = self._metrics.start()
+        if locus is None or self._delta_state is None:
+            variables = objective.decode(chromosome)
+            self._metrics.stop(metrics.DECODE_TIME, started)
+            return objective.evaluate(variables)
+
+        index = locus // self._space.size
+        new_value = self._space.decoder.value(
+            chromosome.get_gene(index).allele)
+        self._metrics.stop(metrics.DECODE_TIME, started)
+        return objective.evaluate_delta(self._variables, index, new_value,
+                                        self._delta_state)
 
     def update_chromosome(self, chromosome, score):
+        objective = self.task.objective
         self._chromosome = chromosome
         self._score = score
+        self._variables = objective.decode(chromosome)
+        self._delta_state = objective.prepare_delta(self._variables)
+
+    def scored_flips(self, loci):
+        """Yield a (locus, score) pair for the Hamming neighbor obtained
+        by flipping every locus of the current chromosome.
+
+        The locus is flipped in place and reverted right after it is
+        scored, so no chromosome is allocated for the rejected neighbors;
+        use `move` in order to accept one of them.
+        """
+        chromosome = self._chromosome
+        for locus in loci:
+            chromosome.flip(locus)
+            try:
+                score = self.evaluate(chromosome, locus)
+            finally:
+                chromosome.flip(locus)
+            yield locus, score
+
+    def move(self, locus, score):
+        """Flip the locus of the current chromosome, whose new score is
+        already known."""
+        self._chromosome.flip(locus)
+        self.update_chromosome(self._chromosome, score)
+
+    def snapshot(self):
+        """Return the progress of the current run as a `base.State`."""
+        return base.State(self._score, self._evaluations,
+                          self._chromosome.get_packed_data(),
+                          self._rng.bit_generator.state)
+
+    def restore(self, state):
+        """Continue the run described by a `base.State`."""
+        self._rng.bit_generator.state = state.rng
+        chromosome = objects.Chromosome.from_packed(
+            state.genome, self.task.variables, self._space)
+        self.update_chromosome(chromosome, state.score)
+        self._evaluations = state.evaluations
+
+    def climb(self):
+        """Explore the neighborhood of the current chromosome once.
+
+        Returns True if the current chromosome was replaced.
+        """
+        move_made = False
+        neighbors = self.move_operator()
+        while True:
+            started = self._metrics.start()
+            try:
+                locus, candidate_chromosome = next(neighbors)
+            except StopIteration:
+                break
+            finally:
+                self._metrics.stop(metrics.NEIGHBOR_TIME, started)
+
+            candidate_score = self.evaluate(candidate_chromosome, locus)
+            if candidate_score < self._score:
+                move_made = True
+                self.update_chromosome(candidate_chromosome,
+                                       candidate_score)
+                if not self.depth_search:
+                    break
+        return move_made
 
     def process(self, task):
-        self._chromosome = objects.Chromosome.random(task.variables,
-                                                     task.space)
-        self._score = self.evaluate(self._chromosome)
-        self._evaluations = 1
-        while self._evaluations < self._max_evaluations:
-            move_made = False
-            for candidate_chromosome in self.move_operator():
-                candidate_score = self.evaluate(candidate_chromosome)
-                if candidate_score < self._score:
-                    move_made = True
-                    self.update_chromosome(candidate_chromosome,
-                                           candidate_score)
-                    if not self.depth_search:
-                        break
+        self._space = task.objective.search_space
+        self._rng = task.rng
+        self._metrics = task.metrics
+        if task.state is not None:
+            self.restore(task.state)
+        else:
+            chromosome = objects.Chromosome.random(task.variables,
+                                                   self._space, self._rng)
+            self.update_chromosome(chromosome, self.evaluate(chromosome))
+            self._evaluations = 1
 
+        while self._evaluations < self._max_evaluations:
+            move_made = self.climb()
             self._evaluations = self._evaluations + 1
-            if not move_made and self.depth_search:
+            if move_made:
+                self._metrics.count(metrics.MOVES)
+            if task.checkpoint:
+                task.callback_progress(self.snapshot())
+            # no neighbor improves the score: a local optimum
+            if not move_made:
                 break
 
+        return base.Result(self._score, self._evaluations,
+                           self._chromosome.get_packed_data())
+
 
 class HCFirstImprovement(HillClimbing):
 
@@ -62,20 +228,31 @@ class HCFirstImprovement(HillClimbing):
     def depth_search(self):
         return False
 
+    def climb(self):
+        """Try the flips in a random order and move on the first one
+        which improves the score."""
+        loci = self._rng.permutation(self._chromosome.size)
+        for locus, score in self.scored_flips(loci):
+            if score < self._score:
+                self.move(locus, score)
+                return True
+        return False
+
     def move_operator(self):
         genetic_info = self._chromosome.get_raw_data()
-        index_list = range(len(genetic_info))
-        random.shuffle(index_list)
-        for index in index_list:
-            hamming_neighbor = list(genetic_info)
-            hamming_neighbor[index] = int(not(genetic_info[index]))
-            yield objects.Chromosome.from_raw(hamming_neighbor, self.space)
+        for index in self._rng.permutation(len(genetic_info)):
+            hamming_neighbor = genetic_info.copy()
+            hamming_neighbor[index] ^= 1
+            yield index, objects.Chromosome.from_raw(hamming_neighbor,
+                                                     self._space)
 
 
 class HCBestImprovement(HillClimbing):
 
-    def __init__(self, name="HillClimbing: Best Improvement"):
-        super(HCFirstImprovement, self).__init__(name=name)
+    def __init__(self, name="HillClimbing: Best Improvement",
+                 chunk_size=1024):
+        super(HCBestImprovement, self).__init__(name=name)
+        self._chunk_size = chunk_size
 
     @property
     def depth_search(self):
@@ -84,6 +261,78 @@ class HCBestImprovement(HillClimbing):
     def move_operator(self):
         genetic_info = self._chromosome.get_raw_data()
         for index in range(len(genetic_info)):
-            hamming_neighbor = list(genetic_info)
-            hamming_neighbor[index] = int(not(genetic_info[index]))
-            yield objects.Chromosome.from_raw(hamming_neighbor, self.space)
+            hamming_neighbor = genetic_info.copy()
+            hamming_neighbor[index] ^= 1
+            yield index, objects.Chromosome.from_raw(hamming_neighbor,
+                                                     self._space)
+
+    def neighborhood(self, start=0, stop=None):
+        """Return the Hamming neighbors as a bit matrix.
+
+        Row `i` is the current chromosome with the locus `start + i`
+        flipped, i.e. the genetic data XOR the identity matrix.
+        """
+        genetic_info = self._chromosome.get_raw_data()
+        stop = genetic_info.size if stop is None else min(
+            stop, genetic_info.size)
+        neighbors = numpy.tile(genetic_info, (stop - start, 1))
+        rows = numpy.arange(stop - start)
+        neighbors[rows, rows + start] ^= 1
+        return neighbors
+
+    def neighbor_keys(self, start=0, stop=None):
+        """Return the packed genetic data of the Hamming neighbors from
+        `neighborhood(start, stop)`, the keys of their cached scores."""
+        genetic_info = self._chromosome.get_raw_data()
+        stop = genetic_info.size if stop is None else min(
+            stop, genetic_info.size)
+        loci = numpy.arange(start, stop)
+        neighbors = numpy.tile(numpy.packbits(genetic_info),
+                               (stop - start, 1))
+        neighbors[loci - start, loci // 8] ^= numpy.right_shift(
+            0x80, loci % 8).astype(neighbors.dtype)
+        return [row.tobytes() for row in neighbors]
+
+    def _score_flips(self, indexes, values):
+        self._metrics.count(metrics.OBJECTIVE_CALLS, len(indexes))
+        return self.task.objective.evaluate_neighbors(
+            self._variables, indexes, values)
+
+    def climb(self):
+        """Score the whole neighborhood and move to its best member.
+
+        Every neighbor differs from the current chromosome in a single
+        variable, so the objective function receives the new value of
+        that variable instead of the whole decoded neighbor.
+        """
+        genetic_info = self._chromosome.get_raw_data()
+        started = self._metrics.start()
+        indexes, values = self._space.decoder.flips(genetic_info)
+        self._metrics.stop(metrics.DECODE_TIME, started)
+
+        cache = self.task.cache
+        best_score, best_locus = self._score, None
+        for start in range(0, genetic_info.size, self._chunk_size):
+            stop = start + self._chunk_size
+            chunk = (indexes[start:stop], values[start:stop])
+            if cache is None:
+                scores = self._score_flips(*chunk)
+            else:
+                started = self._metrics.start()
+                keys = self.neighbor_keys(start, stop)
+                self._metrics.stop(metrics.NEIGHBOR_TIME, started)
+                scores = self._cached_scores(
+                    keys, lambda rows: self._score_flips(
+                        chunk[0][rows], chunk[1][rows]))
+            index = int(numpy.argmin(scores))
+            if scores[index] < best_score:
+                best_score, best_locus = scores[index], start + index
+
+        if best_locus is None:
+            return False
+
+        genetic_info[best_locus] ^= 1
+        self.update_chromosome(
+            objects.Chromosome.from_raw(genetic_info, self._space),
+            best_score)
+        return True
@@ -0,0 +1,160 @@
+"""Engines which advance many restarts of an algorithm together."""
+import numpy
+
+from optinum.algorithm import base
+from optinum.algorithm import hillclimbing
+from optinum.common import config
+from optinum.common import metrics
+from optinum.common import objects
+
+__all__ = ['LockstepHillClimbing']
+
+
+class LockstepHillClimbing(object):
+
+    """Run many hill climbing restarts as one (restarts x loci) bit matrix.
+
+    Every step scores the Hamming neighborhood of all the active restarts
+    with batched objective calls and applies the chosen moves at once.
+    A restart stops when it reaches the evaluation limit or when none of
+    its neighbors is better, which is a local optimum for both variants.
+    """
+
+    def __init__(self, objective, variables, depth_search=True,
+                 max_evaluations=50, buffer_size=config.ENGINE.BUFFER_SIZE,
+                 collector=None):
+        """Setup a new engine.
+
+        :param depth_search: move to the best neighbor if True, otherwise
+                             to the first better one in a random order
+        :param buffer_size:  maximum number of bytes used by the
+                             neighbors materialized at once
+        :param collector:    the `metrics.Metrics` which receives the
+                             counters and the timers of the engine
+        """
+        self._objective = objective
+        self._space = objective.search_space
+        self._variables = variables
+        self._depth_search = depth_search
+        self._max_evaluations = max_evaluations
+        self._buffer_size = buffer_size
+        self._rng = None
+        self._metrics = collector or metrics.new_metrics()
+        # the memory required by one neighbor: its variables and its gene
+        self._neighbor_bytes = variables * 8 + self._space.size
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @classmethod
+    def from_algorithm(cls, algorithm, objective, variables, **kwargs):
+        """Build an engine with the behavior of a hill climbing instance."""
+        if not isinstance(algorithm, hillclimbing.HillClimbing):
+            raise ValueError("%(name)s can not run in lockstep." %
+                             {"name": algorithm.name})
+        return cls(objective, variables, algorithm.depth_search,
+                   algorithm.max_evaluations, **kwargs)
+
+    def _explore(self, genomes, scores):
+        """Return the score and the locus of the move chosen for every
+        row, -1 being the locus of the rows without a better neighbor.
+
+        A flip changes a single gene, so only that gene is decoded for
+        every neighbor and it replaces one column of the current variables.
+        """
+        rows, loci = genomes.shape
+        size = self._space.size
+        decoder = self._space.decoder
+        collector = self._metrics
+        started = collector.start()
+        variables = decoder.decode(genomes)
+        collector.stop(metrics.DECODE_TIME, started)
+        genes = genomes.reshape(rows, self._variables, size)
+
+        block = max(1, min(loci, self._buffer_size //
+                           (rows * self._neighbor_bytes)))
+        best_scores = scores.copy()
+        best_loci = numpy.full(rows, -1, dtype=numpy.int64)
+        if not self._depth_search:
+            priorities = self._rng.random((rows, loci))
+            best_priorities = numpy.full(rows, numpy.inf)
+
+        for start in range(0, loci, block):
+            stop = min(start + block, loci)
+            columns = numpy.arange(stop - start)
+            indexes, offsets = numpy.divmod(numpy.arange(start, stop), size)
+
+            started = collector.start()
+            flipped = genes[:, indexes, :]
+            flipped[:, columns, offsets] ^= 1
+            neighbors = numpy.repeat(variables[:, numpy.newaxis, :],
+                                     stop - start, axis=1)
+            collector.stop(metrics.NEIGHBOR_TIME, started)
+
+            started = collector.start()
+            neighbors[:, columns, indexes] = decoder.decode(
+                flipped.reshape(rows, -1))
+            collector.stop(metrics.DECODE_TIME, started)
+
+            collector.count(metrics.OBJECTIVE_CALLS, rows * (stop - start))
+            candidates = self._objective.evaluate_batch(
+                neighbors.reshape(-1, self._variables)).reshape(rows, -1)
+
+            if self._depth_search:
+                index = numpy.argmin(candidates, axis=1)
+                candidate_scores = candidates[numpy.arange(rows), index]
+                better = candidate_scores < best_scores
+                best_scores[better] = candidate_scores[better]
+            else:
+                keys = numpy.where(candidates < scores[:, numpy.newaxis],
+                                   priorities[:, start:stop], numpy.inf)
+                index = numpy.argmin(keys, axis=1)
+                candidate_keys = keys[numpy.arange(rows), index]
+                better = candidate_keys < best_priorities
+                best_priorities[better] = candidate_keys[better]
+                best_scores[better] = candidates[better, index[better]]
+            best_loci[better] = index[better] + start
+
+        return best_scores, best_loci
+
+    def _step(self, genomes, scores, active, rows):
+        """Move the received rows to their chosen neighbors."""
+        best_scores, best_loci = self._explore(genomes[rows], scores[rows])
+        moved = best_loci >= 0
+        self._metrics.count(metrics.MOVES, int(numpy.count_nonzero(moved)))
+        genomes[rows[moved], best_loci[moved]] ^= 1
+        scores[rows[moved]] = best_scores[moved]
+        active[rows[~moved]] = False
+
+    def run(self, restarts, rng=None):
+        """Run the restarts and return a `base.Result` for each one.
+
+        :param rng: the `numpy.random.Generator` used by all the restarts
+        """
+        self._rng = rng or numpy.random.default_rng()
+        loci = self._variables * self._space.size
+        genomes = objects.Chromosome.random_population(
+            restarts, self._variables, self._space, self._rng)
+        self._metrics.count(metrics.OBJECTIVE_CALLS, restarts)
+        self._metrics.count(metrics.TASKS, restarts)
+        scores = self._objective.compute_bits(genomes)
+        evaluations = numpy.ones(restarts, dtype=numpy.int64)
+        active = numpy.ones(restarts, dtype=bool)
+
+        while True:
+            active &= evaluations < self._max_evaluations
+            rows = numpy.flatnonzero(active)
+            if not rows.size:
+                break
+
+            group = max(1, self._buffer_size //
+                        (loci * self._neighbor_bytes))
+            for start in range(0, rows.size, group):
+                self._step(genomes, scores, active, rows[start:start + group])
+            evaluations[rows] += 1
+
+        packed = numpy.packbits(genomes, axis=1)
+        return [base.Result(float(scores[row]), int(evaluations[row]),
+                            packed[row].tobytes())
+                for row in range(restarts)]
@@ -1,29 +1,99 @@
 import abc
-import time
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
+import multiprocessing
+import secrets
 import threading
-import uuid
 try:
     import queue
 except ImportError:
     import Queue as queue
 
+import numpy
+import six
+
 from optinum import factory
+from optinum.analysis import checkpoint
+from optinum.analysis import store
+from optinum.common import broker as brokers
+from optinum.common import cache as caches
 from optinum.common import config
+from optinum.common import metrics
+from optinum.common import stats
 from optinum.common import utils
-from optinum.worker import base
+from optinum.common import worker as base
 
 LOG = utils.get_logger(__name__)
 
+# The identifiers of the tasks created by this process.
+_TASK_IDS = itertools.count()
+# The answer of a remote worker which is still running a task.
+_ALIVE = 'alive'
+
+# Everything required in order to rebuild a task in another process.
+TaskSpec = collections.namedtuple(
+    'TaskSpec', ['algorithm', 'objective', 'precision', 'variables', 'seed',
+                 'metrics', 'state', 'kernel', 'encoding', 'cache_size'])
+
 
 class Task(object):
 
-    def __init__(self, algorithm, objective, precision, variables):
-        self._id = uuid.uuid4()
-        self._status = config.STATUS.NOSET
-        self._algorithm = factory.algorithm(self.algorithm)
-        self._objective = factory.objective_function(objective)(precision)
+    def __init__(self, algorithm, objective, precision, variables,
+                 cache=None, seed=None, metrics_enabled=None,
+                 checkpoint=False, state=None,
+                 kernel=config.KERNEL.DEFAULT,
+                 encoding=config.ENCODING.DEFAULT, cache_size=None):
+        """Setup a new task.
+
+        :param cache: optional `cache.EvaluationCache` used for the
+                      scores computed by the algorithm
+        :param seed:  the seed of the random number generator used by
+                      the algorithm; fresh entropy is used if it is missing
+        :param metrics_enabled: overwrite `config.METRICS.ENABLED`
+        :param checkpoint: ask the algorithm to report its progress
+        :param state: the `State` from which the algorithm continues
+        :param kernel: the backend of the objective function, one of
+                       the values from `config.KERNEL`
+        :param encoding: the way in which the genes store the variables,
+                         one of the values from `config.ENCODING`
+        :param cache_size: the size of a new cache owned by the task,
+                           when `cache` is missing (0 - unlimited)
+        """
+        self._id = next(_TASK_IDS)
+        self._status = config.STATUS.NOTSET
+        self._algorithm_name = algorithm
+        self._objective_name = objective
+        self._algorithm = factory.algorithm(algorithm)()
+        self._objective = factory.objective_function(objective)(
+            precision, encoding=encoding, backend=kernel)
         self._precision = precision
         self._variables = variables
+        if cache is None and cache_size is not None:
+            cache = caches.EvaluationCache(cache_size)
+        self._cache = cache
+        self._seed = next(utils.seed_stream()) if seed is None else seed
+        self._rng = None
+        self._result = None
+        self._error = None
+        self._wall_time = None
+        self._checkpoint = checkpoint
+        self._state = state
+        self._metrics = metrics.new_metrics(metrics_enabled)
+        self._queued_at = None
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._callbacks = []
+
+    @classmethod
+    def from_spec(cls, spec):
+        return cls(spec.algorithm, spec.objective, spec.precision,
+                   spec.variables, seed=spec.seed,
+                   metrics_enabled=spec.metrics, state=spec.state,
+                   kernel=spec.kernel, encoding=spec.encoding,
+                   cache_size=spec.cache_size)
 
     @property
     def algorithm(self):
@@ -49,78 +119,739 @@ class Task(object):
     def status(self):
         return self._status
 
+    @property
+    def cache(self):
+        return self._cache
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def rng(self):
+        """The random number generator owned by this task."""
+        if self._rng is None:
+            self._rng = numpy.random.default_rng(self._seed)
+        return self._rng
+
+    @property
+    def spec(self):
+        return TaskSpec(self._algorithm_name, self._objective_name,
+                        self._precision, self._variables, self._seed,
+                        self._metrics.enabled, self._state,
+                        self._objective.backend, self._objective.encoding,
+                        None if self._cache is None else
+                        self._cache.max_size)
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @property
+    def checkpoint(self):
+        return self._checkpoint
+
+    @property
+    def state(self):
+        """The last known progress of the algorithm."""
+        return self._state
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def wall_time(self):
+        """The seconds spent by the algorithm, None until it ran."""
+        return self._wall_time
+
+    def callback_queued(self):
+        self._queued_at = self._metrics.start()
+
+    def callback_start(self):
+        self._status = config.STATUS.RUNNING
+        if self._queued_at is not None:
+            self._metrics.stop(metrics.QUEUE_WAIT, self._queued_at)
+
+    def callback_progress(self, state):
+        self._state = state
+
+    def callback_timed(self, wall_time):
+        """Record the duration measured where the task ran."""
+        self._wall_time = wall_time
+
     def callback_fail(self, exc):
+        self._error = exc
         self._status = config.STATUS.ERROR
+        self._finish()
 
-    def callback_done(self):
+    def callback_done(self, result):
+        self._result = result
         self._status = config.STATUS.DONE
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._finished.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        """Call `callback(task)` when the task is finished.
+
+        If the task is already finished the callback is called right away.
+        """
+        with self._lock:
+            if not self._finished.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def wait(self, timeout=None):
+        """Block until the task is finished or the timeout expires."""
+        return self._finished.wait(timeout)
 
     def is_done(self):
         return self._status == config.STATUS.DONE
 
+    def is_finished(self):
+        return self._finished.is_set()
+
+    def _cache_counters(self):
+        if self._cache is None:
+            return (0, 0, 0)
+        return (self._cache.hits, self._cache.misses, self._cache.evictions)
+
     def run(self):
-        self._status = config.STATUS.RUNNING
-        self._algorithm.start(self)
+        self.callback_start()
+        self._metrics.count(metrics.TASKS)
+        cached = self._cache_counters()
+        started = metrics.clock()
+        try:
+            self._algorithm.start(self)
+        finally:
+            self._wall_time = metrics.clock() - started
+            # the cache may be shared, only the lookups of this run count
+            for name, before, after in zip(
+                    (metrics.CACHE_HITS, metrics.CACHE_MISSES,
+                     metrics.CACHE_EVICTIONS),
+                    cached, self._cache_counters()):
+                self._metrics.count(name, after - before)
+        if self._algorithm.error is not None:
+            raise self._algorithm.error
+        return self._algorithm.result
+
+
+class WorkUnit(object):
+
+    """Several tasks which go through the executor as a single item.
+
+    The unit is queued, dispatched and reported once, so the cost of the
+    queues and of the callbacks is shared by all its tasks. It offers the
+    same callbacks as a `Task`; its result is the list of (result, error)
+    pairs of the tasks and every task is finished with its own outcome.
+    """
+
+    def __init__(self, tasks):
+        self._tasks = list(tasks)
+        self._metrics = metrics.new_metrics(self._tasks[0].metrics.enabled)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    @property
+    def tasks(self):
+        return self._tasks
+
+    @property
+    def spec(self):
+        return tuple(task.spec for task in self._tasks)
+
+    @property
+    def metrics(self):
+        """The metrics of the unit and of all its tasks."""
+        return self._metrics
+
+    @property
+    def wall_time(self):
+        return [task.wall_time for task in self._tasks]
+
+    def callback_timed(self, wall_time):
+        for task, seconds in zip(self._tasks, wall_time):
+            task.callback_timed(seconds)
+
+    def callback_queued(self):
+        for task in self._tasks:
+            task.callback_queued()
+
+    def callback_start(self):
+        """Mark the tasks as started when the unit runs in another
+        process."""
+        for task in self._tasks:
+            task.callback_start()
+            self._metrics.merge(task.metrics)
+
+    def callback_fail(self, exc):
+        for task in self._tasks:
+            if not task.is_finished():
+                task.callback_fail(exc)
+
+    def callback_done(self, outcomes):
+        for task, (result, error) in zip(self._tasks, outcomes):
+            if error is None:
+                task.callback_done(result)
+            else:
+                task.callback_fail(error)
+
+    def run(self):
+        """Run the tasks one after another."""
+        outcomes = []
+        for task in self._tasks:
+            try:
+                outcomes.append((task.run(), None))
+            except Exception as exc:    # pylint: disable=broad-except
+                outcomes.append((None, exc))
+            self._metrics.merge(task.metrics)
+        return outcomes
+
+
+def run_local(task):
+    """Run the task, or the work unit, in the current thread and
+    return its result."""
+    started = task.metrics.start()
+    try:
+        return task.run()
+    finally:
+        task.metrics.stop(metrics.RUN_TIME, started)
+
+
+def run_task(spec):
+    """Rebuild the task, or the work unit when `spec` is a sequence of
+    specifications, run it and return its result, its metrics and its
+    wall time. Used by the child processes of `ProcessAlgorithmExecutor`.
+    """
+    if isinstance(spec, TaskSpec):
+        task = Task.from_spec(spec)
+    else:
+        task = WorkUnit(Task.from_spec(item) for item in spec)
+    result = task.run()
+    return result, task.metrics.as_dict(), task.wall_time
+
+
+def _heartbeat(remote, key, done):
+    """Tell the analysis that the task `key` is running, right away and
+    every `config.BROKER.HEARTBEAT` seconds until `done` is set."""
+    while True:
+        try:
+            remote.put_result((key, _ALIVE))
+        except (EOFError, OSError):
+            return
+        if done.wait(config.BROKER.HEARTBEAT):
+            return
+
+
+def serve_tasks(remote, stop=None):
+    """Run the specifications received through the `remote` broker and
+    send back their results, until the broker goes away or `stop` is set.
+
+    The items are (key, spec) pairs and the answers are (key, result,
+    metrics, wall time, error) tuples; while a task runs, (key, 'alive')
+    pairs renew its lease. An answer which can not be pickled is replaced
+    by a `RuntimeError`. This is the loop of `optinum worker`.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            key, spec = remote.get_task(timeout=config.BROKER.TIMEOUT)
+        except queue.Empty:
+            continue
+        except (EOFError, OSError):
+            LOG.info("The broker is gone, stop the worker.")
+            break
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat,
+                                     args=(remote, key, done))
+        heartbeat.setDaemon(True)
+        heartbeat.start()
+        try:
+            result, collected, wall_time = run_task(spec)
+        except Exception as exc:    # pylint: disable=broad-except
+            answer = (key, None, None, None, exc)
+        else:
+            answer = (key, result, collected, wall_time, None)
+        finally:
+            done.set()
+            heartbeat.join()
+
+        try:
+            try:
+                remote.put_result(answer)
+            except (EOFError, OSError):
+                raise
+            except Exception as exc:    # pylint: disable=broad-except
+                reason = answer[4] if answer[4] is not None else exc
+                LOG.error("The answer of the task %(key)s can not be sent: "
+                          "%(error)r", {"key": key, "error": exc})
+                remote.put_result((key, None, None, None,
+                                   RuntimeError(repr(reason))))
+        except (EOFError, OSError):
+            LOG.info("The broker is gone, stop the worker.")
+            break
 
 
 class AlgorithmExecutor(base.ConcurrentWorker):
 
-    def __init__(self, task_queue, *args, **kwargs):
-        super(AlgorithmExecutor, self).__init__(*args, **kwargs)
-        self._task_queue = task_queue
+    def __init__(self, broker, qsize=config.WORKER.QSIZE,
+                 wcount=config.WORKER.WORKERS, debug=config.MISC.DEBUG,
+                 delay=config.WORKER.DELAY, loop=False, name=None,
+                 policy=None):
+        """Setup a new executor.
+
+        :param broker: the `broker.Broker` from which the tasks are taken
+        """
+        super(AlgorithmExecutor, self).__init__(qsize, wcount, debug, delay,
+                                                loop, name, policy=policy)
+        self._broker = broker
         self._tasks = {}
+        self._metrics_lock = threading.Lock()
+        self._worker_metrics = {}
+
+    @property
+    def worker_metrics(self):
+        """The metrics of the finished tasks grouped by worker."""
+        return self._worker_metrics
+
+    def _collect_metrics(self, task):
+        if not task.metrics.enabled:
+            return
+        name = threading.current_thread().name
+        with self._metrics_lock:
+            collected = self._worker_metrics.setdefault(name,
+                                                        metrics.Metrics())
+            collected.merge(task.metrics)
 
     def task_generator(self):
         """Retrieves a task from the queue."""
         while not self.stop.is_set():
-            try:
-                task = self._task_queue.get(block=True, timeout=self.delay)
-                if task:
-                    yield task
-            except queue.Empty:
-                continue
+            task = self._broker.get_task()
+            if task:
+                yield task
+
+    def halt(self):
+        """Stop processing and wake up the task generator."""
+        super(AlgorithmExecutor, self).halt()
+        try:
+            self._broker.put_task(None, block=False)
+        except queue.Full:
+            # the task generator is not waiting for a task
+            pass
 
     def task_fail(self, task, exc):
         """What to do when the program fails processing a task."""
         super(AlgorithmExecutor, self).task_fail(task, exc)
+        self._collect_metrics(task)
         task.callback_fail(exc)
 
     def task_done(self, task, result):
         """What to execute after successfully finished processing a task."""
         super(AlgorithmExecutor, self).task_done(task, result)
-        task.callback_done()
+        self._collect_metrics(task)
+        task.callback_done(result)
 
     def process(self, task):
         """Execute the current task."""
-        task.run()
+        return run_local(task)
+
+
+class ProcessAlgorithmExecutor(AlgorithmExecutor,
+                               base.ProcessConcurrentWorker):
+
+    """Executor which runs the tasks in child processes.
+
+    Only the specification of the task is sent to the child process and
+    only the compact result is sent back; the child process builds a new
+    evaluation cache of the same size and only its counters come back.
+    """
+
+    def process(self, task):
+        """Execute the current task in a child process."""
+        task.callback_start()
+        started = task.metrics.start()
+        try:
+            result, collected, wall_time = self.run_remote(run_task,
+                                                           task.spec)
+        finally:
+            task.metrics.stop(metrics.RUN_TIME, started)
+        task.metrics.merge(metrics.Metrics.from_dict(collected))
+        task.callback_timed(wall_time)
+        return result
+
+
+class RemoteAlgorithmExecutor(AlgorithmExecutor):
+
+    """Executor which sends the tasks to the workers connected to a
+    broker, see `serve_tasks`.
+
+    Every dispatcher keeps one task in flight, so `wcount` should match
+    the number of remote workers. Only the specifications of the tasks
+    travel through the broker, as for `ProcessAlgorithmExecutor`.
+
+    A task is leased for `config.BROKER.LEASE` seconds, renewed by the
+    signs of life of the worker which runs it; when the lease expires the
+    task is sent again. A task given up by `config.MISC.TRIES` workers
+    fails. With fewer workers than dispatchers a task can also wait in
+    the queue longer than its lease and run twice; the first answer wins.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Setup a new executor.
+
+        :param remote: the `broker.Broker` shared with the workers
+        """
+        self._remote = kwargs.pop("remote", None) or brokers.ManagerBroker()
+        super(RemoteAlgorithmExecutor, self).__init__(*args, **kwargs)
+        self._keys = itertools.count()
+        self._pending = {}
+        self._leases = {}       # the expiry of the tasks, taken or not
+        self._pending_lock = threading.Lock()
+        self._collector = None
+
+    def prologue(self):
+        """Serve the broker and start collecting the results."""
+        self._remote.start()
+        self._collector = threading.Thread(target=self._collect_results)
+        self._collector.setDaemon(True)
+        self._collector.start()
+        super(RemoteAlgorithmExecutor, self).prologue()
+
+    def epilogue(self):
+        """Wait for the dispatchers and stop serving the broker."""
+        super(RemoteAlgorithmExecutor, self).epilogue()
+        self._collector.join()
+        self._remote.close()
+
+    def _collect_results(self):
+        """Hand the results received from the workers to the
+        dispatchers."""
+        while not self.stop.is_set():
+            try:
+                answer = self._remote.get_result(
+                    timeout=config.BROKER.TIMEOUT)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                LOG.error("The broker is gone, stop collecting results.")
+                break
+            except Exception as exc:    # pylint: disable=broad-except
+                LOG.error("Failed to receive a result: %(error)r",
+                          {"error": exc})
+                continue
+
+            if answer[1:] == (_ALIVE, ):
+                with self._pending_lock:
+                    if answer[0] in self._pending:
+                        self._leases[answer[0]] = (
+                            metrics.clock() + config.BROKER.LEASE, True)
+                continue
+
+            key, result, collected, wall_time, error = answer
+            with self._pending_lock:
+                future = self._pending.pop(key, None)
+                self._leases.pop(key, None)
+            if future is None:
+                continue
+            if error is None:
+                future.set_result((result, collected, wall_time))
+            else:
+                future.set_exception(error)
+
+    def process(self, task):
+        """Send the current task to a worker and wait for its result."""
+        task.callback_start()
+        future = concurrent.futures.Future()
+        key = next(self._keys)
+        with self._pending_lock:
+            self._pending[key] = future
+        started = task.metrics.start()
+        try:
+            result, collected, wall_time = self._dispatch(key, task.spec,
+                                                          future)
+        finally:
+            with self._pending_lock:
+                self._pending.pop(key, None)
+                self._leases.pop(key, None)
+            task.metrics.stop(metrics.RUN_TIME, started)
+        task.metrics.merge(metrics.Metrics.from_dict(collected))
+        task.callback_timed(wall_time)
+        return result
+
+    def _send(self, key, spec):
+        """Queue the specification and start its lease."""
+        with self._pending_lock:
+            self._leases[key] = (metrics.clock() + config.BROKER.LEASE,
+                                 False)
+        self._remote.put_task((key, spec))
+
+    def _expired(self, key):
+        """Return None while the lease of the task `key` holds, otherwise
+        whether a worker had taken the task."""
+        with self._pending_lock:
+            deadline, taken = self._leases.get(key, (None, False))
+            if deadline is None or metrics.clock() < deadline:
+                return None
+            return taken
+
+    def _dispatch(self, key, spec, future):
+        """Send the specification to the workers until one of them
+        answers and return the answer."""
+        tries = 0
+        self._send(key, spec)
+        while True:
+            try:
+                return future.result(config.BROKER.TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                pass
+            if self.stop.is_set():
+                raise RuntimeError("The executor stopped before the task "
+                                   "was finished.")
+            taken = self._expired(key)
+            if taken is None:
+                continue
+            if taken:
+                tries += 1
+                if tries >= config.MISC.TRIES:
+                    raise RuntimeError("The task was lost by %(tries)d "
+                                       "workers." % {"tries": tries})
+                LOG.warning("The worker of the task %(key)s stopped "
+                            "answering, sending it again.", {"key": key})
+            self._send(key, spec)
+
+
+EXECUTORS = {
+    'thread': AlgorithmExecutor,
+    'process': ProcessAlgorithmExecutor,
+    'remote': RemoteAlgorithmExecutor,
+}
 
 
+def create_pool(backend=config.WORKER.BACKEND,
+                workers=config.WORKER.WORKERS):
+    """Return the `concurrent.futures` executor used by the asyncio
+    interface of the analyses for the received backend."""
+    if backend == 'process':
+        context = multiprocessing.get_context(config.WORKER.START_METHOD)
+        return concurrent.futures.ProcessPoolExecutor(workers,
+                                                      mp_context=context)
+    return concurrent.futures.ThreadPoolExecutor(workers)
+
+
+@six.add_metaclass(abc.ABCMeta)
 class Analysis(object):
 
-    def __init__(self, command, executor=AlgorithmExecutor):
-        self._task_queue = queue.Queue()
+    def __init__(self, command, executor=None):
+        """Setup a new analysis.
+
+        :param command: the parsed command line arguments; it provides the
+                        algorithm, objective, precision, variables, seed,
+                        backend, workers, autoscale, min_workers,
+                        max_workers, chunk_size, kernel, encoding,
+                        cache_size, checkpoint, checkpoint_interval,
+                        resume and store; the `remote` backend also needs
+                        broker and authkey, a random authkey is printed
+                        when it is missing
+        :param executor: the executor class, if it is missing the one
+                         for `command.backend` will be used
+        """
+        self._broker = brokers.MemoryBroker(config.WORKER.QSIZE)
         self._command = command
-        self._executor = executor(self._task_queue)
+        self._algorithm = command.algorithm
+        self._tasks = collections.OrderedDict()
+        self._tasks_lock = threading.Lock()
+        self._done_count = 0        # the finished tasks
+        self._restored_count = 0    # the tasks finished by the checkpoint
+        self._summary = stats.Summary()
+        self._store = store.ResultStore(command.store, self._genome_bytes())
+        self._started_at = None
+        self._checkpoint = self._setup_checkpoint()
+        seed = command.seed
+        if self._checkpoint is not None:
+            seed = self._checkpoint.seed
+        self._seeds = utils.seed_stream(seed)
+        self._checkpoint_stop = threading.Event()
+        self._checkpointer = None
+        self._async_metrics = metrics.Metrics()
+        if executor is None:
+            executor = EXECUTORS[command.backend]
+        policy = None
+        if command.autoscale:
+            policy = base.ScalingPolicy(command.min_workers,
+                                        command.max_workers)
+        options = {}
+        if command.backend == 'remote':
+            authkey = command.authkey
+            if not authkey:
+                authkey = secrets.token_hex(16)
+                LOG.warning("No authkey was received, start the workers "
+                            "with --authkey %(authkey)s",
+                            {"authkey": authkey})
+            options["remote"] = brokers.ManagerBroker(command.broker,
+                                                      authkey)
+        self._executor = executor(self._broker, wcount=command.workers,
+                                  policy=policy, **options)
 
         self.stop = threading.Event()
-        self.executor = threading.Thread(target=self._executor.start)
+        self.executor = threading.Thread(target=self._run_executor)
         self.executor.setDaemon(True)
+        self._finished = threading.Condition()
+
+    @property
+    def checkpoint(self):
+        """The `checkpoint.Checkpoint` of the analysis, if any."""
+        return self._checkpoint
+
+    @property
+    def store(self):
+        """The `store.ResultStore` which receives the finished
+        restarts."""
+        return self._store
+
+    def _genome_bytes(self):
+        """The size of the packed chromosomes of the restarts."""
+        objective = factory.objective_function(self._command.objective)(
+            self._command.precision, encoding=self._command.encoding)
+        loci = self._command.variables * objective.search_space.size
+        return -(-loci // 8)
+
+    def _settings(self):
+        """The values which must not change when an analysis resumes."""
+        return {
+            "algorithm": self._command.algorithm,
+            "objective": self._command.objective,
+            "precision": self._command.precision,
+            "variables": self._command.variables,
+            "encoding": self._command.encoding,
+        }
+
+    def _setup_checkpoint(self):
+        """Create the checkpoint, loading it when the analysis resumes."""
+        if not self._command.checkpoint:
+            if self._command.resume:
+                raise ValueError("A checkpoint file is required in order "
+                                 "to resume an analysis.")
+            return None
+
+        progress = checkpoint.Checkpoint(self._command.checkpoint,
+                                         self._settings(), self._command.seed)
+        if self._command.resume and progress.load():
+            progress.verify(self._settings())
+            if self._command.seed not in (None, progress.seed):
+                raise ValueError("The checkpoint %(path)s was created with "
+                                 "the seed %(seed)s." %
+                                 {"path": progress.path,
+                                  "seed": progress.seed})
+        elif progress.seed is None:
+            # the restarts can be rebuilt only from a known root seed
+            progress.seed = next(utils.seed_stream())
+        return progress
+
+    def _resume_task(self, index, task):
+        """Apply the saved progress of the restart `index` on the task.
+
+        Returns True if the restart was already finished.
+        """
+        if self._checkpoint is None:
+            return False
+
+        result = self._checkpoint.results.get(index)
+        if result is not None:
+            self._restored_count += 1
+            task.callback_done(result)
+            return True
+
+        state = self._checkpoint.states.get(index)
+        if state is not None:
+            task.callback_progress(state)
+        return False
+
+    def save_checkpoint(self):
+        """Write the results and the progress of the tasks."""
+        if self._checkpoint is None:
+            return
+        with self._tasks_lock:
+            tasks = list(self._tasks.items())
+        for index, task in tasks:
+            self._checkpoint.update(index, task.result, task.state)
+        try:
+            self._checkpoint.save()
+        except (IOError, OSError) as exc:
+            LOG.error("Failed to save the checkpoint: %(error)s",
+                      {"error": exc})
+
+    def _checkpoint_loop(self):
+        """Save the checkpoint periodically."""
+        while not self._checkpoint_stop.wait(
+                self._command.checkpoint_interval):
+            self.save_checkpoint()
+
+    def _start_checkpoints(self):
+        if self._checkpoint is None:
+            return
+        self._checkpointer = threading.Thread(target=self._checkpoint_loop)
+        self._checkpointer.setDaemon(True)
+        self._checkpointer.start()
+
+    def _stop_checkpoints(self):
+        if self._checkpointer is not None:
+            self._checkpoint_stop.set()
+            self._checkpointer.join()
+            self._checkpointer = None
+        self.save_checkpoint()
+
+    def _task_finished(self, index, task):
+        """Record the result of the restart `index`, release its task and
+        wake up everyone who waits for the tasks."""
+        result = task.result if task.is_done() else None
+        if self._checkpoint is not None and result is not None:
+            self._checkpoint.update(index, result)
+        wall_time = task.wall_time
+        self._store.append(index, result, task.id, task.seed,
+                           float("nan") if wall_time is None else wall_time)
+        with self._tasks_lock:
+            self._tasks.pop(index, None)
+        with self._finished:
+            self._done_count += 1
+            self._summary.add(result, index)
+            self._finished.notify_all()
 
     def _wait_for_tasks(self, tasks):
         LOG.debug("Waiting until the jobs are done.")
-        while not self.stop.is_set():
-            try:
+        try:
+            with self._finished:
                 for task in tasks:
-                    if not task.is_done:
-                        break
-                else:
-                    return True
-                time.sleep(config.REPORT.RETRY_INTERVAL)
-            except KeyboardInterrupt:
-                LOG.debug('Keyboard Interrupt received.')
-                self.stop.set()
+                    while not (task.is_finished() or self.stop.is_set()):
+                        if not self.executor.is_alive():
+                            LOG.error("The executor is gone, stop the "
+                                      "analysis.")
+                            self.stop.set()
+                            break
+                        self._finished.wait(config.BROKER.TIMEOUT)
+        except KeyboardInterrupt:
+            LOG.debug('Keyboard Interrupt received.')
+            self.stop.set()
 
-        return False
+        return not self.stop.is_set()
+
+    def halt(self):
+        """Stop waiting for the tasks."""
+        self.stop.set()
+        with self._finished:
+            self._finished.notify_all()
 
     @abc.abstractmethod
     def _get_task(self):
@@ -130,32 +861,252 @@ class Analysis(object):
     def report(self):
         pass
 
+    def results(self):
+        """Yield the result of every finished restart, in order, None for
+        the failed ones."""
+        self._store.flush()
+        for _, result in self._store.results():
+            yield result
+
+    def summary(self):
+        """Return the `stats.Summary` of the finished restarts."""
+        return self._summary
+
+    def metrics(self):
+        """Return the metrics collected by every worker."""
+        collected = dict(self._executor.worker_metrics)
+        if self._async_metrics.counters:
+            collected["asyncio"] = self._async_metrics
+        return collected
+
+    @property
+    def stream_metrics(self):
+        """The metrics of the tasks run by `stream`, `compute_async` and
+        `add_tasks_async`."""
+        return self._async_metrics
+
+    def scaling_metrics(self):
+        """Return the scaling decisions of the executor."""
+        return self._executor.scaling
+
+    def _submit(self, item):
+        """Queue a task or a work unit, giving up when the analysis is
+        stopped."""
+        while not self.stop.is_set():
+            try:
+                self._broker.put_task(item, timeout=config.BROKER.TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def add_task(self, task):
+        """Adds the task in the processing queue."""
+        task.callback_queued()
+        self._submit(task)
+
+    def add_tasks(self, tasks):
+        """Adds the tasks in the processing queue as a single work unit.
+
+        The call blocks while the queue holds `config.WORKER.QSIZE` items.
+        """
+        if len(tasks) == 1:
+            self.add_task(tasks[0])
+            return
+        unit = WorkUnit(tasks)
+        unit.callback_queued()
+        self._submit(unit)
+
+    def _chunk_size(self, remaining):
+        """The number of restarts grouped in the next work unit."""
+        chunk_size = self._command.chunk_size
+        if not chunk_size:
+            chunk_size = self._auto_chunk_size(remaining)
+        return max(1, min(chunk_size, remaining))
+
+    def _auto_chunk_size(self, remaining):
+        """Units of about `config.WORKER.UNIT_TIME` seconds, according to
+        the tasks finished so far, but enough of them for every worker."""
+        with self._finished:
+            done = self._done_count - self._restored_count
+        if not done:
+            return 1
+
+        workers = self._executor.capacity
+        cost = (metrics.clock() - self._started_at) * workers / done
+        chunk_size = config.WORKER.MAX_CHUNK
+        if cost:
+            chunk_size = int(config.WORKER.UNIT_TIME / cost)
+        return min(chunk_size, -(-remaining // workers),
+                   config.WORKER.MAX_CHUNK)
+
+    def _new_task(self, index):
+        """Create the task of the restart `index`; it is already finished
+        when the checkpoint holds its result."""
+        task = self._get_task()
+        with self._tasks_lock:
+            self._tasks[index] = task      # Keep a link until it finishes
+        task.add_done_callback(functools.partial(self._task_finished, index))
+        self._resume_task(index, task)
+        return task
+
+    def _run_executor(self):
+        """The thread of the executor; the analysis stops when the
+        executor fails, e.g. when its broker can not be served."""
+        try:
+            self._executor.start()
+        except Exception as exc:    # pylint: disable=broad-except
+            LOG.error("The executor failed: %(error)r", {"error": exc})
+            self.halt()
+
     def prologue(self):
         """Executed once before the main procedures."""
         self.executor.start()
 
     def epilogue(self):
         """Executed once after the main procedures."""
-        self._executor.stop.set()
+        self._executor.halt()
         self.executor.join()
+        self._store.flush()
+
+    async def add_tasks_async(self, tasks, pool):
+        """Run the tasks as a single work unit on `pool` and return their
+        results, None for the failed ones.
+
+        :param pool: a `concurrent.futures` executor, see `create_pool`
+        """
+        loop = asyncio.get_running_loop()
+        item = tasks[0] if len(tasks) == 1 else WorkUnit(tasks)
+        item.callback_queued()
+        try:
+            if isinstance(pool, concurrent.futures.ProcessPoolExecutor):
+                item.callback_start()
+                started = item.metrics.start()
+                try:
+                    result, collected, wall_time = await (
+                        loop.run_in_executor(pool, run_task, item.spec))
+                finally:
+                    item.metrics.stop(metrics.RUN_TIME, started)
+                item.metrics.merge(metrics.Metrics.from_dict(collected))
+                item.callback_timed(wall_time)
+            else:
+                result = await loop.run_in_executor(pool, run_local, item)
+        except Exception as exc:    # pylint: disable=broad-except
+            self._async_metrics.merge(item.metrics)
+            item.callback_fail(exc)
+        else:
+            self._async_metrics.merge(item.metrics)
+            item.callback_done(result)
+        return [task.result if task.is_done() else None for task in tasks]
+
+    async def stream(self, execution_count, pool=None, first=0):
+        """Run the restarts and yield (index, result) pairs as soon as
+        they are finished, the result being None for the failed ones.
+
+        At most `config.WORKER.QSIZE` work units run at once; without a
+        `pool` one is created for `command.backend`.
+
+        :param first: the index of the first restart, so a stream can
+                      continue the restarts of an earlier one
+        """
+        loop = asyncio.get_running_loop()
+        own_pool = pool is None
+        if own_pool:
+            pool = create_pool(self._command.backend, self._command.workers)
+        limit = config.WORKER.QSIZE or self._command.workers
+        if self._started_at is None:
+            self._started_at = metrics.clock()
+        saved_at = metrics.clock()
+        pending = {}
+        try:
+            start, end = first, first + execution_count
+            while start < end or pending:
+                while (start < end and len(pending) < limit and
+                       not self.stop.is_set()):
+                    stop = start + self._chunk_size(end - start)
+                    indexes = {}
+                    for index in range(start, stop):
+                        task = self._new_task(index)
+                        if task.is_finished():
+                            yield index, task.result
+                        else:
+                            indexes[task] = index
+                    if indexes:
+                        future = asyncio.ensure_future(
+                            self.add_tasks_async(list(indexes), pool))
+                        pending[future] = indexes
+                    start = stop
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    indexes = pending.pop(future)
+                    for task, result in zip(indexes, future.result()):
+                        yield indexes[task], result
+
+                interval = self._command.checkpoint_interval
+                if (self._checkpoint is not None and
+                        metrics.clock() - saved_at >= interval):
+                    saved_at = metrics.clock()
+                    await loop.run_in_executor(None, self.save_checkpoint)
+        finally:
+            for future in pending:
+                future.cancel()
+            if self._checkpoint is not None:
+                await loop.run_in_executor(None, self.save_checkpoint)
+            if own_pool:
+                pool.shutdown(wait=False)
+
+    async def compute_async(self, execution_count, pool=None):
+        """The asyncio variant of `compute`; the restarts run on `pool`
+        and no thread waits for them."""
+        try:
+            async for _ in self.stream(execution_count, pool):
+                pass
+        except Exception as exc:
+            LOG.exception(exc)
+            return False
+        if self.stop.is_set():
+            return False
+        self.report()
+        return True
 
     def compute(self, execution_count):
         self.prologue()
         try:
-            for index in range(execution_count):
-                LOG.debug('Generate new task #%(index)s for: %(algorithm)s',
-                          {"index": index, "algorithm": self._algorithm})
-                task = self._get_task()        # Get a new task
-                self.add_task(task)            # Add it to the processing queue
-                self._tasks[task.id] = task    # Keep a link to it
-
-            if not self._wait_for_tasks(self._tasks.values()):
+            self._start_checkpoints()
+            self._started_at = metrics.clock()
+            start = 0
+            while start < execution_count and not self.stop.is_set():
+                stop = start + self._chunk_size(execution_count - start)
+                LOG.debug('Generate the tasks #%(start)s-#%(stop)s for: '
+                          '%(algorithm)s', {"start": start, "stop": stop - 1,
+                                            "algorithm": self._algorithm})
+                tasks = [self._new_task(index) for index in range(start, stop)]
+                tasks = [task for task in tasks if not task.is_finished()]
+                if tasks:
+                    self.add_tasks(tasks)    # Add them to the processing queue
+                start = stop
+
+            with self._tasks_lock:
+                running = list(self._tasks.values())
+            if not self._wait_for_tasks(running):
                 return False
 
             self.report()
+            return True
+
+        except KeyboardInterrupt:
+            # the submission blocks while the queue of the tasks is full
+            LOG.debug('Keyboard Interrupt received.')
+            self.stop.set()
+            return False
 
         except Exception as exc:
             LOG.exception(exc)
+            return False
 
         finally:
+            self._stop_checkpoints()
             self.epilogue()
@@ -0,0 +1,101 @@
+"""Persistent progress of the long-running analyses."""
+import os
+import pickle
+import threading
+
+from optinum.common import utils
+
+LOG = utils.get_logger(__name__)
+
+# The layout of the checkpoint files written by this module.
+VERSION = 1
+
+
+class Checkpoint(object):
+
+    """The progress of an analysis kept in a local file.
+
+    The file holds the settings of the analysis, the root seed of its
+    restarts, the results of the finished restarts and the last known
+    state of the running ones, all of them indexed by the position of
+    the restart. The file is replaced atomically, so a crash while it is
+    written leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path, settings=None, seed=None):
+        """Setup a new checkpoint.
+
+        :param path:     the file where the progress is saved
+        :param settings: the values which identify the analysis
+        :param seed:     the root seed of the restarts
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self.settings = settings or {}
+        self.seed = seed
+        self.results = {}
+        self.states = {}
+
+    @property
+    def path(self):
+        return self._path
+
+    def load(self):
+        """Read the checkpoint file.
+
+        Returns False if the file does not exist.
+        """
+        if not os.path.exists(self._path):
+            return False
+
+        with open(self._path, "rb") as file_handler:
+            data = pickle.load(file_handler)
+        if data.get("version") != VERSION:
+            raise ValueError("Unsupported checkpoint version: %(version)s" %
+                             {"version": data.get("version")})
+
+        self.settings = data["settings"]
+        self.seed = data["seed"]
+        self.results = data["results"]
+        self.states = data["states"]
+        LOG.debug("Loaded %(results)d results and %(states)d states from "
+                  "%(path)s", {"results": len(self.results),
+                               "states": len(self.states),
+                               "path": self._path})
+        return True
+
+    def verify(self, settings):
+        """Check that the checkpoint belongs to the received analysis."""
+        for name, value in sorted(settings.items()):
+            if self.settings.get(name) != value:
+                raise ValueError(
+                    "The checkpoint %(path)s was created with %(name)s="
+                    "%(saved)s, not %(value)s." %
+                    {"path": self._path, "name": name, "value": value,
+                     "saved": self.settings.get(name)})
+
+    def update(self, index, result=None, state=None):
+        """Record the result or the current state of a restart."""
+        with self._lock:
+            if result is not None:
+                self.results[index] = result
+                self.states.pop(index, None)
+            elif state is not None:
+                self.states[index] = state
+
+    def save(self):
+        """Write the progress in the checkpoint file."""
+        data = {
+            "version": VERSION,
+            "settings": self.settings,
+            "seed": self.seed,
+            "results": self.results,
+            "states": self.states,
+        }
+        temporary = self._path + ".tmp"
+        with self._lock:
+            with open(temporary, "wb") as file_handler:
+                pickle.dump(data, file_handler, pickle.HIGHEST_PROTOCOL)
+                file_handler.flush()
+                os.fsync(file_handler.fileno())
+            os.replace(temporary, self._path)
@@ -1,36 +1,174 @@
+import numpy
 from prettytable import PrettyTable
 
+from optinum import factory
+from optinum.algorithm import lockstep
 from optinum.analysis import base
 from optinum.common import config
+from optinum.common import metrics
+from optinum.common import utils
+
+LOG = utils.get_logger(__name__)
 
 
 class HCAnalysis(base.Analysis):
 
-    def __init__(self):
-        super(HCAnalysis, self).__init__()
+    def __init__(self, command, executor=None):
+        super(HCAnalysis, self).__init__(command, executor)
+        self._lockstep_metrics = None
 
     def _report_header(self):
+        objective = factory.objective_function(self._command.objective)(
+            self._command.precision, encoding=self._command.encoding,
+            backend=self._command.kernel)
         table = PrettyTable(header=False)
         table.add_row(["Algorithm", self._algorithm])
-        table.add_row(["Objective function", self._task.objective])
-        table.add_row(["Variables", self._task.variables])
-        table.add_row(["Space", self._task.search_space])
+        table.add_row(["Objective function", self._command.objective])
+        table.add_row(["Variables", self._command.variables])
+        table.add_row(["Space", objective.search_space])
+        table.add_row(["Engine", self._command.engine])
+        table.add_row(["Kernels", objective.backend])
         return table
 
     def _report_content(self):
-        table = PrettyTable(["No.", "Evaluations", "Score"])
-        for index, task in enumerate(self._tasks.values()):
-            if task.status != config.STATUS.ERROR:
-                # TODO(alexandrucoman): Add row
-                pass
+        """List the restarts, only the best ones if there are more than
+        `config.STATS.REPORT_ROWS`."""
+        rows = config.STATS.REPORT_ROWS
+        self.store.flush()
+        table = PrettyTable(["No.", "Evaluations", "Score", "Time (s)"])
+        wall_time = self.store.column("wall_time")
+        if len(self.store) > rows:
+            table.title = "The %d best restarts" % rows
+            selected = self.store.best(rows)
+        else:
+            selected = numpy.argsort(self.store.column("index"),
+                                     kind="stable")
+
+        for row, (index, result) in zip(selected,
+                                        self.store.results(selected)):
+            seconds = ('-' if numpy.isnan(wall_time[row]) else
+                       "%.4f" % wall_time[row])
+            if result is not None:
+                table.add_row([index, result.evaluations, result.score,
+                               seconds])
             else:
-                table.add_row([index, '-', 'Error'])
+                table.add_row([index, '-', 'Error', seconds])
+        return table
+
+    def _report_summary(self):
+        summary = self.summary()
+        table = PrettyTable(["Statistic", "Value"])
+        table.add_row(["Restarts", summary.count + summary.failures])
+        table.add_row(["Failed", summary.failures])
+        if summary.count:
+            table.add_row(["Best score", summary.best.score])
+            table.add_row(["Best restart", summary.best_index])
+            table.add_row(["Mean score", summary.mean])
+            table.add_row(["Std. deviation",
+                           '-' if summary.std is None else summary.std])
+            for fraction in config.STATS.QUANTILES:
+                table.add_row(["%g%% quantile" % (fraction * 100),
+                               summary.quantile(fraction)])
+            table.add_row(["Evaluations", summary.evaluations])
+            table.add_row(["Evaluations to best",
+                           summary.evaluations_to_best])
+        return table
 
     def _get_task(self):
-        pass
+        return base.Task(self._algorithm, self._command.objective,
+                         self._command.precision, self._command.variables,
+                         seed=next(self._seeds),
+                         checkpoint=self.checkpoint is not None,
+                         kernel=self._command.kernel,
+                         encoding=self._command.encoding,
+                         cache_size=self._command.cache_size)
+
+    def _compute_lockstep(self, execution_count):
+        """Run all the restarts together in the current thread."""
+        if self.checkpoint is not None:
+            LOG.warning("The lockstep engine does not support checkpoints.")
+        algorithm = factory.algorithm(self._algorithm)()
+        objective = factory.objective_function(self._command.objective)(
+            self._command.precision, encoding=self._command.encoding,
+            backend=self._command.kernel)
+        engine = lockstep.LockstepHillClimbing.from_algorithm(
+            algorithm, objective, self._command.variables)
+        self._lockstep_metrics = engine.metrics
+        try:
+            seed = next(self._seeds)
+            rng = numpy.random.default_rng(seed)
+            started = engine.metrics.start()
+            results = engine.run(execution_count, rng)
+            engine.metrics.stop(metrics.RUN_TIME, started)
+            # the restarts share the seed and advance together
+            for index, result in enumerate(results):
+                self.store.append(index, result, seed=seed)
+                self._summary.add(result, index)
+            self.report()
+        except Exception as exc:
+            LOG.exception(exc)
+            return False
+        return True
+
+    def metrics(self):
+        collected = super(HCAnalysis, self).metrics()
+        if self._lockstep_metrics is not None:
+            collected[config.ENGINE.LOCKSTEP] = self._lockstep_metrics
+        return collected
+
+    def _report_metrics(self):
+        collected = {name: values for name, values in self.metrics().items()
+                     if values.enabled}
+        if not collected:
+            return None
+
+        total = metrics.Metrics()
+        table = PrettyTable(["Worker", "Tasks", "Objective calls",
+                             "Evaluations/s"])
+        for name, values in sorted(collected.items()):
+            total.merge(values)
+            run_time = values.timers[metrics.RUN_TIME]
+            table.add_row([name, values.counters[metrics.TASKS],
+                           values.counters[metrics.OBJECTIVE_CALLS],
+                           "%.1f" % (values.counters[metrics.OBJECTIVE_CALLS]
+                                     / run_time) if run_time else '-'])
+
+        tasks = total.counters[metrics.TASKS] or 1
+        table.add_row(["Total", total.counters[metrics.TASKS],
+                       total.counters[metrics.OBJECTIVE_CALLS], '-'])
+        table.add_row(["Moves accepted", total.counters[metrics.MOVES],
+                       '', ''])
+        for label, name in (("Decode time (s)", metrics.DECODE_TIME),
+                            ("Neighbor time (s)", metrics.NEIGHBOR_TIME),
+                            ("Run time (s)", metrics.RUN_TIME)):
+            table.add_row([label, "%.4f" % total.timers[name], '', ''])
+        table.add_row(["Mean queue wait (s)",
+                       "%.4f" % (total.timers[metrics.QUEUE_WAIT] / tasks),
+                       '', ''])
+        if self._command.cache_size is not None:
+            for label, name in (("Cache hits", metrics.CACHE_HITS),
+                                ("Cache misses", metrics.CACHE_MISSES),
+                                ("Cache evictions", metrics.CACHE_EVICTIONS)):
+                table.add_row([label, total.counters[name], '', ''])
+        if self._command.autoscale:
+            scaling = self.scaling_metrics()
+            for label, name in (("Workers started", metrics.WORKERS_STARTED),
+                                ("Workers retired", metrics.WORKERS_RETIRED),
+                                ("Peak workers", metrics.PEAK_WORKERS)):
+                table.add_row([label, scaling.counters[name], '', ''])
+        return table
+
+    def compute(self, execution_count):
+        if self._command.engine == config.ENGINE.LOCKSTEP:
+            return self._compute_lockstep(execution_count)
+        return super(HCAnalysis, self).compute(execution_count)
 
     def report(self):
         header = self._report_header()
         content = self._report_content()
         print(header)
         print(content)
+        print(self._report_summary())
+        instrumentation = self._report_metrics()
+        if instrumentation is not None:
+            print(instrumentation)
@@ -0,0 +1,315 @@
+"""Racing of several configurations under a global budget.
+
+The configurations receive their restarts in rounds. After every round
+the ones whose mean score is worse than the one of the best configuration
+with the required confidence (a one-sided Welch t-test) are dropped, and
+the restarts of the next rounds are shared by the remaining ones.
+"""
+import argparse
+import asyncio
+import itertools
+import math
+import statistics
+
+from prettytable import PrettyTable
+
+from optinum.analysis import base
+from optinum.analysis import hcanalysis
+from optinum.common import config
+from optinum.common import metrics
+from optinum.common import stats
+from optinum.common import utils
+
+LOG = utils.get_logger(__name__)
+
+
+def grid(command, **axes):
+    """Yield a copy of `command` for every combination of the values
+    received for its attributes.
+
+        grid(command, algorithm=["HCFirstImprovement",
+                                 "HCBestImprovement"], precision=[2, 4])
+    """
+    names = sorted(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        options = dict(vars(command))
+        options.update(zip(names, values))
+        yield argparse.Namespace(**options)
+
+
+def t_quantile(probability, freedom):
+    """The quantile of the Student t distribution, by the Cornish-Fisher
+    expansion around the normal one; within 0.005 of the exact value from
+    3 degrees of freedom on, a little lower below them."""
+    z = statistics.NormalDist().inv_cdf(probability)
+    return (z + (z ** 3 + z) / (4 * freedom) +
+            (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * freedom ** 2) +
+            (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) /
+            (384 * freedom ** 3) +
+            (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 -
+             945 * z) / (92160 * freedom ** 4))
+
+
+class Candidate(object):
+
+    """A configuration which takes part in a race."""
+
+    def __init__(self, command, analysis):
+        self._command = command
+        self._analysis = analysis(command)
+        self._summary = stats.Summary()
+        self._runs = 0
+        self._eliminated = None     # the round which dropped it
+
+    @property
+    def command(self):
+        return self._command
+
+    @property
+    def label(self):
+        return ("%(algorithm)s/%(objective)s/p=%(precision)s/"
+                "v=%(variables)s" % {
+                    "algorithm": self._command.algorithm,
+                    "objective": self._command.objective,
+                    "precision": self._command.precision,
+                    "variables": self._command.variables})
+
+    @property
+    def runs(self):
+        """The number of finished restarts, failed ones included."""
+        return self._runs
+
+    @property
+    def evaluations(self):
+        """The objective calls made by the finished restarts, None when
+        their tasks did not collect metrics."""
+        collected = self._analysis.stream_metrics
+        if self._runs and not collected.counters[metrics.TASKS]:
+            return None
+        return collected.counters[metrics.OBJECTIVE_CALLS]
+
+    @property
+    def cost(self):
+        """The mean objective calls of a restart, None before the first
+        one is finished."""
+        if not self._runs:
+            return None
+        return float(self.evaluations) / self._runs
+
+    @property
+    def count(self):
+        """The number of scores known."""
+        return self._summary.count
+
+    @property
+    def mean(self):
+        return self._summary.mean
+
+    @property
+    def variance(self):
+        return self._summary.variance
+
+    @property
+    def best(self):
+        return self._summary.best.score
+
+    @property
+    def eliminated(self):
+        return self._eliminated
+
+    @property
+    def alive(self):
+        return self._eliminated is None
+
+    def eliminate(self, race_round):
+        self._eliminated = race_round
+
+    async def run(self, count, pool):
+        """Run `count` more restarts on `pool`."""
+        async for index, result in self._analysis.stream(
+                count, pool, first=self._runs):
+            self._runs += 1
+            self._summary.add(result, index)
+
+    def dominated_by(self, other, confidence):
+        """Whether the mean score of `other` is lower with the received
+        confidence."""
+        difference = self.mean - other.mean
+        if difference <= 0:
+            return False
+        own = self.variance / self.count
+        others = other.variance / other.count
+        error = own + others
+        if not error:
+            return True
+        freedom = error ** 2 / (own ** 2 / (self.count - 1) +
+                                others ** 2 / (other.count - 1))
+        return difference / math.sqrt(error) > t_quantile(confidence,
+                                                          freedom)
+
+
+class Race(object):
+
+    """Give the restarts to the configurations which can still win."""
+
+    def __init__(self, commands, budget=None, time_budget=None,
+                 batch=config.RACE.BATCH, min_runs=config.RACE.MIN_RUNS,
+                 confidence=config.RACE.CONFIDENCE,
+                 analysis=hcanalysis.HCAnalysis):
+        """Setup a new race.
+
+        :param commands:    the configurations, as for `Analysis`; the
+                            ones without a seed share a new root seed
+        :param budget:      the total number of objective evaluations,
+                            counted by `metrics.OBJECTIVE_CALLS`
+        :param time_budget: the total number of seconds
+        :param batch:       restarts for every configuration in a round;
+                            the rounds keep the same size when the
+                            configurations are dropped
+        :param min_runs:    restarts required before a configuration can
+                            be dropped
+        :param confidence:  required in order to drop a configuration
+        """
+        if budget is None and time_budget is None:
+            raise ValueError("A race needs an evaluation or a time budget.")
+        if budget is not None and not config.METRICS.ENABLED:
+            raise ValueError("An evaluation budget needs the metrics, see "
+                             "config.METRICS.ENABLED.")
+        # the restarts of every configuration start from the same seeds
+        seed = next(utils.seed_stream())
+        self._candidates = [
+            Candidate(command if command.seed is not None else
+                      argparse.Namespace(**dict(vars(command), seed=seed)),
+                      analysis)
+            for command in commands]
+        self._budget = budget
+        self._time_budget = time_budget
+        self._round_size = batch * len(self._candidates)
+        self._min_runs = max(min_runs, 2)
+        self._confidence = confidence
+        self._round = 0
+        self._started_at = None
+
+    @property
+    def candidates(self):
+        return self._candidates
+
+    def alive(self):
+        return [candidate for candidate in self._candidates
+                if candidate.alive]
+
+    def winner(self):
+        """The configuration with the lowest mean score."""
+        scored = [candidate for candidate in self.alive() if candidate.count]
+        if not scored:
+            return None
+        return min(scored, key=lambda candidate: candidate.mean)
+
+    def _spent(self):
+        spent = [candidate.evaluations for candidate in self._candidates]
+        if None in spent:
+            raise RuntimeError("The restarts did not count their objective "
+                               "calls, see config.METRICS.ENABLED.")
+        return sum(spent)
+
+    def _exhausted(self):
+        if (self._time_budget is not None and
+                metrics.clock() - self._started_at >= self._time_budget):
+            return True
+        return self._budget is not None and self._spent() >= self._budget
+
+    def _batch_size(self, alive):
+        """The restarts of every remaining configuration in this round,
+        fewer when the budget would be exceeded and 0 when it can not pay
+        for one more restart of each of them.
+
+        The cost of a configuration is known only after its first
+        restart, so the first round runs a single restart of each one.
+        """
+        batch = -(-self._round_size // len(alive))
+        if self._budget is None:
+            return batch
+        costs = [candidate.cost for candidate in alive]
+        if None in costs:
+            return 1
+        if sum(costs):
+            remaining = self._budget - self._spent()
+            batch = min(batch, int(remaining // sum(costs)))
+        return max(batch, 0)
+
+    def _eliminate(self):
+        """Drop the configurations dominated by the best one."""
+        ready = [candidate for candidate in self.alive()
+                 if candidate.count >= self._min_runs]
+        if len(ready) < 2:
+            return
+        best = min(ready, key=lambda candidate: candidate.mean)
+        for candidate in ready:
+            if candidate is not best and candidate.dominated_by(
+                    best, self._confidence):
+                LOG.debug("Round %(round)d drops %(label)s.",
+                          {"round": self._round, "label": candidate.label})
+                candidate.eliminate(self._round)
+
+    async def run_async(self, pool=None):
+        """Run the race and return the winner.
+
+        :param pool: the `concurrent.futures` executor shared by all the
+                     configurations; one for the backend of the first
+                     configuration is created when it is missing
+        """
+        own_pool = pool is None
+        if own_pool:
+            command = self._candidates[0].command
+            pool = base.create_pool(command.backend, command.workers)
+        self._started_at = metrics.clock()
+        try:
+            while not self._exhausted():
+                alive = self.alive()
+                if len(alive) == 1 and alive[0].runs >= self._min_runs:
+                    break
+                batch = self._batch_size(alive)
+                if not batch:
+                    break
+                self._round += 1
+                await asyncio.gather(*(candidate.run(batch, pool)
+                                       for candidate in alive))
+                self._eliminate()
+        finally:
+            if own_pool:
+                pool.shutdown(wait=False)
+        return self.winner()
+
+    def run(self, pool=None):
+        """The blocking variant of `run_async`."""
+        return asyncio.run(self.run_async(pool))
+
+    def report(self):
+        winner = self.winner()
+        table = PrettyTable(["Configuration", "Runs", "Evaluations",
+                             "Mean", "Std", "Best", "Status"])
+        for candidate in self._candidates:
+            if candidate is winner:
+                status = "winner"
+            elif candidate.alive:
+                status = "racing"
+            else:
+                status = "dropped in round %d" % candidate.eliminated
+            if candidate.count:
+                scores = [candidate.mean,
+                          math.sqrt(candidate.variance)
+                          if candidate.count > 1 else '-',
+                          candidate.best]
+            else:
+                scores = ['-', '-', '-']
+            evaluations = candidate.evaluations
+            table.add_row([candidate.label, candidate.runs,
+                           '-' if evaluations is None else evaluations] +
+                          scores + [status])
+        print(table)
+        spent = [candidate.evaluations for candidate in self._candidates]
+        print("Rounds: %(rounds)d, evaluations: %(evaluations)s, "
+              "time: %(time).2fs" % {
+                  "rounds": self._round,
+                  "evaluations": '-' if None in spent else sum(spent),
+                  "time": metrics.clock() - self._started_at})
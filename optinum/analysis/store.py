@@ -0,0 +1,257 @@
+"""Append-only columnar storage of the results of an analysis.
+
+Every column is a file of fixed-width little-endian values, so the rows
+are appended without rewriting anything and the columns are read back as
+memory maps: tens of millions of restarts can be queried without loading
+them. `columns.json` describes the layout of the directory.
+"""
+import json
+import os
+import tempfile
+import threading
+
+import numpy
+
+from optinum.algorithm import base
+from optinum.common import config
+
+VERSION = 1
+SCHEMA = "columns.json"
+# The name and the type of the scalar columns.
+COLUMNS = (
+    ("index", "<i8"),           # the number of the restart
+    ("task_id", "<i8"),         # -1 when the restart had no task
+    ("seed", "<u8"),
+    ("score", "<f8"),           # NaN for the failed restarts
+    ("evaluations", "<i8"),     # -1 for the failed restarts
+    ("wall_time", "<f8"),       # seconds, NaN when it is unknown
+)
+GENOME = "genome"               # the packed bits of the best chromosome
+
+
+class ResultStore(object):
+
+    """The results of the restarts, one row for every restart."""
+
+    def __init__(self, path=None, genome_bytes=0, truncate=True):
+        """Open a store.
+
+        :param path:         the directory of the store; a temporary one,
+                             removed with the store, is used if it is
+                             missing
+        :param genome_bytes: the size of the packed genomes
+        :param truncate:     remove the rows of an existing store
+        """
+        self._temporary = None
+        if path is None:
+            self._temporary = tempfile.TemporaryDirectory(prefix="optinum-")
+            path = self._temporary.name
+        self._path = path
+        self._genome_bytes = genome_bytes
+        self._types = dict(COLUMNS)
+        self._types[GENOME] = numpy.dtype((numpy.uint8, genome_bytes))
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._files = {}
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        if not truncate:
+            self._verify()
+            self._repair()
+        self._open("wb" if truncate else "ab")
+
+    @classmethod
+    def load(cls, path):
+        """Open an existing store, in order to query it or to add rows."""
+        with open(os.path.join(path, SCHEMA)) as file_handler:
+            layout = json.load(file_handler)
+        return cls(path, layout["genome_bytes"], truncate=False)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def genome_bytes(self):
+        return self._genome_bytes
+
+    def _file(self, name):
+        return os.path.join(self._path, name + ".bin")
+
+    def _verify(self):
+        """Check that an existing store has the same layout."""
+        schema = os.path.join(self._path, SCHEMA)
+        if not os.path.exists(schema):
+            return
+        with open(schema) as file_handler:
+            layout = json.load(file_handler)
+        if (layout.get("version") != VERSION or
+                layout.get("genome_bytes") != self._genome_bytes):
+            raise ValueError("The store %(path)s has another layout." %
+                             {"path": self._path})
+
+    def _repair(self):
+        """Drop the incomplete rows left by an interrupted write."""
+        count = len(self)
+        for name, dtype in self._types.items():
+            path = self._file(name)
+            if os.path.exists(path):
+                os.truncate(path, count * numpy.dtype(dtype).itemsize)
+
+    def _open(self, mode):
+        with open(os.path.join(self._path, SCHEMA), "w") as file_handler:
+            json.dump({"version": VERSION, "genome_bytes": self._genome_bytes,
+                       "columns": [list(column) for column in COLUMNS]},
+                      file_handler)
+        for name in self._types:
+            self._files[name] = open(self._file(name), mode)
+
+    def append(self, index, result, task_id=-1, seed=0,
+               wall_time=float("nan")):
+        """Add the row of a restart, `result` being None if it failed.
+
+        The rows are written in batches of `config.STORE.FLUSH_ROWS`.
+        """
+        if result is not None and len(result.genome) != self._genome_bytes:
+            raise ValueError("Expected a genome of %(expected)d bytes, "
+                             "received %(received)d." %
+                             {"expected": self._genome_bytes,
+                              "received": len(result.genome)})
+        with self._lock:
+            self._buffer.append((index, task_id, seed, result, wall_time))
+            if len(self._buffer) >= config.STORE.FLUSH_ROWS:
+                self._flush()
+
+    def flush(self):
+        """Write the buffered rows."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer or not self._files:
+            return
+        rows, self._buffer = self._buffer, []
+        failed = numpy.array([row[3] is None for row in rows])
+        values = {
+            "index": [row[0] for row in rows],
+            "task_id": [row[1] for row in rows],
+            "seed": [row[2] for row in rows],
+            "score": [numpy.nan if row[3] is None else row[3].score
+                      for row in rows],
+            "evaluations": [-1 if row[3] is None else row[3].evaluations
+                            for row in rows],
+            "wall_time": [row[4] for row in rows],
+        }
+        genomes = numpy.zeros((len(rows), self._genome_bytes),
+                              dtype=numpy.uint8)
+        for position in numpy.flatnonzero(~failed):
+            genomes[position] = numpy.frombuffer(rows[position][3].genome,
+                                                 dtype=numpy.uint8)
+        for name, dtype in COLUMNS:
+            numpy.asarray(values[name], dtype=dtype).tofile(
+                self._files[name])
+        genomes.tofile(self._files[GENOME])
+        for file_handler in self._files.values():
+            file_handler.flush()
+
+    def close(self):
+        """Write the buffered rows and close the files."""
+        with self._lock:
+            self._flush()
+            for file_handler in self._files.values():
+                file_handler.close()
+            self._files = {}
+
+    def __len__(self):
+        """The number of complete rows on disk."""
+        counts = []
+        for name, dtype in self._types.items():
+            size = numpy.dtype(dtype).itemsize
+            path = self._file(name)
+            if size:
+                length = os.path.getsize(path) if os.path.exists(path) else 0
+                counts.append(length // size)
+        return min(counts) if counts else 0
+
+    def column(self, name):
+        """Return a read-only memory map over a column."""
+        dtype = numpy.dtype(self._types[name])
+        count = len(self)
+        if not count or not dtype.itemsize:
+            return numpy.zeros((count, ) + dtype.shape, dtype=dtype.base)
+        return numpy.memmap(self._file(name), dtype=dtype, mode="r",
+                            shape=(count, ))
+
+    def _chunks(self):
+        count = len(self)
+        step = config.STORE.CHUNK_ROWS
+        for start in range(0, count, step):
+            yield start, min(start + step, count)
+
+    def select(self, columns=None, **ranges):
+        """Return the columns of the rows within the received ranges.
+
+            store.select(["index", "score"], score=(None, 1e-3))
+
+        :param columns: the names of the columns, all of them if missing
+        :param ranges:  the inclusive (low, high) limits of some columns,
+                        None for an open end
+        :returns: a dictionary of arrays, one for every column
+        """
+        columns = list(columns or self._types)
+        maps = {name: self.column(name)
+                for name in set(columns) | set(ranges)}
+        selected = {name: [] for name in columns}
+        for start, stop in self._chunks():
+            mask = numpy.ones(stop - start, dtype=bool)
+            for name, (low, high) in ranges.items():
+                values = maps[name][start:stop]
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+            for name in columns:
+                selected[name].append(
+                    numpy.array(maps[name][start:stop][mask]))
+        return {name: numpy.concatenate(parts) if parts else
+                numpy.array(self.column(name)[:0])
+                for name, parts in selected.items()}
+
+    def best(self, count):
+        """Return the row numbers of the `count` lowest scores, sorted."""
+        scores = self.column("score")
+        rows = numpy.zeros(0, dtype=numpy.int64)
+        for start, stop in self._chunks():
+            chunk = numpy.flatnonzero(~numpy.isnan(scores[start:stop]))
+            rows = numpy.concatenate([rows, chunk + start])
+            if len(rows) > count:
+                kept = numpy.argpartition(scores[rows], count - 1)[:count]
+                rows = rows[kept]
+        return rows[numpy.argsort(scores[rows], kind="stable")]
+
+    def result(self, row):
+        """Return the `Result` stored in a row, None for a failure."""
+        return self._result(self.column("score"),
+                            self.column("evaluations"),
+                            self.column(GENOME), row)
+
+    @staticmethod
+    def _result(scores, evaluations, genomes, row):
+        if numpy.isnan(scores[row]):
+            return None
+        return base.Result(scores[row], int(evaluations[row]),
+                           genomes[row].tobytes())
+
+    def results(self, rows=None):
+        """Yield the (index, result) pairs of the received rows, all of
+        them in the order of the restarts by default."""
+        indexes = self.column("index")
+        scores = self.column("score")
+        evaluations = self.column("evaluations")
+        genomes = self.column(GENOME)
+        if rows is None:
+            rows = numpy.argsort(indexes, kind="stable")
+        for row in rows:
+            yield int(indexes[row]), self._result(scores, evaluations,
+                                                  genomes, row)
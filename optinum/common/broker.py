@@ -0,0 +1,202 @@
+"""Brokers which carry the tasks from the producers to the workers.
+
+A broker holds two queues: the tasks waiting for a worker and the results
+waiting for the producer. `MemoryBroker` keeps them in the current process
+and carries any object; `ManagerBroker` serves them through
+`multiprocessing.managers`, so the workers can run on other hosts, but
+everything sent through it must be picklable.
+"""
+# pylint: disable=abstract-method
+import abc
+import multiprocessing
+from multiprocessing import managers
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import six
+
+from optinum.common import config
+from optinum.common import metrics
+from optinum.common import utils
+
+LOG = utils.get_logger(__name__)
+
+
+def parse_address(address):
+    """Return the (host, port) pair of a "host:port" address."""
+    host, _, port = address.rpartition(":")
+    try:
+        return host, int(port)
+    except ValueError:
+        raise ValueError("Invalid broker address %(address)r, expected "
+                         "host:port." % {"address": address})
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Broker(object):
+
+    """The queues shared by the producers and the workers.
+
+    The methods behave like the ones of `queue.Queue`: they raise
+    `queue.Empty` and `queue.Full` when they can not wait.
+    """
+
+    def start(self):
+        """Make the queues available to the clients."""
+        pass
+
+    def connect(self):
+        """Connect to the queues of a broker started elsewhere."""
+        pass
+
+    def close(self):
+        """Release the queues."""
+        pass
+
+    @abc.abstractmethod
+    def put_task(self, item, block=True, timeout=None):
+        pass
+
+    @abc.abstractmethod
+    def get_task(self, block=True, timeout=None):
+        pass
+
+    @abc.abstractmethod
+    def put_result(self, item, block=True, timeout=None):
+        pass
+
+    @abc.abstractmethod
+    def get_result(self, block=True, timeout=None):
+        pass
+
+
+class MemoryBroker(Broker):
+
+    """Broker for the threads of the current process."""
+
+    def __init__(self, qsize=config.WORKER.QSIZE):
+        """Setup a new broker.
+
+        :param qsize: maximum number of queued tasks (0 - unlimited)
+        """
+        self._tasks = queue.Queue(qsize)
+        self._results = queue.Queue()
+
+    def put_task(self, item, block=True, timeout=None):
+        self._tasks.put(item, block, timeout)
+
+    def get_task(self, block=True, timeout=None):
+        return self._tasks.get(block, timeout)
+
+    def put_result(self, item, block=True, timeout=None):
+        self._results.put(item, block, timeout)
+
+    def get_result(self, block=True, timeout=None):
+        return self._results.get(block, timeout)
+
+
+# The queues served by the process started by `ManagerBroker.start`.
+_QUEUES = {}
+
+
+def _setup_queues(qsize):
+    _QUEUES["tasks"] = queue.Queue(qsize)
+    _QUEUES["results"] = queue.Queue()
+
+
+def _tasks():
+    return _QUEUES["tasks"]
+
+
+def _results():
+    return _QUEUES["results"]
+
+
+class _QueueManager(managers.BaseManager):
+    pass
+
+
+_QueueManager.register("tasks", callable=_tasks)
+_QueueManager.register("results", callable=_results)
+
+
+class ManagerBroker(Broker):
+
+    """Broker served by a `multiprocessing.managers` process.
+
+    The analysis calls `start` in order to serve the queues on `address`
+    and the workers, on the same host or on others, call `connect`.
+    """
+
+    def __init__(self, address=config.BROKER.ADDRESS,
+                 authkey=config.BROKER.AUTHKEY, qsize=0):
+        """Setup a new broker.
+
+        :param address: the "host:port" on which the queues are served
+        :param authkey: the secret shared by the analysis and the workers
+        :param qsize:   maximum number of queued tasks (0 - unlimited)
+        """
+        if not authkey:
+            raise ValueError("The broker needs an authkey shared with the "
+                             "workers.")
+        if isinstance(authkey, six.text_type):
+            authkey = authkey.encode("utf-8")
+        self._address = parse_address(address)
+        self._qsize = qsize
+        self._manager = _QueueManager(
+            self._address, authkey,
+            ctx=multiprocessing.get_context(config.WORKER.START_METHOD))
+        self._served = False
+        self._tasks = None
+        self._results = None
+
+    @property
+    def address(self):
+        """The (host, port) on which the queues are served."""
+        return self._manager.address
+
+    def start(self):
+        """Serve the queues from a new process."""
+        self._manager.start(_setup_queues, (self._qsize, ))
+        self._served = True
+        self._tasks = self._manager.tasks()
+        self._results = self._manager.results()
+        LOG.info("Serving the tasks on %(host)s:%(port)s",
+                 {"host": self.address[0], "port": self.address[1]})
+
+    def connect(self, timeout=config.BROKER.CONNECT_TIMEOUT):
+        """Connect to a served broker, waiting at most `timeout` seconds
+        for it to be started."""
+        deadline = metrics.clock() + timeout
+        while True:
+            try:
+                self._manager.connect()
+                break
+            except (EOFError, OSError):
+                if metrics.clock() >= deadline:
+                    raise
+                time.sleep(config.WORKER.FINEDELAY)
+        self._tasks = self._manager.tasks()
+        self._results = self._manager.results()
+
+    def close(self):
+        """Stop serving the queues, if they were served by this broker."""
+        self._tasks = self._results = None
+        if self._served:
+            self._served = False
+            self._manager.shutdown()
+
+    def put_task(self, item, block=True, timeout=None):
+        self._tasks.put(item, block, timeout)
+
+    def get_task(self, block=True, timeout=None):
+        return self._tasks.get(block, timeout)
+
+    def put_result(self, item, block=True, timeout=None):
+        self._results.put(item, block, timeout)
+
+    def get_result(self, block=True, timeout=None):
+        return self._results.get(block, timeout)
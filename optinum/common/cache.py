@@ -0,0 +1,95 @@
+"""Memoization of objective function scores."""
+import collections
+import threading
+
+from optinum.common import config
+
+
+class EvaluationCache(object):
+
+    """Size-bounded LRU mapping from packed genetic data to scores.
+
+    The keys do not contain any information about the objective function,
+    so an instance should be shared only between tasks which optimize the
+    same function with the same search space.
+    """
+
+    def __init__(self, max_size=config.CACHE.MAX_SIZE):
+        """Setup a new instance.
+
+        :param max_size: the number of scores kept before the least
+                         recently used one is evicted (0 - unlimited)
+        :type max_size: int
+        """
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    @property
+    def hit_rate(self):
+        lookups = self._hits + self._misses
+        return float(self._hits) / lookups if lookups else 0.0
+
+    def get(self, key, default=None):
+        """Return the score stored for `key` and mark it as recently used."""
+        with self._lock:
+            try:
+                score = self._entries.pop(key)
+            except KeyError:
+                self._misses += 1
+                return default
+            self._entries[key] = score
+            self._hits += 1
+            return score
+
+    def put(self, key, score):
+        """Store the score and evict the oldest ones if it is required."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = score
+            while self._max_size and len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Drop all the scores and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self):
+        """Return the counters of the cache."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hit_rate": self.hit_rate,
+        }
@@ -0,0 +1,153 @@
+"""The numba versions of the hot loops, see `kernels`.
+
+Importing this module requires numba, use `kernels.load` instead.
+"""
+import math
+
+import numba
+import numpy
+
+
+@numba.njit(cache=True, nogil=True)
+def decode(bits, size, gray, scale, min_xi, max_decimal):
+    """Decode an (N x loci) matrix of genetic data to (N x genes); the
+    integers above `max_decimal` decode to it."""
+    rows, loci = bits.shape
+    genes = loci // size
+    weights = numpy.empty(size, dtype=numpy.int64)
+    for offset in range(size):
+        weights[offset] = numpy.int64(1) << (size - 1 - offset)
+
+    result = numpy.empty((rows, genes))
+    for row in range(rows):
+        for gene in range(genes):
+            start = gene * size
+            decimal = numpy.int64(0)
+            if gray:
+                # every binary bit is the parity of the gray prefix
+                bit = numpy.int64(0)
+                for offset in range(size):
+                    bit ^= bits[row, start + offset]
+                    decimal += bit * weights[offset]
+            else:
+                # independent terms, so the loop can be vectorized
+                for offset in range(size):
+                    decimal += bits[row, start + offset] * weights[offset]
+            result[row, gene] = min(decimal, max_decimal) / scale + min_xi
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def _rosenbrock_term(current, following):
+    return 100 * (following - current ** 2) ** 2 + (1 - current) ** 2
+
+
+@numba.njit(cache=True, nogil=True)
+def rosenbrock(matrix):
+    rows, columns = matrix.shape
+    result = numpy.zeros(rows)
+    for row in range(rows):
+        for index in range(columns - 1):
+            result[row] += _rosenbrock_term(matrix[row, index],
+                                            matrix[row, index + 1])
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def rosenbrock_neighbors(variables, indexes, values):
+    count = variables.shape[0]
+    score = 0.0
+    for index in range(count - 1):
+        score += _rosenbrock_term(variables[index], variables[index + 1])
+
+    result = numpy.empty(indexes.shape[0])
+    for neighbor in range(indexes.shape[0]):
+        index, value = indexes[neighbor], values[neighbor]
+        result[neighbor] = score
+        if index > 0:
+            result[neighbor] += (
+                _rosenbrock_term(variables[index - 1], value) -
+                _rosenbrock_term(variables[index - 1], variables[index]))
+        if index < count - 1:
+            result[neighbor] += (
+                _rosenbrock_term(value, variables[index + 1]) -
+                _rosenbrock_term(variables[index], variables[index + 1]))
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def _rastrigin_term(value):
+    return value ** 2 - 10 * math.cos(2 * math.pi * value)
+
+
+@numba.njit(cache=True, nogil=True)
+def rastrigin(matrix):
+    rows, columns = matrix.shape
+    result = numpy.full(rows, 10.0 * columns)
+    for row in range(rows):
+        for index in range(columns):
+            result[row] += _rastrigin_term(matrix[row, index])
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def rastrigin_neighbors(variables, indexes, values):
+    score = 10.0 * variables.shape[0]
+    for index in range(variables.shape[0]):
+        score += _rastrigin_term(variables[index])
+
+    result = numpy.empty(indexes.shape[0])
+    for neighbor in range(indexes.shape[0]):
+        index = indexes[neighbor]
+        result[neighbor] = (score - _rastrigin_term(variables[index]) +
+                            _rastrigin_term(values[neighbor]))
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def griewangk(matrix):
+    rows, columns = matrix.shape
+    result = numpy.empty(rows)
+    for row in range(rows):
+        sum_, prod = 0.0, 1.0
+        for index in range(columns):
+            sum_ += matrix[row, index] ** 2 / 4000
+            prod *= math.cos(matrix[row, index] / math.sqrt(index + 1))
+        result[row] = sum_ - prod + 1
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def griewangk_neighbors(variables, indexes, values):
+    # The products of the factors before and after every variable, so the
+    # changed factor is replaced without a division.
+    count = variables.shape[0]
+    before, after = numpy.ones(count + 1), numpy.ones(count + 1)
+    sum_ = 0.0
+    for index in range(count):
+        sum_ += variables[index] ** 2 / 4000
+        before[index + 1] = before[index] * math.cos(
+            variables[index] / math.sqrt(index + 1))
+    for index in range(count - 1, -1, -1):
+        after[index] = after[index + 1] * math.cos(
+            variables[index] / math.sqrt(index + 1))
+
+    result = numpy.empty(indexes.shape[0])
+    for neighbor in range(indexes.shape[0]):
+        index, value = indexes[neighbor], values[neighbor]
+        prod = (before[index] * after[index + 1] *
+                math.cos(value / math.sqrt(index + 1)))
+        result[neighbor] = (sum_ + (value ** 2 - variables[index] ** 2) /
+                            4000 - prod + 1)
+    return result
+
+
+@numba.njit(cache=True, nogil=True)
+def six_hump_camel_back(matrix):
+    result = numpy.empty(matrix.shape[0])
+    for row in range(matrix.shape[0]):
+        first, second = matrix[row, 0], matrix[row, 1]
+        result[row] = ((4 - 2.1 * first ** 2 + first ** 4 / 3) *
+                       (first ** 2 + first * second) +
+                       (-4 + 4 * second ** 2) * second ** 2)
+    return result
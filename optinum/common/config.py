@@ -29,15 +29,120 @@ class WORKER:
     FINEDELAY = DELAY * 0.1
     # concurrent matter
     WORKERS = 5     # default number of workers
-    QSIZE = 0       # default task processor queue size (0 - unlimited)
+    QSIZE = 64      # default task processor queue size (0 - unlimited)
+    # work units
+    CHUNK_SIZE = 0      # restarts grouped in a work unit (0 - auto)
+    UNIT_TIME = 0.05    # seconds of work targeted by the automatic chunks
+    MAX_CHUNK = 1024    # the largest automatic chunk
+    # autoscaling
+    AUTOSCALE = False       # adapt the number of workers to the load
+    MIN_WORKERS = 1
+    MAX_WORKERS = 0         # 0 - the number of available cores
+    SCALE_INTERVAL = 0.5    # seconds between two scaling decisions
+    SCALE_HORIZON = 1.0     # seconds in which the backlog should be done
+    IDLE_TIMEOUT = 5.0      # seconds before the surplus workers retire
+    BACKENDS = ('thread', 'process', 'remote')
+    BACKEND = 'thread'  # where the tasks run, one of the BACKENDS
+    # how the child processes are created; forking the threaded parent
+    # can copy locks held by other threads, so avoid `fork` by default
+    START_METHOD = 'spawn'
     # other
     LOOP = True     # process the same tasks indefinitely
 
 
-class REPORT:
+class BROKER:
 
-    """Report specific settings."""
-    RETRY_INTERVAL = 1  # default time between interations
+    """Settings of the broker used by the `remote` backend."""
+
+    ADDRESS = '127.0.0.1:5800'  # where the analysis serves the tasks
+    AUTHKEY = None              # secret shared with the workers, a
+                                # random one is used when it is missing
+    TIMEOUT = 1.0               # seconds between checks of the stop event
+    CONNECT_TIMEOUT = 30        # seconds a worker waits for the analysis
+    HEARTBEAT = 5.0             # seconds between two signs of life
+    LEASE = 30.0                # seconds of silence before a task is sent
+                                # again
+
+
+class ENGINE:
+
+    """Settings for the way in which the restarts are executed."""
+
+    TASK = 'task'           # one task for every restart
+    LOCKSTEP = 'lockstep'   # all the restarts advance together
+    DEFAULT = TASK
+    # maximum number of bytes used by the neighbors of a lockstep step
+    BUFFER_SIZE = 2 ** 26
+
+
+class KERNEL:
+
+    """Where the objective functions and the decoder are computed."""
+
+    NUMPY = 'numpy'     # the reference implementation
+    NUMBA = 'numba'     # compiled kernels, when numba is installed
+    AUTO = 'auto'       # numba if it is installed, numpy otherwise
+    DEFAULT = NUMPY
+
+
+class GENETIC:
+
+    """Default parameters of the genetic algorithm."""
+
+    POPULATION = 1024   # chromosomes in every generation
+    GENERATIONS = 100
+    CROSSOVER = 0.9     # probability of a pair of parents to recombine
+    MUTATION = None     # probability of a locus to flip (None - 1 / loci)
+    TOURNAMENT = 2      # chromosomes competing for every selection
+    ELITISM = 2         # best chromosomes kept by every generation
+
+
+class RACE:
+
+    """Settings of the races between configurations."""
+
+    BATCH = 4           # restarts for every configuration in a round
+    MIN_RUNS = 5        # restarts before a configuration can be dropped
+    CONFIDENCE = 0.95   # required in order to drop a configuration
+
+
+class METRICS:
+
+    """Instrumentation specific settings."""
+
+    ENABLED = True      # collect counters and timers for every task
+
+
+class STATS:
+
+    """Settings of the summaries of the results."""
+
+    ACCURACY = 0.01     # relative error of the quantiles
+    MAX_BINS = 2048     # buckets kept by a quantile sketch
+    QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)   # shown by the reports
+    REPORT_ROWS = 100   # restarts listed one by one in a report
+
+
+class STORE:
+
+    """Settings of the result stores."""
+
+    FLUSH_ROWS = 4096       # rows buffered before they are written
+    CHUNK_ROWS = 2 ** 20    # rows scanned at once by the queries
+
+
+class CHECKPOINT:
+
+    """Checkpoint specific settings."""
+
+    INTERVAL = 60       # seconds between two saves of the progress
+
+
+class CACHE:
+
+    """Evaluation cache specific settings."""
+
+    MAX_SIZE = 4096     # default number of scores kept (0 - unlimited)
 
 
 class STATUS:
@@ -46,3 +151,12 @@ class STATUS:
     RUNNING = 'running'
     DONE = 'done'
     ERROR = 'error'
+
+
+class ENCODING:
+
+    """The ways in which a variable can be stored in a gene."""
+
+    BINARY = 'binary'
+    GRAY = 'gray'
+    DEFAULT = BINARY
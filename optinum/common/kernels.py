@@ -0,0 +1,47 @@
+"""Compiled versions of the hot loops.
+
+The kernels from `compiled` are built with numba when it is installed;
+the NumPy implementations from `objects` and `objective` remain the
+reference and are used when numba is missing. numba is imported only
+when the compiled kernels are requested, and the kernels release the
+GIL, so the threads of an executor can run them in parallel.
+"""
+import importlib.util
+
+from optinum.common import config
+from optinum.common import utils
+
+LOG = utils.get_logger(__name__)
+
+
+def available():
+    """Whether the compiled kernels can be used."""
+    try:
+        return importlib.util.find_spec("numba") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def resolve(backend):
+    """Return the backend which is actually used when `backend` is asked.
+
+    :param backend: one of the values from `config.KERNEL`
+    """
+    if backend == config.KERNEL.AUTO:
+        return config.KERNEL.NUMBA if available() else config.KERNEL.NUMPY
+    if backend == config.KERNEL.NUMBA and not available():
+        LOG.warning("numba is not installed, falling back to numpy.")
+        return config.KERNEL.NUMPY
+    if backend not in (config.KERNEL.NUMPY, config.KERNEL.NUMBA):
+        raise ValueError("Unknown kernel backend %(backend)r" %
+                         {"backend": backend})
+    return backend
+
+
+def load(backend):
+    """Return the module with the kernels of a resolved backend, None
+    for the NumPy reference."""
+    if backend != config.KERNEL.NUMBA:
+        return None
+    from optinum.common import compiled
+    return compiled
@@ -0,0 +1,106 @@
+"""Counters and timers for the hot paths of the algorithms."""
+import collections
+import time
+
+from optinum.common import config
+
+clock = time.perf_counter
+
+# The names of the values collected by the algorithms and the executors.
+OBJECTIVE_CALLS = 'objective_calls'
+MOVES = 'moves_accepted'
+TASKS = 'tasks'
+DECODE_TIME = 'decode_time'
+NEIGHBOR_TIME = 'neighbor_time'
+QUEUE_WAIT = 'queue_wait'
+RUN_TIME = 'run_time'
+# The lookups of the evaluation caches of the tasks.
+CACHE_HITS = 'cache_hits'
+CACHE_MISSES = 'cache_misses'
+CACHE_EVICTIONS = 'cache_evictions'
+# The scaling decisions of the concurrent workers.
+WORKERS_STARTED = 'workers_started'
+WORKERS_RETIRED = 'workers_retired'
+PEAK_WORKERS = 'peak_workers'
+
+
+class Metrics(object):
+
+    """Counters and accumulated durations of a unit of work.
+
+    The instrumented code asks for `start()` and reports the elapsed time
+    with `stop(name, started)`, so the disabled version (`NullMetrics`)
+    does not even read the clock.
+    """
+
+    enabled = True
+
+    def __init__(self, counters=None, timers=None):
+        self.counters = collections.Counter()
+        self.timers = collections.Counter()
+        if counters:
+            self.counters.update(counters)
+        if timers:
+            self.timers.update(timers)
+
+    def count(self, name, value=1):
+        """Increment the counter `name`."""
+        self.counters[name] += value
+
+    def start(self):
+        """Return the moment used by the next `stop` call."""
+        return clock()
+
+    def stop(self, name, started):
+        """Add the time elapsed since `started` to the timer `name`."""
+        self.timers[name] += clock() - started
+
+    def add_time(self, name, seconds):
+        """Add `seconds` to the timer `name`."""
+        self.timers[name] += seconds
+
+    def merge(self, other):
+        """Add the counters and the timers of `other` to this instance."""
+        if other.enabled:
+            self.counters.update(other.counters)
+            self.timers.update(other.timers)
+
+    def as_dict(self):
+        """Return a picklable copy of the collected values."""
+        return {"counters": dict(self.counters), "timers": dict(self.timers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["counters"], data["timers"])
+
+
+class NullMetrics(Metrics):
+
+    """Metrics which ignore everything they receive."""
+
+    enabled = False
+
+    def count(self, name, value=1):
+        pass
+
+    def start(self):
+        return 0
+
+    def stop(self, name, started):
+        pass
+
+    def add_time(self, name, seconds):
+        pass
+
+    def merge(self, other):
+        pass
+
+
+def new_metrics(enabled=None):
+    """Return a new collector, a no-op one if the metrics are disabled.
+
+    :param enabled: overwrite `config.METRICS.ENABLED`
+    """
+    if enabled is None:
+        enabled = config.METRICS.ENABLED
+    return Metrics() if enabled else NullMetrics()
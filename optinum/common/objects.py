@@ -1,13 +1,245 @@
 """
 Objects which have the ability to storage information.
 """
-import random
-
 import numpy
 
+from optinum.common import config
+from optinum.common import kernels
+
+ALLELE_TYPE = numpy.uint8
+# Gathers eight loci stored as little-endian bytes into the top byte.
+_GATHER = numpy.uint64(0x8040201008040201)
+_GATHER_SHIFT = numpy.uint64(56)
+
+
+class Decoder(object):
+
+    """Precomputed tables which turn genetic data into variables.
+
+    The genes are spread over whole bytes, every group of eight loci is
+    gathered into one byte with a single multiplication and the bytes are
+    shifted together, so a whole batch of chromosomes is decoded with a
+    couple of array operations. Use `Decoder.get` in order to share the
+    tables between the instances with the same parameters.
+
+    The `numba` backend decodes with a compiled kernel instead.
+
+    A gene of `size` bits can store integers above the last point of the
+    grid, `max_decimal`; they decode to the last point, so every variable
+    stays within the interval of its search space.
+    """
+
+    _decoders = {}
+
+    def __init__(self, size, precision, min_xi,
+                 encoding=config.ENCODING.BINARY,
+                 backend=config.KERNEL.NUMPY, max_decimal=None):
+        if size > 62:
+            raise ValueError("Genes longer than 62 bits are not supported.")
+        if encoding not in (config.ENCODING.BINARY, config.ENCODING.GRAY):
+            raise ValueError("Unknown encoding %(encoding)r" %
+                             {"encoding": encoding})
+
+        self._size = size
+        self._precision = precision
+        self._min_xi = min_xi
+        self._encoding = encoding
+        if max_decimal is None:
+            max_decimal = (1 << size) - 1
+        self._max_decimal = max_decimal
+        self._backend = kernels.resolve(backend)
+        self._kernels = kernels.load(self._backend)
+
+        self._scale = numpy.float64(pow(10, precision))
+        self._bytes = (size + 7) // 8
+        self._padding = -size % 8
+        self._bit_weights = numpy.left_shift(
+            1, numpy.arange(size - 1, -1, -1, dtype=numpy.int64))
+        # The change of the stored integer when a locus of a gene flips.
+        if encoding == config.ENCODING.GRAY:
+            self._flip_masks = numpy.left_shift(
+                1, numpy.arange(size, 0, -1, dtype=numpy.int64)) - 1
+        else:
+            self._flip_masks = self._bit_weights
+
+    @classmethod
+    def get(cls, size, precision, min_xi, encoding=config.ENCODING.BINARY,
+            backend=config.KERNEL.NUMPY, max_decimal=None):
+        """Return the shared decoder for the received parameters."""
+        key = (size, precision, min_xi, encoding, backend, max_decimal)
+        decoder = cls._decoders.get(key)
+        if decoder is None:
+            decoder = cls._decoders.setdefault(
+                key, cls(size, precision, min_xi, encoding, backend,
+                         max_decimal))
+        return decoder
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def encoding(self):
+        return self._encoding
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def max_decimal(self):
+        """The largest integer decoded as it is."""
+        return self._max_decimal
+
+    def _variables(self, decimals):
+        return (numpy.minimum(decimals, self._max_decimal) / self._scale +
+                self._min_xi)
+
+    def decimals(self, bits):
+        """Return the integer stored by every gene from `bits`.
+
+        The last axis of `bits` holds the concatenated genes and it is
+        replaced by one value per gene.
+        """
+        bits = numpy.asarray(bits, dtype=ALLELE_TYPE)
+        genes = bits.reshape(bits.shape[:-1] + (-1, self._size))
+        if self._encoding == config.ENCODING.GRAY:
+            genes = numpy.bitwise_xor.accumulate(genes, axis=-1)
+        padded = numpy.zeros(genes.shape[:-1] + (self._bytes * 8,),
+                             dtype=ALLELE_TYPE)
+        padded[..., self._padding:] = genes
+        chunks = (padded.view('<u8') * _GATHER) >> _GATHER_SHIFT
+        decimals = chunks[..., 0]
+        for index in range(1, self._bytes):
+            decimals = (decimals << numpy.uint64(8)) | chunks[..., index]
+        return decimals.astype(numpy.int64)
+
+    def decode(self, bits):
+        """Return the variable stored by every gene from `bits`."""
+        if self._kernels is not None:
+            bits = numpy.asarray(bits, dtype=ALLELE_TYPE)
+            variables = self._kernels.decode(
+                numpy.ascontiguousarray(bits.reshape(-1, bits.shape[-1])),
+                self._size, self._encoding == config.ENCODING.GRAY,
+                self._scale, numpy.float64(self._min_xi),
+                numpy.int64(self._max_decimal))
+            return variables.reshape(bits.shape[:-1] + (-1,))
+        return self._variables(self.decimals(bits))
+
+    def flips(self, bits):
+        """Return the index of the gene and the new variable for every
+        single-locus flip of the 1-D genetic data `bits`."""
+        loci = numpy.arange(len(bits))
+        indexes, offsets = numpy.divmod(loci, self._size)
+        decimals = self.decimals(bits)[indexes] ^ self._flip_masks[offsets]
+        return indexes, self._variables(decimals)
+
+    def value(self, allele):
+        """Return the variable stored by a single gene."""
+        if self._encoding == config.ENCODING.GRAY:
+            allele = numpy.bitwise_xor.accumulate(allele)
+        decimal = min(int(numpy.dot(allele, self._bit_weights)),
+                      self._max_decimal)
+        return numpy.float64(decimal) / self._scale + self._min_xi
+
+    def encode(self, decimals):
+        """Return the genetic data which stores the received integers."""
+        decimals = numpy.asarray(decimals, dtype=numpy.int64)
+        if self._encoding == config.ENCODING.GRAY:
+            decimals = decimals ^ (decimals >> 1)
+        bits = (decimals[..., numpy.newaxis] >>
+                numpy.arange(self._size - 1, -1, -1)) & 1
+        return bits.reshape(decimals.shape[:-1] + (-1,)).astype(ALLELE_TYPE)
+
+
+class SearchSpace(object):
+
+    """The discrete interval explored by every variable of a problem."""
+
+    __slots__ = ('_min_xi', '_max_xi', '_precision', '_size', '_steps',
+                 '_scale', '_decoder')
+
+    def __init__(self, min_xi, max_xi, precision,
+                 encoding=config.ENCODING.BINARY,
+                 backend=config.KERNEL.NUMPY):
+        self._min_xi = min_xi
+        self._max_xi = max_xi
+        self._precision = precision
+
+        steps = int(round((max_xi - min_xi) * pow(10, precision)))
+        self._steps = steps
+        self._scale = numpy.float64(pow(10, precision))
+        self._size = max(1, steps.bit_length())
+        self._decoder = Decoder.get(self._size, precision, min_xi, encoding,
+                                    backend, steps)
+
+    @property
+    def min_xi(self):
+        return self._min_xi
+
+    @property
+    def max_xi(self):
+        return self._max_xi
+
+    @property
+    def precision(self):
+        return self._precision
+
+    @property
+    def size(self):
+        """The number of bits required by a gene."""
+        return self._size
+
+    @property
+    def steps(self):
+        """The index of the last point of the grid, `max_xi`."""
+        return self._steps
+
+    @property
+    def encoding(self):
+        return self._decoder.encoding
+
+    @property
+    def decoder(self):
+        return self._decoder
+
+    def decode(self, bits):
+        """Decode an array of loci into the variables it represents.
+
+        The last axis of `bits` holds the concatenated genes and it is
+        replaced by one float64 value per gene.
+        """
+        return self._decoder.decode(bits)
+
+    def grid_values(self, indexes):
+        """Return the variables found at the received grid indexes.
+
+        A gene which stores the integer `index` decodes to the same value.
+        """
+        indexes = numpy.asarray(indexes, dtype=numpy.int64)
+        return indexes / self._scale + self._min_xi
+
+    def random_indexes(self, shape, rng=None):
+        """Return grid indexes drawn uniformly from [0, `steps`].
+
+        :param rng: the `numpy.random.Generator` used
+        """
+        rng = rng or numpy.random.default_rng()
+        return rng.integers(0, self._steps + 1, size=shape,
+                            dtype=numpy.int64)
+
+    def __repr__(self):
+        return "[%(min)s, %(max)s] x 10^-%(precision)s (%(encoding)s)" % {
+            "min": self._min_xi, "max": self._max_xi,
+            "precision": self._precision, "encoding": self.encoding}
+
 
 class Gene(object):
 
+    """A zero-copy view over a slice of the chromosome's genetic data."""
+
+    __slots__ = ('_locus', '_allele', '_size')
+
     def __init__(self, locus, allele):
         self._locus = locus
         self._allele = allele
@@ -25,18 +257,23 @@ class Gene(object):
     def size(self):
         return self._size
 
-    def value(self, min_xi, precision):
-        decimal = int(''.join(str(allel) for allel in self.allele), 2)
-        return (numpy.float64(decimal) / pow(10, precision) + min_xi)
+    def value(self, min_xi, precision, encoding=config.ENCODING.BINARY):
+        decoder = Decoder.get(self._size, precision, min_xi, encoding)
+        return decoder.value(self._allele)
 
 
 class Chromosome(object):
 
+    """Genetic data stored as one byte per locus in a NumPy buffer."""
+
+    __slots__ = ('_gene_number', '_gene_size', '_space', '_info')
+
     def __init__(self, gene_number, search_space):
         self._gene_number = gene_number
         self._gene_size = search_space.size
         self._space = search_space
-        self._info = []
+        self._info = numpy.zeros(gene_number * self._gene_size,
+                                 dtype=ALLELE_TYPE)
 
     @property
     def gene_number(self):
@@ -46,33 +283,68 @@ class Chromosome(object):
     def gene_size(self):
         return self._gene_size
 
+    @property
+    def size(self):
+        """The total number of loci."""
+        return self._info.size
+
+    @property
+    def search_space(self):
+        return self._space
+
     def get_genes(self):
         genes = []
-        for locus in range(0, self._gene_number, self._gene_size):
+        for locus in range(0, self._info.size, self._gene_size):
             allele = self._info[locus: locus + self._gene_size]
-            genes.append(Gene(locus, allele, self._space))
+            genes.append(Gene(locus, allele))
         return genes
 
+    def get_gene(self, index):
+        locus = index * self._gene_size
+        return Gene(locus, self._info[locus: locus + self._gene_size])
+
     def get_raw_data(self):
-        return list(self._info)
+        return self._info.copy()
+
+    def get_packed_data(self):
+        """Return the genetic data packed eight loci per byte."""
+        return numpy.packbits(self._info).tobytes()
+
+    def flip(self, locus):
+        """Flip the allele of a single locus, in place."""
+        self._info[locus] ^= 1
 
     def overwrite(self, genes):
-        if len(genes) != self._gene_number:
+        genes = numpy.array(genes, dtype=ALLELE_TYPE)
+        if genes.ndim != 1 or genes.size != self._info.size:
             raise ValueError("Invalid gene number for this chromosome.")
         self._info = genes
 
     @classmethod
     def from_raw(cls, genes, search_space):
-        chromosome = cls(len(genes), search_space)
+        chromosome = cls(len(genes) // search_space.size, search_space)
         chromosome.overwrite(genes)
         return chromosome
 
     @classmethod
-    def random(cls, gene_number, search_space):
-        template = "{0:0%(size)db}" % {"size": search_space.size}
-        genetic_data = []
-        for _ in range(gene_number):
-            genes = random.randrange(0, 2 ** search_space.size)
-            genetic_data.extend(list(template.format(genes)))
-
-        return cls.from_raw(genetic_data, search_space)
+    def from_packed(cls, data, gene_number, search_space):
+        chromosome = cls(gene_number, search_space)
+        genes = numpy.unpackbits(numpy.frombuffer(data, dtype=ALLELE_TYPE))
+        chromosome.overwrite(genes[:chromosome.size])
+        return chromosome
+
+    @staticmethod
+    def random_population(count, gene_number, search_space, rng=None):
+        """Return the genetic data of `count` random chromosomes as the
+        rows of a matrix; every gene stores a point of the grid drawn
+        uniformly.
+
+        :param rng: the `numpy.random.Generator` used
+        """
+        indexes = search_space.random_indexes((count, gene_number), rng)
+        return search_space.decoder.encode(indexes)
+
+    @classmethod
+    def random(cls, gene_number, search_space, rng=None):
+        genes = cls.random_population(1, gene_number, search_space, rng)
+        return cls.from_raw(genes[0], search_space)
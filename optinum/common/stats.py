@@ -0,0 +1,303 @@
+"""Streaming statistics of the results of an analysis.
+
+The accumulators see every result once, keep a bounded amount of data
+and can be merged, so the summaries computed by different workers or
+processes are combined without gathering the results themselves. They do
+not depend on the order of the results either, so a seeded analysis is
+summarized the same way whatever the number of workers.
+"""
+import collections
+import fractions
+import math
+
+from optinum.common import config
+
+# The finite floats are multiples of 2 ** -_SHIFT, so they are summed
+# exactly as integers.
+_SHIFT = 1074
+
+
+def _exact(value):
+    """Return `value` * 2 ** _SHIFT as an integer."""
+    numerator, denominator = value.as_integer_ratio()
+    return numerator << (_SHIFT - denominator.bit_length() + 1)
+
+
+def _ratio(numerator, denominator):
+    """Return the float closest to numerator / denominator."""
+    try:
+        return float(fractions.Fraction(numerator, denominator))
+    except OverflowError:
+        return math.copysign(math.inf, numerator)
+
+
+class QuantileSketch(object):
+
+    """Quantiles with a bounded relative error (a uniform DDSketch).
+
+    Every value is counted in the bucket `ceil(log(|x|) / log(gamma))`,
+    so a quantile is known within `accuracy` of its true value whatever
+    the number of values. The positive and the negative values have their
+    own buckets. When there are more than `max_bins` buckets, every two
+    neighboring buckets are joined (gamma is squared), so the error grows
+    by the same amount for all the quantiles. The quantiles are kept
+    between the smallest and the largest value. The infinite values are
+    counted apart and the NaN ones are left out.
+    """
+
+    # the magnitude under which the values are counted as zero
+    MIN_VALUE = 1e-12
+
+    def __init__(self, accuracy=config.STATS.ACCURACY,
+                 max_bins=config.STATS.MAX_BINS):
+        """Setup a new sketch.
+
+        :param accuracy: the relative error of the quantiles, before the
+                         buckets are joined
+        :param max_bins: the maximum number of buckets kept
+        """
+        self._accuracy = accuracy
+        self._max_bins = max_bins
+        self._collapses = 0
+        self._gamma = (1.0 + accuracy) / (1.0 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive = collections.Counter()
+        self._negative = collections.Counter()
+        self._zero = 0
+        self._infinite = [0, 0]     # the counts of -inf and +inf
+        self._count = 0
+        self._min = math.inf
+        self._max = -math.inf
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def accuracy(self):
+        """The current relative error of the quantiles."""
+        return (self._gamma - 1.0) / (self._gamma + 1.0)
+
+    def _key(self, magnitude):
+        return int(math.ceil(math.log(magnitude) / self._log_gamma))
+
+    def _value(self, key):
+        return 2.0 * self._gamma ** key / (self._gamma + 1.0)
+
+    def add(self, value):
+        """Count a new value."""
+        if math.isnan(value):
+            return
+        if math.isinf(value):
+            self._infinite[value > 0] += 1
+        elif value > self.MIN_VALUE:
+            self._positive[self._key(value)] += 1
+        elif value < -self.MIN_VALUE:
+            self._negative[self._key(-value)] += 1
+        else:
+            self._zero += 1
+        self._count += 1
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+        if len(self._positive) + len(self._negative) > self._max_bins:
+            self._collapse()
+
+    def _collapse(self, times=1):
+        """Join every two neighboring buckets, `times` times."""
+        for _ in range(times):
+            for store in (self._positive, self._negative):
+                joined = collections.Counter()
+                for key, count in store.items():
+                    joined[-(-key // 2)] += count
+                store.clear()
+                store.update(joined)
+            self._collapses += 1
+            self._gamma *= self._gamma
+            self._log_gamma *= 2
+
+    def merge(self, other):
+        """Add the values counted by `other`, which must have been created
+        with the same accuracy."""
+        if other._accuracy != self._accuracy:
+            raise ValueError("Only sketches with the same accuracy can be "
+                             "merged.")
+        if other._collapses > self._collapses:
+            self._collapse(other._collapses - self._collapses)
+        positive, negative = other._positive, other._negative
+        if other._collapses < self._collapses:
+            copy = QuantileSketch(other._accuracy, other._max_bins)
+            copy._collapses = other._collapses
+            copy._gamma, copy._log_gamma = other._gamma, other._log_gamma
+            copy._positive.update(positive)
+            copy._negative.update(negative)
+            copy._collapse(self._collapses - other._collapses)
+            positive, negative = copy._positive, copy._negative
+
+        self._positive.update(positive)
+        self._negative.update(negative)
+        self._zero += other._zero
+        self._infinite[0] += other._infinite[0]
+        self._infinite[1] += other._infinite[1]
+        self._count += other._count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        while len(self._positive) + len(self._negative) > self._max_bins:
+            self._collapse()
+
+    def quantile(self, fraction):
+        """Return the value under which `fraction` of the values are, None
+        if there is no value."""
+        if not self._count:
+            return None
+        return min(max(self._quantile(fraction), self._min), self._max)
+
+    def _quantile(self, fraction):
+        rank = fraction * (self._count - 1)
+        seen = self._infinite[0]
+        if seen > rank:
+            return -math.inf
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._max
+
+
+class Summary(object):
+
+    """Count, best, mean, variance and quantiles of a stream of results.
+
+    The sums of the scores and of their squares are exact, so the mean and
+    the variance are rounded once, whatever the order of the results. The
+    best result is the one with the lowest score and, between equal
+    scores, the one of the first restart.
+
+    The exact sums are integers of about 1100 and 2200 bits, so `add`
+    costs a few microseconds (see the `stats` suite of the benchmarks),
+    which is negligible next to a restart. A Welford update would be
+    cheaper, but its rounding depends on the order of the results.
+    """
+
+    def __init__(self, accuracy=config.STATS.ACCURACY):
+        """Setup a new summary.
+
+        :param accuracy: the relative error of the quantiles
+        """
+        self._count = 0
+        self._failures = 0
+        self._sum = 0           # the exact sums, see `_exact`
+        self._squares = 0
+        self._special = 0.0     # the sum of the infinite and NaN scores
+        self._best = None
+        self._best_index = None
+        self._evaluations = 0
+        self._sketch = QuantileSketch(accuracy)
+
+    @property
+    def count(self):
+        """The number of successful results."""
+        return self._count
+
+    @property
+    def failures(self):
+        return self._failures
+
+    @property
+    def best(self):
+        """The `Result` with the lowest score, None without results."""
+        return self._best
+
+    @property
+    def best_index(self):
+        """The restart of the best result, if it is known."""
+        return self._best_index
+
+    @property
+    def mean(self):
+        if not self._count:
+            return None
+        return _ratio(self._sum, self._count << _SHIFT) + self._special
+
+    @property
+    def variance(self):
+        """The sample variance of the scores."""
+        if self._count < 2:
+            return None
+        if self._special:
+            return math.nan
+        count = self._count
+        return _ratio(self._squares * count - self._sum * self._sum,
+                      (count * (count - 1)) << (2 * _SHIFT))
+
+    @property
+    def std(self):
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def evaluations(self):
+        """The evaluations of all the results."""
+        return self._evaluations
+
+    @property
+    def evaluations_to_best(self):
+        """The evaluations spent by the best restart."""
+        return self._best.evaluations if self._best is not None else 0
+
+    def quantile(self, fraction):
+        return self._sketch.quantile(fraction)
+
+    def _take_best(self, result, index):
+        """Keep `result` if it is better than the best one so far."""
+        if self._best is not None:
+            score, best = float(result.score), float(self._best.score)
+            if score > best or math.isnan(score):
+                return
+            if score == best and (index is None or (
+                    self._best_index is not None and
+                    index >= self._best_index)):
+                return
+        self._best, self._best_index = result, index
+
+    def add(self, result, index=None):
+        """Take a new `Result` into account, None for a failed restart.
+
+        :param index: the restart of the result, which breaks the ties
+                      between the best scores
+        """
+        if result is None:
+            self._failures += 1
+            return
+
+        score = float(result.score)
+        self._count += 1
+        self._evaluations += result.evaluations
+        if math.isfinite(score):
+            exact = _exact(score)
+            self._sum += exact
+            self._squares += exact * exact
+        else:
+            self._special += score
+        self._sketch.add(score)
+        self._take_best(result, index)
+
+    def merge(self, other):
+        """Add the results summarized by `other`."""
+        self._failures += other._failures
+        if not other._count:
+            return
+
+        self._count += other._count
+        self._evaluations += other._evaluations
+        self._sum += other._sum
+        self._squares += other._squares
+        self._special += other._special
+        self._sketch.merge(other._sketch)
+        self._take_best(other._best, other._best_index)
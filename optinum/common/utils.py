@@ -2,6 +2,8 @@
 import logging
 import sys
 
+import numpy
+
 from optinum.common import config
 
 
@@ -33,3 +35,18 @@ def get_logger(name=config.LOG.NAME, format_string=None):
 
     logger.setLevel(config.LOG.LEVEL)
     return logger
+
+
+def seed_stream(seed=None):
+    """Yield independent 64-bit seeds spawned from a single seed.
+
+    The seeds depend only on `seed` and on their position in the stream,
+    so the tasks which receive them are reproducible regardless of the
+    order in which they are executed.
+
+    :param seed: the root seed; fresh entropy is used if it is missing
+    """
+    sequence = numpy.random.SeedSequence(seed)
+    while True:
+        child, = sequence.spawn(1)
+        yield int(child.generate_state(1, numpy.uint64)[0])
@@ -2,14 +2,17 @@
 # pylint: disable=abstract-method
 
 import abc
+import math
+import multiprocessing
 import six
-import time
 import threading
 try:
     import queue
 except ImportError:
     import Queue as queue
 
+from optinum.common import config
+from optinum.common import metrics
 from optinum.common import utils
 
 LOG = utils.get_logger(__name__)
@@ -43,11 +46,11 @@ class BaseWorker(object):
         """Starts a series of workers and processes incoming tasks."""
         self.prologue()
         try:
-            self.process(task)
+            result = self.process(task)
         except Exception as exc:
             self.task_fail(task, exc)
         else:
-            self.task_done(task, exc)
+            self.task_done(task, result)
         self.epilogue()
 
 
@@ -96,6 +99,10 @@ class Worker(BaseWorker):
         """What to execute when keyboard interrupts arrive."""
         pass
 
+    def halt(self):
+        """Ask the worker to stop processing tasks."""
+        self.stop.set()
+
     def start(self):
         """Starts a series of workers and processes incoming tasks."""
         self.prologue()
@@ -106,13 +113,53 @@ class Worker(BaseWorker):
                 loop = self.finished()
                 if not loop:
                     break
-                time.sleep(self.delay)
+                self.stop.wait(self.delay)
             except KeyboardInterrupt:
                 self.interrupted()
                 break
         self.epilogue()
 
 
+class ScalingPolicy(object):
+
+    """Decide how many workers a `ConcurrentWorker` keeps alive.
+
+    The workers are enough to finish the backlog within `horizon` seconds
+    at the measured task latency, but never more than the queued and the
+    running tasks. The surplus workers retire after `idle_timeout`.
+    """
+
+    def __init__(self, min_workers=config.WORKER.MIN_WORKERS,
+                 max_workers=config.WORKER.MAX_WORKERS,
+                 interval=config.WORKER.SCALE_INTERVAL,
+                 horizon=config.WORKER.SCALE_HORIZON,
+                 idle_timeout=config.WORKER.IDLE_TIMEOUT):
+        """Setup a new policy.
+
+        :param max_workers: the upper limit, 0 for the available cores
+        :param interval:    seconds between two scaling decisions
+        """
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.min_workers = min(max(min_workers, 1), self.max_workers)
+        self.interval = interval
+        self.horizon = horizon
+        self.idle_timeout = idle_timeout
+
+    def desired(self, busy, backlog, latency):
+        """Return the number of workers required by the current load.
+
+        :param busy:    the number of workers processing a task
+        :param backlog: the number of queued tasks
+        :param latency: the mean duration of a task, None if unknown
+        """
+        if latency is None:
+            required = busy + backlog
+        else:
+            required = busy + min(backlog, int(math.ceil(
+                backlog * latency / self.horizon)))
+        return max(self.min_workers, min(self.max_workers, required))
+
+
 class ConcurrentWorker(Worker):
 
     """Abstract base class for concurrent workers.
@@ -127,14 +174,32 @@ class ConcurrentWorker(Worker):
         :type qsize: int
         :param wcount: desired number of workers
         :type wcount: int
+        :param policy: optional `ScalingPolicy`; without it `wcount`
+                       workers are kept alive
         """
+        policy = kwargs.pop("policy", None)
         super(ConcurrentWorker, self).__init__(*args, **kwargs)
         self.wcount = wcount     # desired number of workers
         self.qsize = qsize       # maximum allowed queue size
+        self.policy = policy     # how the number of workers changes
         self.workers = list()    # workers as objects
         self.manager = None      # who supervises the workers
         self.queue = queue.Queue(self.qsize)
         self.stop = threading.Event()
+        self.scaling = metrics.new_metrics()
+
+        self._state_lock = threading.Lock()
+        self._busy = 0           # workers processing a task
+        self._latency = None     # moving average of the task duration
+        self._retiring = 0       # workers asked to stop
+        self._surplus_since = None
+
+    @property
+    def capacity(self):
+        """The maximum number of workers alive at once."""
+        if self.policy is None:
+            return self.wcount
+        return self.policy.max_workers
 
     def start_worker(self):
         """Create a custom worker (thread/process) and return its object."""
@@ -150,13 +215,72 @@ class ConcurrentWorker(Worker):
                 if not worker.is_alive():
                     self.workers.remove(worker)
 
+            if self.policy is not None:
+                self.scale()
+                self.stop.wait(self.policy.interval)
+                continue
+
             if len(self.workers) == self.wcount:
-                time.sleep(self.delay)
+                self.stop.wait(self.delay)
                 continue
 
             worker = self.start_worker()
             self.workers.append(worker)
 
+    def scale(self):
+        """Start or retire workers according to the scaling policy."""
+        with self._state_lock:
+            busy, latency = self._busy, self._latency
+            alive = len(self.workers) - self._retiring
+        backlog = self.queue.qsize()
+        desired = self.policy.desired(busy, backlog, latency)
+
+        if desired > alive:
+            self._surplus_since = None
+            LOG.debug("Scale up from %(alive)d to %(desired)d workers "
+                      "(backlog: %(backlog)d, latency: %(latency)s)",
+                      {"alive": alive, "desired": desired,
+                       "backlog": backlog, "latency": latency})
+            for _ in range(desired - alive):
+                self.workers.append(self.start_worker())
+            self.scaling.count(metrics.WORKERS_STARTED, desired - alive)
+            peak = self.scaling.counters[metrics.PEAK_WORKERS]
+            self.scaling.counters[metrics.PEAK_WORKERS] = max(
+                peak, len(self.workers))
+
+        elif desired < alive:
+            now = metrics.clock()
+            if self._surplus_since is None:
+                self._surplus_since = now
+            elif now - self._surplus_since >= self.policy.idle_timeout:
+                self._surplus_since = None
+                self.retire_workers(alive - desired)
+
+        else:
+            self._surplus_since = None
+
+    def retire_workers(self, count):
+        """Ask `count` idle workers to stop."""
+        LOG.debug("Retire %(count)d workers.", {"count": count})
+        for _ in range(count):
+            with self._state_lock:
+                self._retiring += 1
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                # the workers are busy, try again at the next decision
+                with self._state_lock:
+                    self._retiring -= 1
+                break
+            self.scaling.count(metrics.WORKERS_RETIRED)
+
+    def _should_retire(self):
+        with self._state_lock:
+            if self._retiring > 0:
+                self._retiring -= 1
+                return True
+            return False
+
     def prologue(self):
         """Start a parallel supervisor."""
         super(ConcurrentWorker, self).prologue()
@@ -164,9 +288,25 @@ class ConcurrentWorker(Worker):
         self.manager = threading.Thread(target=self.manage_workers)
         self.manager.start()
 
+    def halt(self):
+        """Ask the workers to stop and drop the queued tasks, so a
+        producer blocked on a full queue can see the stop event."""
+        super(ConcurrentWorker, self).halt()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
     def epilogue(self):
         """Wait for that supervisor and its workers."""
         self.manager.join()
+        for _ in self.workers:
+            try:
+                self.queue.put_nowait(None)    # wake up the idle workers
+            except queue.Full:
+                # the workers are not waiting for a task
+                pass
         for worker in self.workers:
             if worker.is_alive():
                 worker.join()
@@ -183,13 +323,11 @@ class ConcurrentWorker(Worker):
         self.queue.put(task)
 
     def get_task(self):
-        """Retrieves a task from the queue."""
-        while not self.stop.is_set():
-            try:
-                task = self.queue.get(block=True, timeout=self.delay)
-            except queue.Empty:
-                continue
-            return task
+        """Retrieves a task from the queue.
+
+        None is received when the workers have to check the stop event.
+        """
+        return self.queue.get(block=True)
 
     def task_done(self, task, result):
         self.queue.task_done()
@@ -200,5 +338,52 @@ class ConcurrentWorker(Worker):
         while not self.stop.is_set():
             task = self.get_task()
             if not task:
+                if self._should_retire():
+                    break
                 continue
-            self._process(task)
+
+            with self._state_lock:
+                self._busy += 1
+            started = metrics.clock()
+            try:
+                self._process(task)
+            finally:
+                elapsed = metrics.clock() - started
+                with self._state_lock:
+                    self._busy -= 1
+                    if self._latency is None:
+                        self._latency = elapsed
+                    else:
+                        self._latency += 0.2 * (elapsed - self._latency)
+
+
+class ProcessConcurrentWorker(ConcurrentWorker):
+
+    """Abstract base class for concurrent workers backed by processes.
+
+    The threads started by `start_worker` only dispatch the tasks, the
+    procedures run in a pool of `wcount` child processes, so the CPU bound
+    work is not limited by the GIL. Everything sent to `run_remote` must
+    be picklable.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ProcessConcurrentWorker, self).__init__(*args, **kwargs)
+        self.pool = None
+
+    def prologue(self):
+        """Start the pool of child processes."""
+        context = multiprocessing.get_context(config.WORKER.START_METHOD)
+        self.pool = context.Pool(self.capacity)
+        super(ProcessConcurrentWorker, self).prologue()
+
+    def epilogue(self):
+        """Wait for the dispatchers and stop the child processes."""
+        super(ProcessConcurrentWorker, self).epilogue()
+        self.pool.close()
+        self.pool.join()
+
+    def run_remote(self, function, *args):
+        """Run `function` in one of the child processes and return
+        its result."""
+        return self.pool.apply(function, args)
@@ -1,25 +1,110 @@
-from optinum.algorithm import hillclimbing
-from optinum import objective
+"""Registries of the available algorithms and objective functions.
 
-_ALGORITHMS = {
-    'HCFirstImprovement': hillclimbing.HCFirstImprovement,
-    'HCBestImprovement': hillclimbing.HCBestImprovement,
-}
-_OBJECTIVE_FUNCTION = {
-    'Rosenbrock': objective.Rosenbrock,
-    'Rastrigin': objective.Rastrigin,
-    'Griewangk': objective.Griewangk,
-    'SixHumpCamelBack': objective.SixHumpCamelBack,
-}
+The entries are kept as "module:attribute" paths and the modules are
+imported only when an entry is requested, so listing the names (for
+example for the shell completion) does not import NumPy or the
+implementations. Third-party packages can add entries through the
+`optinum.algorithms` and `optinum.objectives` entry point groups.
+"""
+import importlib
+
+import six
+
+
+class Registry(object):
+
+    """Named classes which are imported on first use."""
+
+    def __init__(self, group, entries):
+        """Setup a new registry.
+
+        :param group:   the entry point group of the plugins
+        :param entries: the built-in "module:attribute" paths by name
+        """
+        self._group = group
+        self._entries = dict(entries)
+        self._loaded = {}
+        self._discovered = False
+
+    def _discover(self):
+        """Add the entries advertised by the installed distributions."""
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            from importlib import metadata
+        except ImportError:
+            return
+
+        entry_points = metadata.entry_points()
+        if hasattr(entry_points, "select"):
+            entry_points = entry_points.select(group=self._group)
+        else:
+            entry_points = entry_points.get(self._group, [])
+        for entry_point in entry_points:
+            self._entries.setdefault(entry_point.name, entry_point.value)
+
+    def register(self, name, target):
+        """Add an entry.
+
+        :param target: the class or its "module:attribute" path
+        """
+        if isinstance(target, six.string_types):
+            self._entries[name] = target
+            self._loaded.pop(name, None)
+        else:
+            self._entries[name] = "%(module)s:%(name)s" % {
+                "module": target.__module__, "name": target.__name__}
+            self._loaded[name] = target
+
+    def names(self):
+        """Return the names of the entries, without importing them."""
+        self._discover()
+        return sorted(self._entries)
+
+    def get(self, name):
+        """Return the class registered as `name` or None."""
+        target = self._loaded.get(name)
+        if target is not None:
+            return target
+
+        path = self._entries.get(name)
+        if path is None:
+            self._discover()
+            path = self._entries.get(name)
+            if path is None:
+                return None
+
+        module, _, attribute = path.partition(":")
+        target = importlib.import_module(module)
+        for part in attribute.split("."):
+            target = getattr(target, part)
+        self._loaded[name] = target
+        return target
+
+
+ALGORITHMS = Registry("optinum.algorithms", {
+    'HCFirstImprovement': 'optinum.algorithm.hillclimbing:HCFirstImprovement',
+    'HCBestImprovement': 'optinum.algorithm.hillclimbing:HCBestImprovement',
+    'GeneticAlgorithm': 'optinum.algorithm.genetic:GeneticAlgorithm',
+    'GridFirstImprovement': 'optinum.algorithm.grid:GridFirstImprovement',
+    'GridBestImprovement': 'optinum.algorithm.grid:GridBestImprovement',
+})
+OBJECTIVE_FUNCTIONS = Registry("optinum.objectives", {
+    'Rosenbrock': 'optinum.objective:Rosenbrock',
+    'Rastrigin': 'optinum.objective:Rastrigin',
+    'Griewangk': 'optinum.objective:Griewangk',
+    'SixHumpCamelBack': 'optinum.objective:SixHumpCamelBack',
+})
 
 
 def algorithm(algorithm=None):
     if not algorithm:
-        return _ALGORITHMS.keys()
-    return _ALGORITHMS.get(algorithm)
+        return ALGORITHMS.names()
+    return ALGORITHMS.get(algorithm)
 
 
 def objective_function(function_name=None):
     if not function_name:
-        return _OBJECTIVE_FUNCTION.keys()
-    return _OBJECTIVE_FUNCTION.get(function_name)()
+        return OBJECTIVE_FUNCTIONS.names()
+    return OBJECTIVE_FUNCTIONS.get(function_name)
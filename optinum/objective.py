@@ -3,8 +3,14 @@ Collection of objective functions which will be optimized.
 """
 import abc
 import math
+
+import numpy
 import six
 
+from optinum.common import config
+from optinum.common import kernels
+from optinum.common import objects
+
 cos = math.cos
 pi = math.pi
 sqrt = math.sqrt
@@ -13,14 +19,24 @@ sqrt = math.sqrt
 @six.add_metaclass(abc.ABCMeta)
 class Objective(object):
 
-    """Contract class for all the objective functions."""
+    """Contract class for all the objective functions.
+
+    The `numba` backend replaces the batch and the neighborhood
+    evaluations of the built-in functions and the decoder with compiled
+    kernels; the NumPy versions remain the reference.
+    """
 
     min_xi = 0
     max_xi = 0
 
-    def __init__(self, precision):
+    def __init__(self, precision, encoding=config.ENCODING.BINARY,
+                 backend=config.KERNEL.DEFAULT):
         self._name = self.__class__.__name__
         self._precision = precision
+        self._encoding = encoding
+        self._backend = kernels.resolve(backend)
+        self._kernels = kernels.load(self._backend)
+        self._space = None
 
     def __call__(self, chromosome):
         return self.compute(chromosome)
@@ -29,18 +45,98 @@ class Objective(object):
     def name(self):
         return self._name
 
+    @property
+    def precision(self):
+        return self._precision
+
+    @property
+    def encoding(self):
+        return self._encoding
+
+    @property
+    def backend(self):
+        """The kernel backend which is actually used."""
+        return self._backend
+
+    @property
+    def search_space(self):
+        if self._space is None:
+            self._space = objects.SearchSpace(self.min_xi, self.max_xi,
+                                              self._precision,
+                                              self._encoding, self._backend)
+        return self._space
+
+    def decode(self, chromosome):
+        """Return the variables encoded by the chromosome."""
+        return self.search_space.decode(chromosome.get_raw_data()).tolist()
+
     def compute(self, chromosome):
-        variables = []
-        genes = chromosome.get_genes()
-        for gene in genes:
-            variables.append(gene.value(self.min_xi, self._precision))
+        return self.evaluate(self.decode(chromosome))
 
-        return self.evaluate(variables)
+    def compute_batch(self, chromosomes):
+        """Score a sequence of chromosomes with a single batch call."""
+        matrix = numpy.array([self.decode(chromosome)
+                              for chromosome in chromosomes],
+                             dtype=numpy.float64, ndmin=2)
+        return self.evaluate_batch(matrix)
+
+    def compute_bits(self, bits):
+        """Score every row of an (N x loci) matrix of genetic data."""
+        return self.evaluate_batch(self.search_space.decode(bits))
 
     @abc.abstractmethod
     def evaluate(self, variables):
         pass
 
+    def evaluate_batch(self, matrix):
+        """Score every row of an (N x variables) matrix.
+
+        The built-in functions override this with a vectorized version,
+        the default one falls back on `evaluate` for each row.
+        """
+        matrix = _as_matrix(matrix)
+        return numpy.fromiter(
+            (self.evaluate(row.tolist()) for row in matrix),
+            dtype=numpy.float64, count=matrix.shape[0])
+
+    def evaluate_neighbors(self, variables, indexes, values):
+        """Score the neighbors which differ from `variables` in a single
+        variable: neighbor `k` has the variable `indexes[k]` set to
+        `values[k]`.
+        """
+        variables = numpy.asarray(variables, dtype=numpy.float64)
+        neighbors = numpy.repeat(variables[numpy.newaxis, :], len(indexes),
+                                 axis=0)
+        neighbors[numpy.arange(len(indexes)), indexes] = values
+        return self.evaluate_batch(neighbors)
+
+    def prepare_delta(self, variables):
+        """Return the state reused by `evaluate_delta` for `variables`.
+
+        None means that the function does not support incremental
+        evaluation and that the whole chromosome has to be scored.
+        """
+        return None
+
+    def evaluate_delta(self, variables, index, new_value, cached_state):
+        """Score `variables` with the one from `index` set to `new_value`.
+
+        :param cached_state: the value returned by `prepare_delta` for
+                             the unchanged variables
+        """
+        variables = list(variables)
+        variables[index] = new_value
+        return self.evaluate(variables)
+
+
+def _as_matrix(matrix):
+    """Convert the received data to a 2-D float64 array."""
+    matrix = numpy.asarray(matrix, dtype=numpy.float64)
+    if matrix.ndim != 2:
+        raise ValueError("Expected a 2-D array of variables, got %(ndim)d-D" %
+                         {"ndim": matrix.ndim})
+    return matrix
+
 
 class Rosenbrock(Objective):
 
@@ -63,6 +159,39 @@ class Rosenbrock(Objective):
             result += (1 - variables[index]) ** 2
         return result
 
+    def evaluate_batch(self, matrix):
+        matrix = _as_matrix(matrix)
+        if self._kernels is not None:
+            return self._kernels.rosenbrock(matrix)
+        current, following = matrix[:, :-1], matrix[:, 1:]
+        return numpy.sum(100 * (following - current ** 2) ** 2 +
+                         (1 - current) ** 2, axis=1)
+
+    def evaluate_neighbors(self, variables, indexes, values):
+        if self._kernels is not None:
+            return self._kernels.rosenbrock_neighbors(
+                numpy.asarray(variables, dtype=numpy.float64),
+                indexes, values)
+        return super(Rosenbrock, self).evaluate_neighbors(variables, indexes,
+                                                          values)
+
+    @staticmethod
+    def _term(current, following):
+        return 100 * (following - current ** 2) ** 2 + (1 - current) ** 2
+
+    def prepare_delta(self, variables):
+        return self.evaluate(variables)
+
+    def evaluate_delta(self, variables, index, new_value, cached_state):
+        result = cached_state
+        if index > 0:
+            result -= self._term(variables[index - 1], variables[index])
+            result += self._term(variables[index - 1], new_value)
+        if index < len(variables) - 1:
+            result -= self._term(variables[index], variables[index + 1])
+            result += self._term(new_value, variables[index + 1])
+        return result
+
 
 class Rastrigin(Objective):
 
@@ -83,6 +212,32 @@ class Rastrigin(Objective):
             result -= 10 * cos(2 * pi * variables[index])
         return result
 
+    def evaluate_batch(self, matrix):
+        matrix = _as_matrix(matrix)
+        if self._kernels is not None:
+            return self._kernels.rastrigin(matrix)
+        return 10 * matrix.shape[1] + numpy.sum(
+            matrix ** 2 - 10 * numpy.cos(2 * pi * matrix), axis=1)
+
+    def evaluate_neighbors(self, variables, indexes, values):
+        if self._kernels is not None:
+            return self._kernels.rastrigin_neighbors(
+                numpy.asarray(variables, dtype=numpy.float64),
+                indexes, values)
+        return super(Rastrigin, self).evaluate_neighbors(variables, indexes,
+                                                         values)
+
+    @staticmethod
+    def _term(value):
+        return value ** 2 - 10 * cos(2 * pi * value)
+
+    def prepare_delta(self, variables):
+        return self.evaluate(variables)
+
+    def evaluate_delta(self, variables, index, new_value, cached_state):
+        return (cached_state - self._term(variables[index]) +
+                self._term(new_value))
+
 
 class Griewangk(Objective):
 
@@ -99,7 +254,43 @@ class Griewangk(Objective):
         sum_, prod = 0, 1
         for index in range(len(variables)):
             sum_ += variables[index] ** 2 / 4000
-            prod *= cos(variables[index] / sqrt(index))
+            prod *= cos(variables[index] / sqrt(index + 1))
+        return sum_ - prod + 1
+
+    def evaluate_batch(self, matrix):
+        matrix = _as_matrix(matrix)
+        if self._kernels is not None:
+            return self._kernels.griewangk(matrix)
+        divisors = numpy.sqrt(numpy.arange(1, matrix.shape[1] + 1))
+        sum_ = numpy.sum(matrix ** 2 / 4000, axis=1)
+        prod = numpy.prod(numpy.cos(matrix / divisors), axis=1)
+        return sum_ - prod + 1
+
+    def evaluate_neighbors(self, variables, indexes, values):
+        if self._kernels is not None:
+            return self._kernels.griewangk_neighbors(
+                numpy.asarray(variables, dtype=numpy.float64),
+                indexes, values)
+        return super(Griewangk, self).evaluate_neighbors(variables, indexes,
+                                                         values)
+
+    def prepare_delta(self, variables):
+        sum_, prod = 0, 1
+        for index in range(len(variables)):
+            sum_ += variables[index] ** 2 / 4000
+            prod *= cos(variables[index] / sqrt(index + 1))
+        return sum_, prod
+
+    def evaluate_delta(self, variables, index, new_value, cached_state):
+        sum_, prod = cached_state
+        old_cos = cos(variables[index] / sqrt(index + 1))
+        if abs(old_cos) < 1e-12:
+            # The product can not be divided by this factor
+            return super(Griewangk, self).evaluate_delta(
+                variables, index, new_value, cached_state)
+
+        sum_ += (new_value ** 2 - variables[index] ** 2) / 4000
+        prod = prod / old_cos * cos(new_value / sqrt(index + 1))
         return sum_ - prod + 1
 
 
@@ -123,3 +314,16 @@ class SixHumpCamelBack(Objective):
         result *= variables[0] ** 2 + variables[0] * variables[1]
         result += (-4 + 4 * variables[1] ** 2) * variables[1] ** 2
         return result
+
+    def evaluate_batch(self, matrix):
+        matrix = _as_matrix(matrix)
+        if matrix.shape[1] != 2:
+            raise ValueError("Invalid number of variables for %(name)s" %
+                             {"name": self.name})
+        if self._kernels is not None:
+            return self._kernels.six_hump_camel_back(matrix)
+        first, second = matrix[:, 0], matrix[:, 1]
+        result = (4 - 2.1 * first ** 2 + first ** 4 / 3)
+        result *= first ** 2 + first * second
+        result += (-4 + 4 * second ** 2) * second ** 2
+        return result
@@ -0,0 +1,90 @@
+"""The asyncio interface of the analysis."""
+import argparse
+import asyncio
+import concurrent.futures
+import unittest
+
+from optinum.analysis import hcanalysis
+from optinum.common import config
+
+
+def _command(**options):
+    values = dict(algorithm="HCFirstImprovement", objective="Rastrigin",
+                  precision=2, variables=4, seed=37, backend="thread",
+                  workers=2, autoscale=False,
+                  min_workers=config.WORKER.MIN_WORKERS,
+                  max_workers=config.WORKER.MAX_WORKERS, chunk_size=1,
+                  engine=config.ENGINE.TASK, kernel=config.KERNEL.NUMPY,
+                  encoding=config.ENCODING.DEFAULT, cache_size=None,
+                  checkpoint=None,
+                  checkpoint_interval=config.CHECKPOINT.INTERVAL,
+                  resume=False, store=None, broker=None, authkey=None)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    def report(self):
+        pass
+
+
+async def _collect(analysis, count, pool, first=0):
+    return [pair async for pair in analysis.stream(count, pool, first)]
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        self._pool = concurrent.futures.ThreadPoolExecutor(3)
+        self.addCleanup(self._pool.shutdown)
+
+    def _expected(self, count):
+        analysis = _QuietAnalysis(_command())
+        self.assertTrue(analysis.compute(count))
+        return list(analysis.results())
+
+    def test_exactly_once(self):
+        expected = self._expected(20)
+        for chunk_size in (1, 3, 0):
+            analysis = _QuietAnalysis(_command(chunk_size=chunk_size))
+            pairs = asyncio.run(_collect(analysis, 20, self._pool))
+            indexes = [index for index, _ in pairs]
+            self.assertEqual(sorted(indexes), list(range(20)))
+            self.assertEqual([result for _, result in sorted(pairs)],
+                             expected)
+
+    def test_continue(self):
+        """A second stream continues the restarts of the first one."""
+        expected = self._expected(12)
+        analysis = _QuietAnalysis(_command())
+        first = asyncio.run(_collect(analysis, 5, self._pool))
+        second = asyncio.run(_collect(analysis, 7, self._pool, first=5))
+        self.assertEqual(sorted(index for index, _ in first),
+                         list(range(5)))
+        self.assertEqual(sorted(index for index, _ in second),
+                         list(range(5, 12)))
+        self.assertEqual([result for _, result in sorted(first + second)],
+                         expected)
+
+    def test_compute_async(self):
+        """Several analyses share the pool of one event loop."""
+        analyses = [_QuietAnalysis(_command(seed=seed))
+                    for seed in (1, 2, 3)]
+
+        async def compute():
+            return await asyncio.gather(*(
+                analysis.compute_async(8, self._pool)
+                for analysis in analyses))
+
+        self.assertEqual(asyncio.run(compute()), [True] * 3)
+        for seed, analysis in zip((1, 2, 3), analyses):
+            reference = _QuietAnalysis(_command(seed=seed))
+            self.assertTrue(reference.compute(8))
+            self.assertEqual(list(analysis.results()),
+                             list(reference.results()))
+            self.assertEqual(analysis.summary().count, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
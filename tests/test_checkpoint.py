@@ -0,0 +1,121 @@
+"""A resumed analysis gives the same results as an uninterrupted one."""
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+
+from optinum.algorithm import base as algorithms
+from optinum.analysis import base
+from optinum.analysis import checkpoint
+from optinum.analysis import hcanalysis
+from optinum.common import config
+from optinum.common import utils
+
+ALGORITHMS = ("HCFirstImprovement", "HCBestImprovement",
+              "GridFirstImprovement")
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    def report(self):
+        pass
+
+
+def _command(path, **options):
+    values = dict(algorithm="HCFirstImprovement", objective="Rastrigin",
+                  precision=3, variables=10, seed=None, backend="thread",
+                  workers=2, autoscale=False,
+                  min_workers=config.WORKER.MIN_WORKERS,
+                  max_workers=config.WORKER.MAX_WORKERS, chunk_size=0,
+                  engine=config.ENGINE.TASK, kernel=config.KERNEL.NUMPY,
+                  encoding=config.ENCODING.DEFAULT, cache_size=None,
+                  checkpoint=path, checkpoint_interval=0.01, resume=False,
+                  store=None)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "progress.ckpt")
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_save_load(self):
+        progress = checkpoint.Checkpoint(self._path, {"variables": 3}, 42)
+        result = algorithms.Result(1.5, 7, b"\x01")
+        progress.update(0, result=result)
+        progress.update(1, state=algorithms.State(2.5, 3, b"\x02", None))
+        progress.save()
+
+        loaded = checkpoint.Checkpoint(self._path)
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.seed, 42)
+        self.assertEqual(loaded.results, {0: result})
+        self.assertEqual(loaded.states[1].evaluations, 3)
+        loaded.verify({"variables": 3})
+        self.assertRaises(ValueError, loaded.verify, {"variables": 4})
+
+    def test_missing_file(self):
+        self.assertFalse(checkpoint.Checkpoint(self._path).load())
+
+    def test_task_resume(self):
+        for algorithm in ALGORITHMS:
+            full = base.Task(algorithm, "Rastrigin", 3, 10, seed=5).run()
+            states = []
+            task = base.Task(algorithm, "Rastrigin", 3, 10, seed=5,
+                             checkpoint=True)
+            task.callback_progress = states.append
+            self.assertEqual(task.run(), full)
+            for state in (states[0], states[len(states) // 2], states[-1]):
+                resumed = base.Task(algorithm, "Rastrigin", 3, 10, seed=5,
+                                    state=state)
+                self.assertEqual(resumed.run(), full, algorithm)
+                # the state travels in the specification of the task
+                self.assertEqual(base.run_task(resumed.spec)[0], full)
+
+    def test_analysis_resume(self):
+        analysis = _QuietAnalysis(_command(self._path))
+        self.assertTrue(analysis.compute(8))
+        expected = list(analysis.results())
+
+        # an interrupted analysis: two restarts are lost, one of them was
+        # saved while it was running
+        progress = checkpoint.Checkpoint(self._path)
+        progress.load()
+        del progress.results[3]
+        del progress.results[6]
+        seed = next(itertools.islice(utils.seed_stream(progress.seed), 6,
+                                     None))
+        states = []
+        task = base.Task("HCFirstImprovement", "Rastrigin", 3, 10,
+                         seed=seed, checkpoint=True)
+        task.callback_progress = states.append
+        task.run()
+        progress.states[6] = states[0]
+        progress.save()
+
+        resumed = _QuietAnalysis(_command(self._path, resume=True))
+        self.assertTrue(resumed.compute(8))
+        self.assertEqual(list(resumed.results()), expected)
+
+    def test_resume_other_analysis(self):
+        self.assertTrue(_QuietAnalysis(_command(self._path)).compute(2))
+        self.assertRaises(ValueError, _QuietAnalysis,
+                          _command(self._path, resume=True, variables=5))
+        self.assertRaises(ValueError, _QuietAnalysis,
+                          _command(self._path, resume=True,
+                                   encoding=config.ENCODING.GRAY))
+
+    def test_resume_without_file(self):
+        self.assertRaises(ValueError, _QuietAnalysis,
+                          _command(None, resume=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""The thread and the process backends of the analysis."""
+import argparse
+import unittest
+
+from optinum.analysis import base
+from optinum.analysis import hcanalysis
+from optinum.common import config
+from optinum.common import metrics
+
+
+def _command(**options):
+    values = dict(algorithm="HCFirstImprovement", objective="Rastrigin",
+                  precision=2, variables=5, seed=23, backend="thread",
+                  workers=2, autoscale=False,
+                  min_workers=config.WORKER.MIN_WORKERS,
+                  max_workers=config.WORKER.MAX_WORKERS, chunk_size=1,
+                  engine=config.ENGINE.TASK, kernel=config.KERNEL.NUMPY,
+                  encoding=config.ENCODING.DEFAULT, cache_size=None,
+                  checkpoint=None,
+                  checkpoint_interval=config.CHECKPOINT.INTERVAL,
+                  resume=False, store=None, broker=None, authkey=None)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    def report(self):
+        pass
+
+
+class TestExecutors(unittest.TestCase):
+
+    def _compute(self, count, **options):
+        analysis = _QuietAnalysis(_command(**options))
+        self.assertTrue(analysis.compute(count))
+        return analysis
+
+    def test_process_backend(self):
+        """The restarts receive the same seeds with every backend."""
+        thread = self._compute(10)
+        process = self._compute(10, backend="process")
+        self.assertIsInstance(process._executor,
+                              base.ProcessAlgorithmExecutor)
+        self.assertEqual(list(process.results()), list(thread.results()))
+
+    def test_process_metrics(self):
+        """The metrics of the child processes reach the analysis."""
+        thread = self._compute(6, chunk_size=3)
+        process = self._compute(6, chunk_size=3, backend="process")
+        for analysis in (thread, process):
+            total = metrics.Metrics()
+            for collected in analysis.metrics().values():
+                total.merge(collected)
+            self.assertEqual(total.counters[metrics.TASKS], 6)
+        self.assertEqual(list(process.results()), list(thread.results()))
+
+    def test_other_seed(self):
+        self.assertNotEqual(list(self._compute(4).results()),
+                            list(self._compute(4, seed=24).results()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""The registries of the algorithms and of the objective functions."""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from importlib import metadata
+from unittest import mock
+
+from optinum import factory
+from optinum import objective
+
+PLUGIN = "optinum_test_plugin"
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, PLUGIN + ".py"), "w") as stream:
+            stream.write(textwrap.dedent("""
+                class Sphere(object):
+                    pass
+            """))
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(sys.modules.pop, PLUGIN, None)
+
+    def _entry_points(self, *entries):
+        found = metadata.EntryPoints(
+            metadata.EntryPoint(name, value, "optinum.test")
+            for name, value in entries)
+        return mock.patch.object(metadata, "entry_points",
+                                 return_value=found)
+
+    def test_lazy_import(self):
+        registry = factory.Registry("optinum.test",
+                                    {"Sphere": PLUGIN + ":Sphere"})
+        with self._entry_points():
+            self.assertEqual(registry.names(), ["Sphere"])
+        self.assertNotIn(PLUGIN, sys.modules)
+        sphere = registry.get("Sphere")
+        self.assertEqual(sphere.__name__, "Sphere")
+        self.assertIn(PLUGIN, sys.modules)
+        self.assertIs(registry.get("Sphere"), sphere)
+
+    def test_entry_points(self):
+        registry = factory.Registry("optinum.test", {
+            "Rastrigin": "optinum.objective:Rastrigin"})
+        with self._entry_points(("Sphere", PLUGIN + ":Sphere"),
+                                ("Rastrigin", PLUGIN + ":Sphere")):
+            self.assertIsNone(registry.get("Missing"))
+            self.assertEqual(registry.names(), ["Rastrigin", "Sphere"])
+        self.assertEqual(registry.get("Sphere").__module__, PLUGIN)
+        # the built-in entries are not replaced by the plugins
+        self.assertIs(registry.get("Rastrigin"), objective.Rastrigin)
+
+    def test_register(self):
+        registry = factory.Registry("optinum.test", {})
+        with self._entry_points():
+            registry.register("Sphere", PLUGIN + ":Sphere")
+            registry.register("Rastrigin", objective.Rastrigin)
+            self.assertEqual(registry.names(), ["Rastrigin", "Sphere"])
+        self.assertIs(registry.get("Rastrigin"), objective.Rastrigin)
+        self.assertEqual(registry.get("Sphere").__name__, "Sphere")
+
+    def test_names_without_imports(self):
+        """Listing the names imports neither NumPy nor the
+        implementations."""
+        code = ("import sys\n"
+                "from optinum import factory\n"
+                "factory.algorithm(), factory.objective_function()\n"
+                "print(sorted(name for name in sys.modules\n"
+                "             if name.split('.')[0] in\n"
+                "             ('numpy', 'optinum')))\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, "-c", code],
+                                         cwd=root, universal_newlines=True)
+        self.assertEqual(output.strip(), "['optinum', 'optinum.factory']")
+
+
+if __name__ == "__main__":
+    unittest.main()
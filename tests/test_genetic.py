@@ -0,0 +1,102 @@
+"""The generations of the genetic algorithm."""
+import unittest
+from unittest import mock
+
+import numpy
+
+from optinum.algorithm import genetic
+from optinum.analysis import base
+
+GENERATIONS = 15
+
+
+def _task(seed=3, **options):
+    return base.Task("GeneticAlgorithm", "Rastrigin", 2, 5, seed=seed,
+                     **options)
+
+
+def _algorithm(**options):
+    values = dict(population=64, generations=GENERATIONS)
+    values.update(options)
+    return genetic.GeneticAlgorithm(**values)
+
+
+def _run(algorithm, task):
+    algorithm.start(task)
+    if algorithm.error is not None:
+        raise algorithm.error
+    return algorithm.result
+
+
+class TestGeneticAlgorithm(unittest.TestCase):
+
+    def test_elitism(self):
+        """The best score never gets worse from a generation to the
+        next one."""
+        task = _task(checkpoint=True)
+        states = []
+        task.callback_progress = states.append
+        _run(_algorithm(mutation=0.2), task)
+        self.assertEqual(len(states), GENERATIONS)
+        scores = [state.score for state in states]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_one_batch_per_generation(self):
+        task = _task()
+        with mock.patch.object(task.objective, "evaluate_batch",
+                               wraps=task.objective.evaluate_batch) as batch:
+            result = _run(_algorithm(), task)
+        self.assertEqual(batch.call_count, GENERATIONS + 1)
+        self.assertTrue(all(len(call.args[0]) == 64
+                            for call in batch.call_args_list))
+        # the evaluations are the scored generations, the first included
+        self.assertEqual(result.evaluations, GENERATIONS + 1)
+
+    def test_reproducible(self):
+        first = _run(_algorithm(), _task(seed=8))
+        self.assertEqual(_run(_algorithm(), _task(seed=8)), first)
+        self.assertNotEqual(_run(_algorithm(), _task(seed=9)), first)
+
+    def test_resume(self):
+        task = _task(checkpoint=True)
+        states = []
+        task.callback_progress = states.append
+        expected = _run(_algorithm(), task)
+        resumed = _run(_algorithm(), _task(state=states[GENERATIONS // 2]))
+        self.assertEqual(resumed, expected)
+
+    def test_select(self):
+        """Tournaments as large as the population always pick the best
+        chromosome."""
+        algorithm = _algorithm(tournament=5000)
+        algorithm._rng = numpy.random.default_rng(1)
+        algorithm._scores = numpy.random.default_rng(2).random(64)
+        parents = algorithm.select()
+        self.assertTrue(numpy.all(parents ==
+                                  numpy.argmin(algorithm._scores)))
+
+    def test_recombine(self):
+        """Every locus of a pair of children comes from its parents."""
+        algorithm = _algorithm(crossover=1.0)
+        algorithm._rng = numpy.random.default_rng(1)
+        parents = numpy.random.default_rng(2).integers(0, 2, (64, 30),
+                                                        dtype=numpy.uint8)
+        children = algorithm.recombine(parents)
+        numpy.testing.assert_array_equal(children[0::2] + children[1::2],
+                                         parents[0::2] + parents[1::2])
+        self.assertFalse(numpy.array_equal(children, parents))
+        algorithm = _algorithm(crossover=0.0)
+        algorithm._rng = numpy.random.default_rng(1)
+        numpy.testing.assert_array_equal(algorithm.recombine(parents),
+                                         parents)
+
+    def test_mutate(self):
+        algorithm = _algorithm(mutation=0.1)
+        algorithm._rng = numpy.random.default_rng(1)
+        children = numpy.zeros((100, 100), dtype=numpy.uint8)
+        algorithm.mutate(children)
+        self.assertTrue(800 < children.sum() <= 1100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""The climbs of the hill climbing algorithms."""
+import unittest
+
+import numpy
+
+from optinum.algorithm import hillclimbing
+from optinum.analysis import base
+from optinum.common import cache
+from optinum.common import config
+from optinum.common import metrics
+from optinum.common import objects
+
+
+def _task(algorithm="HCBestImprovement", objective="Rastrigin", **options):
+    return base.Task(algorithm, objective, 3, 10, seed=11,
+                     metrics_enabled=True, **options)
+
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def test_same_climbs(self):
+        """A cache saves objective calls without changing the climbs."""
+        for algorithm in ("HCFirstImprovement", "HCBestImprovement"):
+            hits = 0
+            for objective in ("Rastrigin", "Griewangk", "Rosenbrock"):
+                for encoding in (config.ENCODING.BINARY,
+                                 config.ENCODING.GRAY):
+                    plain = _task(algorithm, objective, encoding=encoding)
+                    cached = _task(algorithm, objective, encoding=encoding,
+                                   cache=cache.EvaluationCache())
+                    self.assertEqual(cached.run(), plain.run())
+                    counters = cached.metrics.counters
+                    self.assertEqual(counters[metrics.CACHE_MISSES],
+                                     counters[metrics.OBJECTIVE_CALLS])
+                    self.assertEqual(
+                        counters[metrics.OBJECTIVE_CALLS] +
+                        counters[metrics.CACHE_HITS],
+                        plain.metrics.counters[metrics.OBJECTIVE_CALLS])
+                    hits += counters[metrics.CACHE_HITS]
+                    if algorithm == "HCBestImprovement":
+                        # the previous chromosome is one of the neighbors
+                        self.assertGreater(counters[metrics.CACHE_HITS], 0)
+            self.assertGreater(hits, 0)
+
+    def test_neighbor_keys(self):
+        task = _task()
+        task.run()
+        algorithm = task.algorithm
+        for start, stop in ((0, None), (3, 17), (40, 1000)):
+            neighbors = algorithm.neighborhood(start, stop)
+            self.assertEqual(
+                algorithm.neighbor_keys(start, stop),
+                [row.tobytes()
+                 for row in numpy.packbits(neighbors, axis=1)])
+
+    def test_cached_nan(self):
+        """A cached NaN score is a hit, not a missing score."""
+        task = _task(cache=cache.EvaluationCache())
+        task.run()
+        algorithm = task.algorithm
+        bits = algorithm.neighborhood(0, 4)
+        keys = [row.tobytes() for row in numpy.packbits(bits, axis=1)]
+        task.cache.clear()
+        task.cache.put(keys[1], numpy.nan)
+        scores = algorithm.evaluate_bits(bits)
+        self.assertTrue(numpy.isnan(scores[1]))
+        self.assertEqual(numpy.isnan(scores).sum(), 1)
+        self.assertEqual((task.cache.hits, task.cache.misses), (1, 3))
+
+
+class TestScoredFlips(unittest.TestCase):
+
+    def test_full_pass(self):
+        """The flips are scored as full evaluations and reverted."""
+        for objective in ("Rastrigin", "Griewangk", "Rosenbrock",
+                          "SixHumpCamelBack"):
+            variables = 2 if objective == "SixHumpCamelBack" else 10
+            task = base.Task("HCFirstImprovement", objective, 3, variables,
+                             seed=4)
+            task.run()
+            algorithm = task.algorithm
+            chromosome = algorithm.chromosome
+            packed = chromosome.get_packed_data()
+            loci = numpy.random.default_rng(2).permutation(chromosome.size)
+            for locus, score in algorithm.scored_flips(loci):
+                neighbor = chromosome.get_raw_data().copy()
+                neighbor[locus] ^= 1
+                expected = task.objective.evaluate(task.objective.decode(
+                    objects.Chromosome.from_raw(
+                        neighbor, task.objective.search_space)))
+                # the delta evaluations differ only by rounding
+                numpy.testing.assert_allclose(score, expected, rtol=1e-9,
+                                              atol=1e-9)
+            self.assertEqual(chromosome.get_packed_data(), packed)
+            self.assertIs(algorithm.chromosome, chromosome)
+
+
+class TestHCBestImprovement(unittest.TestCase):
+
+    def test_best_neighbor(self):
+        """Every climb moves to the best scored Hamming neighbor."""
+        task = _task(checkpoint=True)
+        states = []
+        task.callback_progress = states.append
+        task.run()
+        algorithm = task.algorithm
+        self.assertIsInstance(algorithm, hillclimbing.HCBestImprovement)
+        for before, after in zip(states, states[1:]):
+            algorithm.restore(before)
+            scores = algorithm.evaluate_bits(algorithm.neighborhood())
+            self.assertAlmostEqual(after.score, min(before.score,
+                                                    scores.min()))
+
+    def test_neighborhood(self):
+        task = _task()
+        task.run()
+        algorithm = task.algorithm
+        genetic_info = algorithm.chromosome.get_raw_data()
+        neighbors = algorithm.neighborhood()
+        numpy.testing.assert_array_equal(
+            neighbors, genetic_info ^ numpy.eye(genetic_info.size,
+                                                dtype=genetic_info.dtype))
+        numpy.testing.assert_array_equal(algorithm.neighborhood(5, 12),
+                                         neighbors[5:12])
+
+    def test_chunk_size(self):
+        """The neighborhood gives the same climb in chunks of any size."""
+        for encoding in (config.ENCODING.BINARY, config.ENCODING.GRAY):
+            expected = _task(encoding=encoding).run()
+            for chunk_size in (1, 7, 100000):
+                algorithm = hillclimbing.HCBestImprovement(
+                    chunk_size=chunk_size)
+                algorithm.start(_task(encoding=encoding))
+                self.assertIsNone(algorithm.error)
+                self.assertEqual(algorithm.result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
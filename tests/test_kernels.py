@@ -0,0 +1,75 @@
+"""The compiled kernels agree with the NumPy reference."""
+import unittest
+
+import numpy
+
+from optinum import objective
+from optinum.common import config
+from optinum.common import kernels
+from optinum.common import objects
+
+FUNCTIONS = (objective.Rosenbrock, objective.Rastrigin,
+             objective.Griewangk)
+
+
+class TestResolve(unittest.TestCase):
+
+    def test_numpy(self):
+        self.assertEqual(kernels.resolve(config.KERNEL.NUMPY),
+                         config.KERNEL.NUMPY)
+        self.assertIsNone(kernels.load(config.KERNEL.NUMPY))
+
+    def test_auto(self):
+        expected = (config.KERNEL.NUMBA if kernels.available() else
+                    config.KERNEL.NUMPY)
+        self.assertEqual(kernels.resolve(config.KERNEL.AUTO), expected)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, kernels.resolve, "fortran")
+
+
+@unittest.skipUnless(kernels.available(), "numba is not installed")
+class TestParity(unittest.TestCase):
+
+    def setUp(self):
+        self._rng = numpy.random.default_rng(11)
+
+    def test_decode(self):
+        for encoding in (config.ENCODING.BINARY, config.ENCODING.GRAY):
+            for size in (5, 8, 13, 40):
+                reference = objects.Decoder(size, 2, -7, encoding,
+                                            config.KERNEL.NUMPY)
+                compiled = objects.Decoder(size, 2, -7, encoding,
+                                           config.KERNEL.NUMBA)
+                bits = self._rng.integers(0, 2, (9, 4 * size),
+                                          dtype=objects.ALLELE_TYPE)
+                numpy.testing.assert_array_equal(compiled.decode(bits),
+                                                 reference.decode(bits))
+
+    def test_evaluate_batch(self):
+        for cls in FUNCTIONS + (objective.SixHumpCamelBack, ):
+            reference = cls(2, backend=config.KERNEL.NUMPY)
+            compiled = cls(2, backend=config.KERNEL.NUMBA)
+            columns = 2 if cls is objective.SixHumpCamelBack else 7
+            matrix = self._rng.uniform(cls.min_xi, cls.max_xi,
+                                       (16, columns))
+            numpy.testing.assert_allclose(
+                compiled.evaluate_batch(matrix),
+                reference.evaluate_batch(matrix), rtol=1e-12,
+                err_msg=cls.__name__)
+
+    def test_evaluate_neighbors(self):
+        for cls in FUNCTIONS:
+            reference = cls(2, backend=config.KERNEL.NUMPY)
+            compiled = cls(2, backend=config.KERNEL.NUMBA)
+            variables = self._rng.uniform(cls.min_xi, cls.max_xi, 7)
+            indexes = numpy.arange(7).repeat(4)
+            values = self._rng.uniform(cls.min_xi, cls.max_xi, len(indexes))
+            numpy.testing.assert_allclose(
+                compiled.evaluate_neighbors(variables, indexes, values),
+                reference.evaluate_neighbors(variables, indexes, values),
+                rtol=1e-9, err_msg=cls.__name__)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""The lockstep engine agrees with the restarts run one by one."""
+import unittest
+
+import numpy
+
+from optinum import objective
+from optinum.algorithm import base as algorithms
+from optinum.algorithm import grid
+from optinum.algorithm import hillclimbing
+from optinum.algorithm import lockstep
+from optinum.analysis import base
+from optinum.common import metrics
+from optinum.common import objects
+
+VARIABLES = 4
+
+
+def _engine(algorithm, function, **options):
+    return lockstep.LockstepHillClimbing.from_algorithm(
+        algorithm, function, VARIABLES, collector=metrics.Metrics(),
+        **options)
+
+
+class TestLockstep(unittest.TestCase):
+
+    def setUp(self):
+        self._function = objective.Rastrigin(2)
+        self._space = self._function.search_space
+
+    def _is_local_optimum(self, result):
+        chromosome = objects.Chromosome.from_packed(
+            result.genome, VARIABLES, self._space)
+        bits = chromosome.get_raw_data()
+        neighbors = numpy.tile(bits, (bits.size, 1))
+        neighbors[numpy.arange(bits.size), numpy.arange(bits.size)] ^= 1
+        return numpy.all(self._function.compute_bits(neighbors) >=
+                         result.score)
+
+    def test_deterministic(self):
+        for algorithm in (hillclimbing.HCBestImprovement(),
+                          hillclimbing.HCFirstImprovement()):
+            first = _engine(algorithm, self._function).run(
+                20, numpy.random.default_rng(4))
+            second = _engine(algorithm, self._function).run(
+                20, numpy.random.default_rng(4))
+            self.assertEqual(first, second, algorithm.name)
+
+    def test_converged_rows_stop(self):
+        engine = lockstep.LockstepHillClimbing(
+            self._function, VARIABLES, max_evaluations=1000,
+            collector=metrics.Metrics())
+        results = engine.run(30, numpy.random.default_rng(5))
+        evaluations = [result.evaluations for result in results]
+        self.assertGreater(len(set(evaluations)), 1)
+        for result in results:
+            self.assertTrue(self._is_local_optimum(result))
+        # every step of a row scores its whole neighborhood once
+        loci = VARIABLES * self._space.size
+        self.assertEqual(engine.metrics.counters[metrics.OBJECTIVE_CALLS],
+                         len(results) + loci * sum(count - 1
+                                                   for count in evaluations))
+
+    def test_evaluation_limit(self):
+        engine = lockstep.LockstepHillClimbing(self._function, VARIABLES,
+                                               max_evaluations=3)
+        results = engine.run(10, numpy.random.default_rng(6))
+        self.assertTrue(all(result.evaluations <= 3 for result in results))
+
+    def test_small_buffer(self):
+        """The neighbors materialized in blocks give the same moves."""
+        algorithm = hillclimbing.HCBestImprovement()
+        expected = _engine(algorithm, self._function).run(
+            8, numpy.random.default_rng(7))
+        self.assertEqual(_engine(algorithm, self._function,
+                                 buffer_size=512).run(
+            8, numpy.random.default_rng(7)), expected)
+
+    def test_same_optimum_as_tasks(self):
+        """Best improvement from the same start reaches the same local
+        optimum in both engines."""
+        restarts = 10
+        algorithm = hillclimbing.HCBestImprovement()
+        results = _engine(algorithm, self._function).run(
+            restarts, numpy.random.default_rng(8))
+        starts = objects.Chromosome.random_population(
+            restarts, VARIABLES, self._space, numpy.random.default_rng(8))
+        state = numpy.random.default_rng(0).bit_generator.state
+        for start, result in zip(starts, results):
+            task = base.Task("HCBestImprovement", "Rastrigin", 2, VARIABLES,
+                             state=algorithms.State(
+                                 self._function.compute_bits(start[None])[0],
+                                 1, numpy.packbits(start).tobytes(), state))
+            expected = task.run()
+            self.assertEqual(result.genome, expected.genome)
+            self.assertEqual(result.evaluations, expected.evaluations)
+            self.assertAlmostEqual(result.score, expected.score)
+
+    def test_first_improvement_stops(self):
+        """Both engines end a first improvement restart at a local
+        optimum, before the evaluation limit."""
+        engine = _engine(hillclimbing.HCFirstImprovement(), self._function)
+        results = engine.run(10, numpy.random.default_rng(9))
+        results += [base.Task("HCFirstImprovement", "Rastrigin", 2,
+                              VARIABLES, seed=seed).run()
+                    for seed in range(10)]
+        for result in results:
+            self.assertLess(result.evaluations, 50)
+            self.assertTrue(self._is_local_optimum(result))
+
+    def test_unsupported_algorithm(self):
+        self.assertRaises(ValueError,
+                          lockstep.LockstepHillClimbing.from_algorithm,
+                          grid.GridBestImprovement(), self._function,
+                          VARIABLES)
+
+
+if __name__ == "__main__":
+    unittest.main()
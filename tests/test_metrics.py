@@ -0,0 +1,87 @@
+"""The counters and the timers of the tasks."""
+import contextlib
+import pickle
+import unittest
+from unittest import mock
+
+from optinum.analysis import base
+from optinum.common import config
+from optinum.common import metrics
+
+
+def _task(algorithm="HCFirstImprovement", **options):
+    return base.Task(algorithm, "Rastrigin", 2, 4, seed=6, **options)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_merge(self):
+        first, second = metrics.Metrics(), metrics.Metrics()
+        first.count(metrics.TASKS)
+        first.count(metrics.OBJECTIVE_CALLS, 10)
+        first.add_time(metrics.RUN_TIME, 0.5)
+        second.count(metrics.OBJECTIVE_CALLS, 5)
+        second.add_time(metrics.RUN_TIME, 0.25)
+        first.merge(second)
+        first.merge(metrics.NullMetrics())
+        self.assertEqual(first.counters[metrics.TASKS], 1)
+        self.assertEqual(first.counters[metrics.OBJECTIVE_CALLS], 15)
+        self.assertEqual(first.timers[metrics.RUN_TIME], 0.75)
+
+    def test_round_trip(self):
+        collected = metrics.Metrics({metrics.MOVES: 3},
+                                    {metrics.DECODE_TIME: 0.1})
+        restored = metrics.Metrics.from_dict(
+            pickle.loads(pickle.dumps(collected.as_dict())))
+        self.assertEqual(restored.counters, collected.counters)
+        self.assertEqual(restored.timers, collected.timers)
+
+    def test_null(self):
+        null = metrics.NullMetrics()
+        null.count(metrics.TASKS)
+        null.stop(metrics.RUN_TIME, null.start())
+        null.merge(metrics.Metrics({metrics.TASKS: 1}))
+        self.assertFalse(null.counters)
+        self.assertFalse(null.timers)
+        with mock.patch.object(config.METRICS, "ENABLED", False):
+            self.assertFalse(metrics.new_metrics().enabled)
+            self.assertTrue(metrics.new_metrics(True).enabled)
+
+
+class TestTaskMetrics(unittest.TestCase):
+
+    def test_objective_calls(self):
+        """Every scored chromosome is an objective call."""
+        for algorithm in ("HCFirstImprovement", "HCBestImprovement"):
+            task = _task(algorithm, metrics_enabled=True)
+            objective = task.objective
+            calls = {}
+            with contextlib.ExitStack() as stack:
+                for name in ("evaluate", "evaluate_delta",
+                             "evaluate_neighbors", "prepare_delta"):
+                    calls[name] = stack.enter_context(mock.patch.object(
+                        objective, name, wraps=getattr(objective, name)))
+                result = task.run()
+            # prepare_delta scores the current chromosome with evaluate
+            scored = (calls["evaluate"].call_count -
+                      calls["prepare_delta"].call_count +
+                      calls["evaluate_delta"].call_count +
+                      sum(len(call.args[1]) for call in
+                          calls["evaluate_neighbors"].call_args_list))
+            counters = task.metrics.counters
+            self.assertEqual(counters[metrics.OBJECTIVE_CALLS], scored)
+            self.assertEqual(counters[metrics.TASKS], 1)
+            # every scanned neighborhood moves, but the local optimum
+            stopped = result.evaluations < 50
+            self.assertEqual(counters[metrics.MOVES],
+                             result.evaluations - 1 - stopped)
+
+    def test_disabled(self):
+        task = _task(metrics_enabled=False)
+        self.assertEqual(task.run(), _task(metrics_enabled=True).run())
+        self.assertFalse(task.metrics.enabled)
+        self.assertFalse(task.metrics.counters)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""The incremental evaluations agree with the full ones."""
+import unittest
+
+import numpy
+
+from optinum import objective
+
+FUNCTIONS = (objective.Rosenbrock, objective.Rastrigin,
+             objective.Griewangk)
+
+
+class TestIncrementalEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self._rng = numpy.random.default_rng(7)
+
+    def _variables(self, function, count=6):
+        return self._rng.uniform(function.min_xi, function.max_xi,
+                                 count).tolist()
+
+    def test_evaluate_delta(self):
+        for cls in FUNCTIONS:
+            function = cls(2, backend="numpy")
+            variables = self._variables(function)
+            state = function.prepare_delta(variables)
+            for index in range(len(variables)):
+                value = self._variables(function, 1)[0]
+                changed = list(variables)
+                changed[index] = value
+                numpy.testing.assert_allclose(
+                    function.evaluate_delta(variables, index, value, state),
+                    function.evaluate(changed), rtol=1e-9, atol=1e-9,
+                    err_msg=cls.__name__)
+
+    def test_evaluate_neighbors(self):
+        for cls in FUNCTIONS:
+            function = cls(2, backend="numpy")
+            variables = self._variables(function)
+            indexes = numpy.arange(len(variables)).repeat(3)
+            values = self._rng.uniform(function.min_xi, function.max_xi,
+                                       len(indexes))
+            expected = []
+            for index, value in zip(indexes, values):
+                changed = list(variables)
+                changed[index] = value
+                expected.append(function.evaluate(changed))
+            numpy.testing.assert_allclose(
+                function.evaluate_neighbors(variables, indexes, values),
+                expected, rtol=1e-9, err_msg=cls.__name__)
+
+    def test_evaluate_batch(self):
+        for cls in FUNCTIONS + (objective.SixHumpCamelBack, ):
+            function = cls(2, backend="numpy")
+            matrix = self._rng.uniform(function.min_xi, function.max_xi,
+                                       (5, 2))
+            numpy.testing.assert_allclose(
+                function.evaluate_batch(matrix),
+                [function.evaluate(row.tolist()) for row in matrix],
+                rtol=1e-9, err_msg=cls.__name__)
+
+    def test_griewangk_zero_cosine(self):
+        """The product can not be updated when the old factor is 0."""
+        function = objective.Griewangk(2, backend="numpy")
+        variables = [numpy.pi / 2, 1.0, -3.0]
+        state = function.prepare_delta(variables)
+        self.assertAlmostEqual(
+            function.evaluate_delta(variables, 0, 2.0, state),
+            function.evaluate([2.0, 1.0, -3.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""The decoding of the genetic data and the grid representation."""
+import unittest
+
+import numpy
+
+from optinum import objective
+from optinum.analysis import base
+from optinum.common import config
+from optinum.common import kernels
+from optinum.common import objects
+
+ENCODINGS = (config.ENCODING.BINARY, config.ENCODING.GRAY)
+
+
+def _gray(decimal):
+    return decimal ^ (decimal >> 1)
+
+
+class TestDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self._rng = numpy.random.default_rng(3)
+
+    def test_binary_decimals(self):
+        decoder = objects.Decoder(4, 0, 0)
+        bits = [0, 0, 0, 1, 1, 0, 1, 0, 1, 1, 1, 1]
+        self.assertEqual(decoder.decimals(bits).tolist(), [1, 10, 15])
+
+    def test_gray_decimals(self):
+        decoder = objects.Decoder(4, 0, 0, config.ENCODING.GRAY)
+        decimals = numpy.arange(16)
+        bits = objects.Decoder(4, 0, 0).encode(_gray(decimals))
+        self.assertEqual(decoder.decimals(bits).tolist(), decimals.tolist())
+
+    def test_gray_neighbors_differ_by_one_flip(self):
+        decoder = objects.Decoder(5, 0, 0, config.ENCODING.GRAY)
+        bits = decoder.encode(numpy.arange(32)[:, numpy.newaxis])
+        flips = numpy.sum(bits[1:] != bits[:-1], axis=1)
+        self.assertTrue(numpy.all(flips == 1))
+
+    def test_encode_round_trip(self):
+        for encoding in ENCODINGS:
+            for size in (1, 7, 8, 9, 23, 62):
+                decoder = objects.Decoder(size, 0, 0, encoding)
+                decimals = self._rng.integers(0, 2 ** size, (4, 3),
+                                              dtype=numpy.int64)
+                bits = decoder.encode(decimals)
+                self.assertEqual(bits.shape, (4, 3 * size))
+                numpy.testing.assert_array_equal(decoder.decimals(bits),
+                                                 decimals)
+
+    def test_decode(self):
+        for encoding in ENCODINGS:
+            decoder = objects.Decoder(10, 2, -5.12, encoding)
+            decimals = self._rng.integers(0, 1024, 6, dtype=numpy.int64)
+            numpy.testing.assert_allclose(
+                decoder.decode(decoder.encode(decimals)),
+                decimals / 100.0 - 5.12)
+
+    def test_value(self):
+        for encoding in ENCODINGS:
+            decoder = objects.Decoder(10, 2, -5.12, encoding)
+            bits = decoder.encode([731])
+            self.assertAlmostEqual(decoder.value(bits), 7.31 - 5.12)
+
+    def test_flips(self):
+        for encoding in ENCODINGS:
+            decoder = objects.Decoder(9, 1, -3, encoding)
+            bits = self._rng.integers(0, 2, 27).astype(objects.ALLELE_TYPE)
+            indexes, values = decoder.flips(bits)
+            for locus in range(len(bits)):
+                flipped = bits.copy()
+                flipped[locus] ^= 1
+                self.assertEqual(indexes[locus], locus // 9)
+                self.assertAlmostEqual(
+                    values[locus], decoder.decode(flipped)[locus // 9])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, objects.Decoder, 63, 0, 0)
+        self.assertRaises(ValueError, objects.Decoder, 8, 0, 0, "ascii")
+
+    def test_shared(self):
+        self.assertIs(objects.Decoder.get(12, 2, 0),
+                      objects.Decoder.get(12, 2, 0))
+
+
+class TestSearchSpace(unittest.TestCase):
+
+    def _spaces(self):
+        backends = [config.KERNEL.NUMPY]
+        if kernels.available():
+            backends.append(config.KERNEL.NUMBA)
+        for cls in (objective.Rosenbrock, objective.Rastrigin,
+                    objective.Griewangk, objective.SixHumpCamelBack):
+            for encoding in ENCODINGS:
+                for backend in backends:
+                    yield cls(2, encoding, backend).search_space
+
+    def _check_bounds(self, space, values):
+        values = numpy.asarray(values)
+        self.assertTrue(numpy.all(values >= space.min_xi - 1e-9), space)
+        self.assertTrue(numpy.all(values <= space.max_xi + 1e-9), space)
+
+    def test_decode_within_bounds(self):
+        rng = numpy.random.default_rng(8)
+        for space in self._spaces():
+            top = space.decoder.encode([(1 << space.size) - 1])
+            self.assertAlmostEqual(space.decode(top)[0], space.max_xi)
+            bits = rng.integers(0, 2, (50, 3 * space.size),
+                                dtype=objects.ALLELE_TYPE)
+            self._check_bounds(space, space.decode(bits))
+            for row in bits[:5]:
+                self._check_bounds(space, space.decoder.flips(row)[1])
+                self._check_bounds(space, [space.decoder.value(
+                    row[:space.size])])
+
+    def test_random_population_within_bounds(self):
+        rng = numpy.random.default_rng(9)
+        for space in self._spaces():
+            bits = objects.Chromosome.random_population(200, 3, space, rng)
+            self.assertEqual(bits.shape, (200, 3 * space.size))
+            decimals = space.decoder.decimals(bits)
+            self.assertTrue(numpy.all(decimals <= space.steps), space)
+            self._check_bounds(space, space.decode(bits))
+
+    def test_grid_values(self):
+        space = objects.SearchSpace(-5.12, 5.21, 2, config.ENCODING.GRAY)
+        indexes = numpy.array([0, 17, space.steps])
+        numpy.testing.assert_allclose(
+            space.grid_values(indexes),
+            space.decode(space.decoder.encode(indexes)))
+        self.assertAlmostEqual(space.grid_values(space.steps), 5.21)
+
+    def test_chromosome_packing(self):
+        space = objects.SearchSpace(-2, 2, 3)
+        chromosome = objects.Chromosome.random(
+            5, space, numpy.random.default_rng(1))
+        restored = objects.Chromosome.from_packed(
+            chromosome.get_packed_data(), 5, space)
+        numpy.testing.assert_array_equal(restored.get_raw_data(),
+                                         chromosome.get_raw_data())
+
+
+class TestGridClimbing(unittest.TestCase):
+
+    def _run(self, encoding=config.ENCODING.GRAY, **options):
+        task = base.Task("GridBestImprovement", "Rastrigin", 1, 4, seed=2,
+                         encoding=encoding, **options)
+        return task, task.run()
+
+    def test_neighbors_within_grid(self):
+        task, _ = self._run()
+        algorithm = task.algorithm
+        steps = task.objective.search_space.steps
+        moves = algorithm.moves()
+        for indexes in ([0, steps, 1, steps - 1], [0, 0, steps, steps]):
+            algorithm.update_point(numpy.array(indexes), None)
+            positions, targets = algorithm.neighbors()
+            self.assertTrue(numpy.all((targets >= 0) & (targets <= steps)))
+            expected = [(position, index + move)
+                        for position, index in enumerate(indexes)
+                        for move in moves if 0 <= index + move <= steps]
+            self.assertEqual(sorted(zip(positions.tolist(),
+                                        targets.tolist())),
+                             sorted(expected))
+
+    def test_genome_round_trip(self):
+        for encoding in ENCODINGS:
+            task, result = self._run(encoding)
+            algorithm = task.algorithm
+            space = task.objective.search_space
+            bits = numpy.unpackbits(numpy.frombuffer(result.genome,
+                                                     dtype=numpy.uint8))
+            numpy.testing.assert_allclose(
+                space.decode(bits[:4 * space.size]), algorithm.variables)
+
+            state = algorithm.snapshot()
+            indexes = algorithm.indexes.copy()
+            algorithm.update_point(numpy.zeros_like(indexes), None)
+            algorithm.restore(state)
+            numpy.testing.assert_array_equal(algorithm.indexes, indexes)
+            self.assertEqual(algorithm.score, result.score)
+            self.assertEqual(algorithm.genome(), result.genome)
+
+    def test_local_optimum(self):
+        """The climb stops at a point which no neighbor improves."""
+        task, result = self._run()
+        algorithm = task.algorithm
+        self.assertLess(result.evaluations, algorithm.max_evaluations)
+        positions, indexes = algorithm.neighbors()
+        neighbors = numpy.tile(algorithm.variables, (len(positions), 1))
+        neighbors[numpy.arange(len(positions)), positions] = (
+            task.objective.search_space.grid_values(indexes))
+        scores = task.objective.evaluate_batch(neighbors)
+        self.assertTrue(numpy.all(scores >= result.score))
+
+
+if __name__ == "__main__":
+    unittest.main()
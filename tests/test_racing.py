@@ -0,0 +1,90 @@
+"""The races between configurations."""
+import argparse
+import concurrent.futures
+import unittest
+from unittest import mock
+
+from optinum.analysis import hcanalysis
+from optinum.analysis import racing
+from optinum.common import config
+
+
+def _command(**options):
+    values = dict(algorithm="HCFirstImprovement", objective="Rastrigin",
+                  precision=2, variables=2, seed=5, backend="thread",
+                  workers=2, autoscale=False,
+                  min_workers=config.WORKER.MIN_WORKERS,
+                  max_workers=config.WORKER.MAX_WORKERS, chunk_size=1,
+                  engine=config.ENGINE.TASK, kernel=config.KERNEL.NUMPY,
+                  encoding=config.ENCODING.DEFAULT, cache_size=None,
+                  checkpoint=None,
+                  checkpoint_interval=config.CHECKPOINT.INTERVAL,
+                  resume=False, store=None, broker=None, authkey=None)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    def report(self):
+        pass
+
+
+class TestTQuantile(unittest.TestCase):
+
+    def test_tabulated(self):
+        for probability, freedom, expected in ((0.975, 3, 3.182),
+                                               (0.975, 5, 2.571),
+                                               (0.975, 10, 2.228),
+                                               (0.95, 30, 1.697),
+                                               (0.99, 20, 2.528)):
+            self.assertAlmostEqual(racing.t_quantile(probability, freedom),
+                                   expected, delta=0.005)
+
+
+class TestRace(unittest.TestCase):
+
+    def setUp(self):
+        self._pool = concurrent.futures.ThreadPoolExecutor(2)
+        self.addCleanup(self._pool.shutdown)
+
+    def _race(self, commands, **options):
+        options.setdefault("analysis", _QuietAnalysis)
+        return racing.Race(commands, **options)
+
+    def test_needs_budget(self):
+        self.assertRaises(ValueError, self._race, [_command()])
+
+    def test_dominated(self):
+        """Twenty variables can not reach the optimum of two."""
+        race = self._race([_command(variables=20), _command(variables=2)],
+                          budget=10 ** 6, batch=4, min_runs=4)
+        winner = race.run(self._pool)
+        weak, strong = race.candidates
+        self.assertIs(winner, strong)
+        self.assertFalse(weak.alive)
+        self.assertTrue(weak.dominated_by(strong, 0.95))
+        self.assertFalse(strong.dominated_by(weak, 0.95))
+
+    def test_budget(self):
+        commands = [_command(), _command(algorithm="HCBestImprovement")]
+        for budget in (3000, 10000, 25000):
+            race = self._race(commands, budget=budget, batch=8)
+            race.run(self._pool)
+            spent = sum(candidate.evaluations
+                        for candidate in race.candidates)
+            self.assertGreater(spent, 0)
+            self.assertLessEqual(spent, budget)
+
+    def test_uncounted_calls(self):
+        """A budget fails loudly when the restarts do not count their
+        objective calls."""
+        race = self._race([_command(), _command(variables=3)],
+                          budget=10 ** 6)
+        with mock.patch.object(config.METRICS, "ENABLED", False):
+            self.assertRaises(RuntimeError, race.run, self._pool)
+        self.assertIsNone(race.candidates[0].evaluations)
+
+
+if __name__ == "__main__":
+    unittest.main()
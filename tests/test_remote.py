@@ -0,0 +1,124 @@
+"""The remote backend with worker processes on the local host."""
+import argparse
+import multiprocessing
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+from optinum.analysis import base
+from optinum.analysis import hcanalysis
+from optinum.common import broker
+from optinum.common import config
+
+AUTHKEY = "test"
+
+
+def _free_address():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return "127.0.0.1:%d" % probe.getsockname()[1]
+
+
+def _command(address, **options):
+    values = dict(algorithm="HCBestImprovement", objective="Rastrigin",
+                  precision=2, variables=3, seed=17, backend="remote",
+                  workers=2, autoscale=False,
+                  min_workers=config.WORKER.MIN_WORKERS,
+                  max_workers=config.WORKER.MAX_WORKERS, chunk_size=1,
+                  engine=config.ENGINE.TASK, kernel=config.KERNEL.NUMPY,
+                  encoding=config.ENCODING.DEFAULT, cache_size=None,
+                  checkpoint=None,
+                  checkpoint_interval=config.CHECKPOINT.INTERVAL,
+                  resume=False, store=None, broker=address, authkey=AUTHKEY)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+def _serve(address):
+    """The loop of `optinum worker`."""
+    remote = broker.ManagerBroker(address, AUTHKEY)
+    remote.connect()
+    base.serve_tasks(remote)
+
+
+def _take_and_hang(address, taken):
+    """A worker which dies while it runs a task."""
+    remote = broker.ManagerBroker(address, AUTHKEY)
+    remote.connect()
+    key, _ = remote.get_task()
+    remote.put_result((key, base._ALIVE))
+    taken.set()
+    time.sleep(60)      # until the test kills the process
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    def report(self):
+        pass
+
+
+class TestRemoteWorkers(unittest.TestCase):
+
+    def setUp(self):
+        self._context = multiprocessing.get_context(
+            config.WORKER.START_METHOD)
+        self._processes = []
+
+    def tearDown(self):
+        for process in self._processes:
+            process.kill()
+            process.join()
+
+    def _start(self, target, *args):
+        process = self._context.Process(target=target, args=args)
+        process.start()
+        self._processes.append(process)
+        return process
+
+    def _expected(self, count):
+        analysis = _QuietAnalysis(_command(None, backend="thread"))
+        self.assertTrue(analysis.compute(count))
+        return list(analysis.results())
+
+    def test_local_workers(self):
+        address = _free_address()
+        for _ in range(2):
+            self._start(_serve, address)
+        analysis = _QuietAnalysis(_command(address))
+        self.assertTrue(analysis.compute(12))
+        self.assertEqual(list(analysis.results()), self._expected(12))
+
+    def test_killed_worker(self):
+        """The task of a worker killed while it runs it is sent again."""
+        address = _free_address()
+        taken = self._context.Event()
+        analysis = _QuietAnalysis(_command(address, workers=1))
+        hanging = self._start(_take_and_hang, address, taken)
+
+        def kill_and_replace():
+            taken.wait(60)
+            hanging.kill()
+            self._start(_serve, address)
+
+        with mock.patch.object(config.BROKER, "LEASE", 2.0):
+            replacer = threading.Thread(target=kill_and_replace)
+            replacer.start()
+            self.assertTrue(analysis.compute(4))
+            replacer.join()
+        self.assertEqual(list(analysis.results()), self._expected(4))
+
+    def test_broker_not_served(self):
+        """The analysis fails instead of waiting when its address is
+        already taken."""
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            address = "127.0.0.1:%d" % taken.getsockname()[1]
+            analysis = _QuietAnalysis(_command(address))
+            self.assertFalse(analysis.compute(200))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""The summaries of the results."""
+import math
+import random
+import statistics
+import unittest
+
+import numpy
+
+from optinum.algorithm import base
+from optinum.common import stats
+
+
+def _result(score, evaluations=1):
+    return base.Result(score, evaluations, b"")
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def setUp(self):
+        self._values = numpy.random.default_rng(2).lognormal(0, 2, 5000)
+        self._values[::7] *= -1
+
+    def _sketch(self, values, **options):
+        sketch = stats.QuantileSketch(**options)
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def _check(self, sketch, values, accuracy):
+        values = numpy.sort(values)
+        for fraction in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+            expected = values[int(fraction * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(fraction) - expected),
+                                 accuracy * abs(expected) + 1e-12)
+
+    def test_accuracy(self):
+        self._check(self._sketch(self._values), self._values, 0.01)
+
+    def test_collapse(self):
+        sketch = self._sketch(self._values, max_bins=64)
+        self.assertLessEqual(len(sketch._positive) + len(sketch._negative),
+                             64)
+        self._check(sketch, self._values, sketch.accuracy)
+
+    def test_merge(self):
+        first, second = self._values[:1000], self._values[1000:]
+        merged = self._sketch(first, max_bins=64)
+        merged.merge(self._sketch(second))
+        self.assertEqual(merged.count, len(self._values))
+        self._check(merged, self._values, merged.accuracy)
+
+    def test_merge_other_accuracy(self):
+        self.assertRaises(ValueError, stats.QuantileSketch().merge,
+                          stats.QuantileSketch(0.05))
+
+    def test_clamped(self):
+        sketch = self._sketch([3.0, 3.0, 3.0])
+        self.assertEqual(sketch.quantile(0.0), 3.0)
+        self.assertEqual(sketch.quantile(1.0), 3.0)
+        sketch = self._sketch([-2.0, 0.0, 5.0])
+        self.assertAlmostEqual(sketch.quantile(0.0), -2.0, delta=0.02)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertLessEqual(sketch.quantile(1.0), 5.0)
+
+    def test_infinite(self):
+        sketch = self._sketch([-math.inf, 1.0, math.nan, 2.0, math.inf])
+        self.assertEqual(sketch.count, 4)
+        self.assertEqual(sketch.quantile(0.0), -math.inf)
+        self.assertAlmostEqual(sketch.quantile(0.5), 1.0, delta=0.01)
+        self.assertEqual(sketch.quantile(1.0), math.inf)
+        merged = self._sketch([0.5])
+        merged.merge(sketch)
+        self.assertEqual(merged.quantile(0.0), -math.inf)
+        self.assertEqual(merged.quantile(1.0), math.inf)
+
+    def test_empty(self):
+        self.assertIsNone(stats.QuantileSketch().quantile(0.5))
+
+
+class TestSummary(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(4)
+        self._scores = [rng.uniform(-1e3, 1e3) for _ in range(300)]
+
+    def _summary(self, indexes):
+        summary = stats.Summary()
+        for index in indexes:
+            summary.add(_result(self._scores[index], index + 1), index)
+        return summary
+
+    def test_moments(self):
+        summary = self._summary(range(len(self._scores)))
+        self.assertAlmostEqual(summary.mean, statistics.fmean(self._scores))
+        self.assertAlmostEqual(summary.variance / statistics.variance(
+            self._scores), 1.0)
+        self.assertEqual(summary.evaluations,
+                         sum(range(1, len(self._scores) + 1)))
+
+    def test_best(self):
+        summary = self._summary(range(len(self._scores)))
+        index = self._scores.index(min(self._scores))
+        self.assertEqual(summary.best_index, index)
+        self.assertEqual(summary.evaluations_to_best, index + 1)
+
+    def test_order_independent(self):
+        indexes = list(range(len(self._scores)))
+        expected = self._summary(indexes)
+        random.Random(5).shuffle(indexes)
+        shuffled = self._summary(indexes)
+        for name in ("mean", "variance", "best_index",
+                     "evaluations_to_best"):
+            self.assertEqual(getattr(shuffled, name),
+                             getattr(expected, name), name)
+
+    def test_merge(self):
+        expected = self._summary(range(len(self._scores)))
+        merged = stats.Summary()
+        for start in (200, 0, 100):
+            merged.merge(self._summary(range(start, start + 100)))
+        merged.add(None)
+        self.assertEqual(merged.count, expected.count)
+        self.assertEqual(merged.failures, 1)
+        for name in ("mean", "variance", "best_index", "evaluations"):
+            self.assertEqual(getattr(merged, name),
+                             getattr(expected, name), name)
+        self.assertEqual(merged.quantile(0.5), expected.quantile(0.5))
+
+    def test_ties(self):
+        summary = stats.Summary()
+        summary.add(_result(1.0, 10), 4)
+        summary.add(_result(1.0, 20), 2)
+        summary.add(_result(1.0, 30), 3)
+        self.assertEqual(summary.best_index, 2)
+        self.assertEqual(summary.evaluations_to_best, 20)
+
+    def test_special_scores(self):
+        summary = stats.Summary()
+        summary.add(_result(1.0))
+        summary.add(_result(math.inf))
+        self.assertEqual(summary.mean, math.inf)
+        self.assertTrue(math.isnan(summary.variance))
+        self.assertEqual(summary.best.score, 1.0)
+
+    def test_empty(self):
+        summary = stats.Summary()
+        summary.add(None)
+        self.assertIsNone(summary.mean)
+        self.assertIsNone(summary.std)
+        self.assertIsNone(summary.best)
+        self.assertEqual(summary.evaluations_to_best, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
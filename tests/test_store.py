@@ -0,0 +1,110 @@
+"""The append-only storage of the results."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from optinum.algorithm import base
+from optinum.analysis import store
+from optinum.common import config
+
+
+def _result(index):
+    return base.Result(float(index % 7) - 3.5, index + 1,
+                       bytes([index % 256, 255 - index % 256]))
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "results")
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _fill(self, count, failed=()):
+        results = store.ResultStore(self._path, genome_bytes=2)
+        for index in reversed(range(count)):
+            results.append(index, None if index in failed else
+                           _result(index), task_id=index, seed=index * 3,
+                           wall_time=0.5)
+        results.close()
+        return results
+
+    def test_round_trip(self):
+        count = config.STORE.FLUSH_ROWS * 2 + 5
+        self._fill(count, failed={4})
+        results = store.ResultStore.load(self._path)
+        self.assertEqual(len(results), count)
+        for index, result in results.results():
+            self.assertEqual(result, None if index == 4 else
+                             _result(index))
+        self.assertEqual(results.result(count - 1 - 6), _result(6))
+        numpy.testing.assert_array_equal(results.column("seed")[:3],
+                                         [(count - 1) * 3, (count - 2) * 3,
+                                          (count - 3) * 3])
+
+    def test_append_after_load(self):
+        self._fill(3)
+        results = store.ResultStore.load(self._path)
+        results.append(3, _result(3))
+        results.flush()
+        self.assertEqual(len(results), 4)
+        self.assertEqual(dict(results.results())[3], _result(3))
+
+    def test_repair(self):
+        self._fill(10)
+        with open(os.path.join(self._path, "score.bin"), "ab") as handler:
+            handler.write(b"\x00" * 5)     # an interrupted write
+        with open(os.path.join(self._path, "genome.bin"), "ab") as handler:
+            handler.write(b"\x00" * 2)     # a row missing elsewhere
+        results = store.ResultStore.load(self._path)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(os.path.getsize(os.path.join(self._path,
+                                                      "score.bin")), 80)
+        self.assertEqual(os.path.getsize(os.path.join(self._path,
+                                                      "genome.bin")), 20)
+
+    def test_select(self):
+        self._fill(50, failed={10})
+        results = store.ResultStore.load(self._path)
+        selected = results.select(["index", "score"], score=(None, -2.0),
+                                  index=(5, None))
+        expected = sorted(index for index in range(5, 50)
+                          if index != 10 and index % 7 <= 1)
+        self.assertEqual(sorted(selected["index"].tolist()), expected)
+        self.assertTrue(numpy.all(selected["score"] <= -2.0))
+        self.assertEqual(set(results.select()), set(results._types))
+
+    def test_best(self):
+        self._fill(30, failed={0, 7})
+        results = store.ResultStore.load(self._path)
+        rows = results.best(5)
+        scores = results.column("score")[rows]
+        self.assertEqual(scores.tolist(), [-3.5] * 3 + [-2.5] * 2)
+        self.assertEqual(len(results.best(100)), 28)
+
+    def test_other_layout(self):
+        self._fill(2)
+        self.assertRaises(ValueError, store.ResultStore, self._path, 3,
+                          False)
+
+    def test_genome_size(self):
+        results = store.ResultStore(genome_bytes=3)
+        self.assertRaises(ValueError, results.append, 0, _result(0))
+        results.close()
+
+    def test_empty(self):
+        results = store.ResultStore(genome_bytes=2)
+        self.assertEqual(len(results), 0)
+        self.assertEqual(len(results.column("score")), 0)
+        self.assertEqual(list(results.results()), [])
+        self.assertEqual(len(results.best(3)), 0)
+        results.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""The completion notifications of the tasks."""
+import threading
+import unittest
+
+from optinum.analysis import base
+from optinum.common import config
+
+
+def _task(seed=1):
+    return base.Task("HCFirstImprovement", "Rastrigin", 2, 4, seed=seed)
+
+
+class TestCompletion(unittest.TestCase):
+
+    def test_callbacks(self):
+        task = _task()
+        finished = []
+        task.add_done_callback(finished.append)
+        task.add_done_callback(lambda task: finished.append(task.result))
+        self.assertEqual(finished, [])
+        self.assertFalse(task.is_finished())
+
+        result = task.run()
+        task.callback_done(result)
+        self.assertEqual(finished, [task, result])
+        self.assertTrue(task.is_done())
+
+        # a finished task calls the new callbacks right away, once
+        late = []
+        task.add_done_callback(late.append)
+        self.assertEqual(late, [task])
+        task.callback_done(result)
+        self.assertEqual(finished, [task, result])
+        self.assertEqual(late, [task])
+
+    def test_failure(self):
+        task = _task()
+        finished = []
+        task.add_done_callback(finished.append)
+        error = ValueError("failed")
+        task.callback_fail(error)
+        self.assertEqual(finished, [task])
+        self.assertTrue(task.is_finished())
+        self.assertFalse(task.is_done())
+        self.assertEqual(task.status, config.STATUS.ERROR)
+        self.assertIs(task.error, error)
+
+    def test_wait(self):
+        """`wait` returns as soon as another thread finishes the task."""
+        task = _task()
+        self.assertFalse(task.wait(0.01))
+        runner = threading.Thread(
+            target=lambda: task.callback_done(task.run()))
+        runner.start()
+        self.assertTrue(task.wait(10))
+        runner.join()
+        self.assertEqual(task.result, _task().run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""The seeds of the restarts."""
+import itertools
+import unittest
+
+import numpy
+
+from optinum.analysis import base
+from optinum.common import utils
+
+
+def _seeds(seed, count):
+    return list(itertools.islice(utils.seed_stream(seed), count))
+
+
+class TestSeedStream(unittest.TestCase):
+
+    def test_reproducible(self):
+        self.assertEqual(_seeds(42, 100), _seeds(42, 100))
+        # a longer stream starts with the same seeds
+        self.assertEqual(_seeds(42, 1000)[:100], _seeds(42, 100))
+        self.assertNotEqual(_seeds(42, 10), _seeds(43, 10))
+        self.assertNotEqual(_seeds(None, 10), _seeds(None, 10))
+
+    def test_distinct(self):
+        seeds = _seeds(7, 10000)
+        self.assertEqual(len(set(seeds)), len(seeds))
+        self.assertTrue(all(0 <= seed < 2 ** 64 for seed in seeds))
+
+    def test_independent(self):
+        """The generators of neighboring seeds are not correlated."""
+        draws = numpy.array([numpy.random.default_rng(seed).random(4096)
+                             for seed in _seeds(3, 32)])
+        correlation = numpy.corrcoef(draws)
+        off_diagonal = correlation[~numpy.eye(len(draws), dtype=bool)]
+        self.assertLess(numpy.abs(off_diagonal).max(), 0.1)
+
+    def test_order_independent(self):
+        """A task gives the same result whenever it runs."""
+        seeds = _seeds(11, 4)
+        forward = [base.Task("HCFirstImprovement", "Rastrigin", 2, 4,
+                             seed=seed).run() for seed in seeds]
+        backward = [base.Task("HCFirstImprovement", "Rastrigin", 2, 4,
+                              seed=seed).run() for seed in reversed(seeds)]
+        self.assertEqual(forward, backward[::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""The scaling decisions of the concurrent workers."""
+import unittest
+from unittest import mock
+
+from optinum.common import metrics
+from optinum.common import worker
+
+
+class _Idle(object):
+
+    def is_alive(self):
+        return True
+
+
+class _Workers(worker.ConcurrentWorker):
+
+    def __init__(self, policy):
+        super(_Workers, self).__init__(100, 1, False, 0.1, False,
+                                       policy=policy)
+
+    def start_worker(self):
+        return _Idle()
+
+    def task_generator(self):
+        return iter(())
+
+    def process(self, task):
+        pass
+
+
+class TestScalingPolicy(unittest.TestCase):
+
+    def test_limits(self):
+        policy = worker.ScalingPolicy(min_workers=0, max_workers=4)
+        self.assertEqual(policy.min_workers, 1)
+        self.assertEqual(policy.desired(0, 0, None), 1)
+        self.assertEqual(policy.desired(2, 50, None), 4)
+        policy = worker.ScalingPolicy(min_workers=8, max_workers=4)
+        self.assertEqual(policy.min_workers, 4)
+        self.assertEqual(policy.desired(0, 0, 1.0), 4)
+
+    def test_latency(self):
+        """The backlog needs workers for `horizon` seconds of tasks."""
+        policy = worker.ScalingPolicy(min_workers=1, max_workers=64,
+                                      horizon=1.0)
+        # unknown latency: a worker for every task
+        self.assertEqual(policy.desired(2, 10, None), 12)
+        self.assertEqual(policy.desired(2, 10, 0.25), 5)
+        self.assertEqual(policy.desired(2, 10, 0.01), 3)
+        # never more workers than tasks
+        self.assertEqual(policy.desired(2, 10, 5.0), 12)
+
+
+class TestScale(unittest.TestCase):
+
+    def _workers(self, **options):
+        options.setdefault("max_workers", 8)
+        return _Workers(worker.ScalingPolicy(**options))
+
+    def test_scale_up(self):
+        workers = self._workers()
+        for task in range(6):
+            workers.queue.put(task)
+        workers.scale()
+        self.assertEqual(len(workers.workers), 6)
+        self.assertEqual(workers.scaling.counters[metrics.WORKERS_STARTED],
+                         6)
+        self.assertEqual(workers.scaling.counters[metrics.PEAK_WORKERS], 6)
+
+        for task in range(6, 20):
+            workers.queue.put(task)
+        workers.scale()
+        self.assertEqual(len(workers.workers), 8)
+
+    def test_scale_down(self):
+        """The surplus workers retire after staying idle long enough."""
+        workers = self._workers(min_workers=2, idle_timeout=5.0)
+        workers.workers = [_Idle() for _ in range(6)]
+        with mock.patch.object(metrics, "clock", return_value=100.0):
+            workers.scale()
+        self.assertEqual(workers.queue.qsize(), 0)
+        with mock.patch.object(metrics, "clock", return_value=104.0):
+            workers.scale()
+        self.assertEqual(workers.queue.qsize(), 0)
+        with mock.patch.object(metrics, "clock", return_value=105.0):
+            workers.scale()
+        # a None for every retired worker
+        self.assertEqual([workers.queue.get() for _ in range(4)],
+                         [None] * 4)
+        self.assertEqual(workers.scaling.counters[metrics.WORKERS_RETIRED],
+                         4)
+        for _ in range(4):
+            self.assertTrue(workers._should_retire())
+        self.assertFalse(workers._should_retire())
+
+    def test_new_load_cancels_retirement(self):
+        workers = self._workers(min_workers=1, idle_timeout=5.0)
+        workers.workers = [_Idle() for _ in range(4)]
+        with mock.patch.object(metrics, "clock", return_value=100.0):
+            workers.scale()
+        for task in range(4):
+            workers.queue.put(task)
+        workers.scale()
+        for _ in range(4):
+            workers.queue.get()
+        with mock.patch.object(metrics, "clock", return_value=105.0):
+            workers.scale()
+        # the idle time starts over
+        self.assertEqual(workers.queue.qsize(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
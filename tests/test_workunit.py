@@ -0,0 +1,110 @@
+"""The work units and the bounded queue of the analysis."""
+import argparse
+import threading
+import unittest
+from unittest import mock
+
+from optinum.analysis import base
+from optinum.analysis import hcanalysis
+from optinum.common import config
+
+
+def _command(**options):
+    values = dict(algorithm="HCFirstImprovement", objective="Rastrigin",
+                  precision=2, variables=4, seed=31, backend="thread",
+                  workers=2, autoscale=False,
+                  min_workers=config.WORKER.MIN_WORKERS,
+                  max_workers=config.WORKER.MAX_WORKERS, chunk_size=1,
+                  engine=config.ENGINE.TASK, kernel=config.KERNEL.NUMPY,
+                  encoding=config.ENCODING.DEFAULT, cache_size=None,
+                  checkpoint=None,
+                  checkpoint_interval=config.CHECKPOINT.INTERVAL,
+                  resume=False, store=None, broker=None, authkey=None)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+class _QuietAnalysis(hcanalysis.HCAnalysis):
+
+    def report(self):
+        pass
+
+
+def _task(seed):
+    return base.Task("HCFirstImprovement", "Rastrigin", 2, 4, seed=seed)
+
+
+class TestWorkUnit(unittest.TestCase):
+
+    def test_outcomes(self):
+        """Every task of a unit is finished with its own outcome."""
+        tasks = [_task(1), _task(2), _task(3)]
+        unit = base.WorkUnit(tasks)
+        self.assertEqual(len(unit), 3)
+        unit.callback_queued()
+        with mock.patch.object(tasks[1].algorithm, "process",
+                               side_effect=ValueError("failed")):
+            outcomes = unit.run()
+        unit.callback_done(outcomes)
+
+        self.assertIsNone(outcomes[0][1])
+        self.assertIsNone(outcomes[1][0])
+        self.assertIsInstance(outcomes[1][1], ValueError)
+        self.assertTrue(tasks[0].is_done())
+        self.assertFalse(tasks[1].is_done())
+        self.assertTrue(tasks[1].is_finished())
+        self.assertIs(tasks[1].error, outcomes[1][1])
+        self.assertEqual(tasks[2].result, _task(3).run())
+
+    def test_chunks(self):
+        """The restarts give the same results in units of any size."""
+        expected = None
+        for chunk_size in (1, 3, 16, 0):
+            analysis = _QuietAnalysis(_command(chunk_size=chunk_size))
+            sizes = []
+            add_tasks = analysis.add_tasks
+
+            def record(tasks, add_tasks=add_tasks, sizes=sizes):
+                sizes.append(len(tasks))
+                add_tasks(tasks)
+
+            analysis.add_tasks = record
+            self.assertTrue(analysis.compute(10))
+            self.assertEqual(sum(sizes), 10)
+            if chunk_size:
+                self.assertEqual(sizes[0], min(chunk_size, 10))
+            results = list(analysis.results())
+            if expected is None:
+                expected = results
+            self.assertEqual(results, expected)
+
+
+class TestBackpressure(unittest.TestCase):
+
+    def test_bounded_queue(self):
+        """The submission blocks while the queue is full and gives up
+        when the analysis is stopped."""
+        with mock.patch.object(config.WORKER, "QSIZE", 2), \
+                mock.patch.object(config.BROKER, "TIMEOUT", 0.05):
+            # the executor is not started, so nothing is taken
+            analysis = _QuietAnalysis(_command())
+            submitted = []
+
+            def submit():
+                for seed in range(4):
+                    analysis.add_task(_task(seed))
+                    submitted.append(seed)
+
+            producer = threading.Thread(target=submit)
+            producer.start()
+            producer.join(0.5)
+            self.assertTrue(producer.is_alive())
+            self.assertEqual(submitted, [0, 1])
+
+            analysis.stop.set()
+            producer.join(5)
+            self.assertFalse(producer.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()